@@ -0,0 +1,49 @@
+"""
+The signals package: harmonic signals (Signal) made of a baseline, a noise factor and perturbations.
+
+The main classes are re-exported here lazily (PEP 562): `import signals` loads nothing else, and
+`signals.Signal` (or `from signals import Signal`) only imports the module that defines it.
+"""
+import importlib
+
+_EXPORTS = {
+    'Signal':'signals.signal',
+    'CompiledSignal':'signals.compiled_signal',
+    'SignalSample':'signals.signal_sample',
+    'SignalRingBuffer':'signals.ring_buffer',
+    'SignalBatch':'signals.batch',
+    'generate_many':'signals.batch',
+    'SampleCache':'signals.sample_cache',
+    'Instrumentation':'signals.instrumentation',
+    'SampleStore':'signals.sample_store',
+    'export_samples':'signals.export',
+    'signal_stats':'signals.stats',
+    'jittered_timestamps':'signals.timestamps',
+    'poisson_timestamps':'signals.timestamps',
+    'Function':'signals.functions.function',
+    'BaseLine':'signals.functions.baseline',
+    'Noise':'signals.functions.noise',
+    'AR1Noise':'signals.functions.colored_noise',
+    'PinkNoise':'signals.functions.colored_noise',
+    'BrownNoise':'signals.functions.colored_noise',
+    'NoiseGroup':'signals.functions.noise_group',
+    'HarmonicBank':'signals.functions.harmonic_bank',
+    'Perturbation':'signals.perturbations.perturbation',
+    'SpikePerturbation':'signals.perturbations.spike_perturbation',
+    'StepPerturbation':'signals.perturbations.step_perturbation',
+    'PerturbationLabels':'signals.perturbations.perturbation_labels',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name:str):
+    if name not in _EXPORTS:
+        raise AttributeError("module 'signals' has no attribute '{}'".format(name))
+    value = getattr(importlib.import_module(_EXPORTS[name]),name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,184 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from signals.signal import Signal
+from signals.functions.noise_group import NoiseGroup
+
+
+class SignalBatch:
+    """
+    The SignalBatch class generates the samples of a whole fleet of signals over the same arithmetic
+    grid. Every signal is described by a spec: a dictionary holding the kwargs of a Signal (read the
+    documentation on the BaseLine and Noise constructors) and, optionally, a 'perturbations' entry
+    with a list of Perturbation objects to add to it.
+
+    Specs are sharded across a ProcessPoolExecutor. Every worker builds its signals, evaluates them
+    with Signal.calculate_array and writes the rows straight into a shared memory block, so no
+    DataFrame (or any per-signal result) is pickled back to the parent process. Every signal gets
+    its own random stream spawned from a single SeedSequence, so the result only depends on the
+    seed and not on the number of workers.
+
+    The noise of the fleet can also be correlated: given a NoiseGroup with one channel per spec, the
+    parent process draws the noise of all the signals at once (one bulk draw and one matrix product)
+    straight into the shared block, and the workers add the rest of every signal on top of it,
+    leaving the (independent) Noise of the signals out: the mean and std of the specs are then
+    ignored, the means and covariance of the group take their place.
+    """
+
+    _SHARDS_PER_WORKER = 4
+    """
+    Number of shards per worker, a few shards per worker keep the pool balanced.
+    """
+    def __init__(self,specs=None):
+        """
+        Constructor for the batch.
+        :param specs: an iterable of specs (dictionaries) to start the batch with (default empty).
+        """
+        self._specs = []
+        if specs is not None:
+            for spec in specs:
+                self.add_spec(spec)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def add_spec(self,spec:dict):
+        """
+        Adds the spec of a signal to the batch. It raises TypeError if the spec is not a dictionary.
+        :param spec: dictionary with the kwargs of a Signal and optionally a list of 'perturbations'.
+        :return: None. The spec is added to the batch.
+        """
+        if not isinstance(spec,dict):
+            raise TypeError("Error: signal spec is not a dictionary")
+        self._specs.append(spec)
+
+    def generate(self,t0:float=0,t1:float=1,n:int=100,workers:int=None,seed=None,noise=None)->tuple:
+        """
+        Samples every signal of the batch over the n point arithmetic grid of [t0,t1).
+        :param t0: the lower limit of the sample we wish to calculate
+        :param t1: the upper limit of the sample we wish to calculate
+        :param n: the number of points of each sample
+        :param workers: number of worker processes (default os.cpu_count()). With 1 worker the
+        batch is generated in the calling process. Raises TypeError if it is not an int and ValueError
+        if it is not positive.
+        :param seed: an int or a numpy SeedSequence from which the streams of the signals are spawned
+        (default None, fresh entropy).
+        :param noise: a NoiseGroup with one channel per spec, to sample the fleet with correlated noise
+        instead of the independent noise of every signal, whose mean and std are then dropped (default
+        None). The group draws from a copy of its stream, so it is left untouched and the same call
+        gives the same values again: a seeded group keeps its own seed, and an unseeded one gets a
+        stream spawned from seed. Raises TypeError if it is not a NoiseGroup and ValueError if it
+        does not have one channel per spec.
+        :return: a pair (t,values): t the np.ndarray with the n points of the grid and values a
+        (number of signals, n) np.ndarray with one sampled signal per row.
+        """
+        if type(t0) not in [int,float] or type(t1) not in [int,float]:
+            raise TypeError("Error: the limits of the interval are not numeric")
+        Signal._check_interval(t0,t1)
+        if type(n) is not int:
+            raise TypeError("Error: n should be an integer")
+        if n <= 0:
+            raise ValueError("Error: n should be positive")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if type(workers) is not int:
+            raise TypeError("Error: workers should be an integer")
+        if workers <= 0:
+            raise ValueError("Error: workers should be positive")
+        if not isinstance(seed,np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        seeds = seed.spawn(len(self._specs))
+        if noise is not None:
+            if not isinstance(noise,NoiseGroup):
+                raise TypeError("Error: noise is not a NoiseGroup")
+            if noise.channels != len(self._specs):
+                raise ValueError("Error: the noise group should have one channel per spec")
+            noise = copy.deepcopy(noise)
+            if not noise.is_seeded():
+                noise.set_seed(seed.spawn(1)[0])
+        t = Signal._arithmetic_grid(t0,t1,n)
+        shape = (len(self._specs),n)
+        if workers == 1 or len(self._specs) <= 1:
+            values = np.empty(shape,dtype=float)
+            if noise is not None:
+                noise.calculate_rows(n,out=values)
+            _sample_rows(values,0,self._specs,seeds,t0,t1,n,noise is not None)
+            return t,values
+
+        n_shards = min(len(self._specs),workers*self._SHARDS_PER_WORKER)
+        bounds = np.linspace(0,len(self._specs),n_shards + 1).astype(int)
+        block = shared_memory.SharedMemory(create=True,size=max(1,shape[0]*shape[1]*8))
+        try:
+            if noise is not None:
+                noise.calculate_rows(n,out=np.ndarray(shape,dtype=float,buffer=block.buf))
+            tasks = [(block.name,shape,lo,self._specs[lo:hi],seeds[lo:hi],t0,t1,n,noise is not None)
+                     for lo,hi in zip(bounds[:-1],bounds[1:]) if hi > lo]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_generate_shard,tasks))
+            values = np.array(np.ndarray(shape,dtype=float,buffer=block.buf))
+        finally:
+            block.close()
+            block.unlink()
+        return t,values
+
+
+def generate_many(specs,t0:float=0,t1:float=1,n:int=100,workers:int=None,seed=None,noise=None)->tuple:
+    """
+    Shortcut for SignalBatch(specs).generate(t0,t1,n,workers,seed,noise).
+    :param specs: an iterable of signal specs (see SignalBatch)
+    :return: a pair (t,values) with the grid and a (number of signals, n) np.ndarray of samples.
+    """
+    return SignalBatch(specs).generate(t0=t0,t1=t1,n=n,workers=workers,seed=seed,noise=noise)
+
+
+def _build_signals(specs:list,seeds:list)->list:
+    """
+    Builds the Signals described by a shard of specs through the bulk constructor Signal.from_specs,
+    so the parameters are checked once for the whole shard (with a single warning for invalid
+    deviations) instead of by every constructor. Perturbations are copied, so seeding them never
+    changes the objects held by the specs.
+    :param specs: list of dictionaries with the kwargs of a Signal and optionally a list of 'perturbations'
+    :param seeds: the SeedSequences of the signals (used unless a spec holds its own seed)
+    :return: list of Signals
+    """
+    rows = []
+    for spec,seed in zip(specs,seeds):
+        row = dict(spec)
+        row.setdefault('seed',seed)
+        row['perturbations'] = [copy.deepcopy(pert) for pert in row.get('perturbations') or []]
+        rows.append(row)
+    return Signal.from_specs(rows)
+
+
+def _sample_rows(values:np.ndarray,row_start:int,specs:list,seeds:list,t0:float,t1:float,n:int,
+                 shared_noise:bool=False):
+    """
+    Samples a shard of specs into consecutive rows of values.
+    :param shared_noise: if True, the rows already hold the noise of the signals, and the rest of
+    every signal is added to them.
+    :return: None. values is filled in place.
+    """
+    t = Signal._arithmetic_grid(t0,t1,n)
+    for k,signal in enumerate(_build_signals(specs,seeds)):
+        if shared_noise:
+            values[row_start + k] += signal._calculate_array(t,noise=False)
+        else:
+            values[row_start + k] = signal.calculate_array(t)
+
+
+def _generate_shard(task:tuple):
+    """
+    Worker entry point: attaches to the shared memory block and samples a shard into it.
+    :param task: tuple (block name, shape, first row, specs, seeds, t0, t1, n, shared noise)
+    :return: None
+    """
+    name,shape,row_start,specs,seeds,t0,t1,n,shared_noise = task
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        values = np.ndarray(shape,dtype=float,buffer=block.buf)
+        _sample_rows(values,row_start,specs,seeds,t0,t1,n,shared_noise)
+        del values
+    finally:
+        block.close()
@@ -0,0 +1,195 @@
+"""
+Benchmark suite for the sampling paths of the signals package. Run it as
+
+    python -m signals.bench [--sizes 100 1000 ...] [--perturbations 0 10 ...] [--output FILE]
+                            [--baseline FILE] [--tolerance 0.2]
+
+It times Signal.calculate (point by point), Signal.calculate_array (in float64 and float32, and with
+two threads), create_arithmetic_sample, iter_arithmetic_sample, the compiled plan, the noise and the
+perturbation evaluation for every sample size and perturbation count, plus the construction of that
+many signals one by one and through Signal.from_specs (where 'points' counts signals), and reports
+points/sec and peak memory (traced by tracemalloc in a separate run, so tracing does not distort the
+timings) as JSON. With --baseline, the results are compared against a previously saved report and
+the run fails if some path got slower than the tolerance allows.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+import numpy as np
+from signals.signal import Signal
+from signals.functions.noise import Noise
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+from signals.perturbations.step_perturbation import StepPerturbation
+
+DEFAULT_SIZES = [10**2,10**3,10**4,10**5,10**6,10**7]
+DEFAULT_PERTURBATIONS = [0,10,1000]
+DEFAULT_SCALAR_MAX = 10**5
+DEFAULT_TOLERANCE = 0.2
+_T0,_T1 = 0.0,100.0
+
+
+def make_signal(size:int,n_perturbations:int,seed:int=0)->Signal:
+    """
+    Builds the benchmark signal: a seeded signal over [0,100) with an even mix of constant, spike
+    and step perturbations spread over the interval.
+    :param size: the sample size of the signal
+    :param n_perturbations: the number of perturbations to add
+    :param seed: the seed of the signal
+    :return: Signal
+    """
+    signal = Signal(amp=2,per=1.5,phas=0.3,trans=1,mean=0,std=0.2,sample_size=size,seed=seed)
+    starts = np.linspace(_T0,_T1 - 1,n_perturbations)
+    for k,t0 in enumerate(starts.tolist()):
+        if k % 3 == 0:
+            signal.add_perturbation(Perturbation(t0=t0,support=0.5,strength=1))
+        elif k % 3 == 1:
+            signal.add_perturbation(SpikePerturbation(t0=t0,support=0.5,strength=3,position=t0+0.25,width=0.1))
+        else:
+            signal.add_perturbation(StepPerturbation(t0=t0,support=0.5,strength=2,step=t0+0.25,dir=1))
+    return signal
+
+
+def _measure(function,repeat:int)->tuple:
+    """
+    Times a call (best of repeat runs) and traces its peak memory in one extra run.
+    :return: pair (seconds,peak memory in bytes)
+    """
+    best = float('inf')
+    for k in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best,time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best,peak
+
+
+def _paths(size:int,n_perturbations:int,scalar_max:int)->dict:
+    """
+    Builds the callables of every sampling path for one configuration.
+    :return: dictionary {path name: callable}
+    """
+    signal = make_signal(size,n_perturbations)
+    t = signal._arithmetic_grid(_T0,_T1,size)
+    t32 = t.astype(np.float32)
+    plan = signal.compile()
+    paths = {
+        'calculate_array': lambda: signal.calculate_array(t),
+        'calculate_array_float32': lambda: signal.calculate_array(t32,np.float32),
+        'calculate_array_threaded': lambda: signal.calculate_array(t,threads=2),
+        'create_arithmetic_sample': lambda: signal.create_arithmetic_sample(_T0,_T1),
+        'iter_arithmetic_sample': lambda: [block for block in signal.iter_arithmetic_sample(_T0,_T1,size)],
+        'compiled': lambda: plan.calculate_array(t),
+    }
+    if size <= scalar_max:
+        paths['calculate'] = lambda: [signal.calculate(t_i) for t_i in t.tolist()]
+    if n_perturbations == 0:
+        noise = Noise(mean=0,std=1,seed=0)
+        paths['noise'] = lambda: noise.calculate_array(t)
+        if size <= scalar_max:
+            specs = [{'amp':2,'per':1.5,'phas':0.3,'trans':1,'mean':0,'std':0.2} for k in range(size)]
+            paths['construct'] = lambda: [Signal(**spec) for spec in specs]
+            paths['from_specs'] = lambda: Signal.from_specs(specs)
+    else:
+        perturbations = signal._perturbations
+        paths['perturbations'] = lambda: [pert.calculate_array(t[pert.support_slice(t)]) for pert in perturbations]
+    return paths
+
+
+def run_benchmarks(sizes=None,perturbation_counts=None,repeat:int=3,scalar_max:int=DEFAULT_SCALAR_MAX)->dict:
+    """
+    Runs every sampling path for every sample size and perturbation count.
+    :param sizes: list of sample sizes (default DEFAULT_SIZES)
+    :param perturbation_counts: list of perturbation counts (default DEFAULT_PERTURBATIONS)
+    :param repeat: number of timed runs per path (the best one is reported)
+    :param scalar_max: largest size for which the point by point path is timed
+    :return: the report, a dictionary with the 'meta' data of the run and the list of 'results'.
+    """
+    sizes = DEFAULT_SIZES if sizes is None else sizes
+    perturbation_counts = DEFAULT_PERTURBATIONS if perturbation_counts is None else perturbation_counts
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for n_perturbations in perturbation_counts:
+            for size in sizes:
+                for path,function in _paths(size,n_perturbations,scalar_max).items():
+                    seconds,peak = _measure(function,repeat)
+                    results.append({'path':path,
+                                    'points':size,
+                                    'perturbations':n_perturbations,
+                                    'seconds':seconds,
+                                    'points_per_sec':size/seconds if seconds > 0 else float('inf'),
+                                    'peak_memory_bytes':peak})
+    meta = {'python':platform.python_version(),
+            'numpy':np.__version__,
+            'machine':platform.machine(),
+            'repeat':repeat}
+    return {'meta':meta,'results':results}
+
+
+def compare(report:dict,baseline:dict,tolerance:float=DEFAULT_TOLERANCE)->list:
+    """
+    Compares a report against a baseline report.
+    :param report: the report of the current run (see run_benchmarks)
+    :param baseline: a previously saved report
+    :param tolerance: the accepted relative loss of points/sec (0.2 accepts runs up to 20% slower)
+    :return: list of regressions, dictionaries with the path, points, perturbations and both throughputs.
+    """
+    reference = {(entry['path'],entry['points'],entry['perturbations']):entry['points_per_sec']
+                 for entry in baseline['results']}
+    regressions = []
+    for entry in report['results']:
+        key = (entry['path'],entry['points'],entry['perturbations'])
+        if key in reference and entry['points_per_sec'] < reference[key]*(1 - tolerance):
+            regressions.append({'path':entry['path'],
+                                'points':entry['points'],
+                                'perturbations':entry['perturbations'],
+                                'points_per_sec':entry['points_per_sec'],
+                                'baseline_points_per_sec':reference[key]})
+    return regressions
+
+
+def main(argv=None)->int:
+    """
+    Command line entry point.
+    :param argv: list of arguments (default sys.argv[1:])
+    :return: exit status, 1 if a regression against the baseline was found and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog='python -m signals.bench',description='Benchmark the signals sampling paths.')
+    parser.add_argument('--sizes',type=int,nargs='+',default=DEFAULT_SIZES,help='sample sizes')
+    parser.add_argument('--perturbations',type=int,nargs='+',default=DEFAULT_PERTURBATIONS,help='perturbation counts')
+    parser.add_argument('--repeat',type=int,default=3,help='timed runs per path')
+    parser.add_argument('--scalar-max',type=int,default=DEFAULT_SCALAR_MAX,help='largest size timed point by point')
+    parser.add_argument('--output',help='file where the JSON report is written (default stdout)')
+    parser.add_argument('--baseline',help='JSON report to compare against')
+    parser.add_argument('--tolerance',type=float,default=DEFAULT_TOLERANCE,help='accepted relative slowdown')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes,args.perturbations,args.repeat,args.scalar_max)
+    status = 0
+    if args.baseline is not None:
+        with open(args.baseline,'r',encoding='utf-8') as baseline_file:
+            regressions = compare(report,json.load(baseline_file),args.tolerance)
+        report['regressions'] = regressions
+        if regressions:
+            status = 1
+    text = json.dumps(report,indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output,'w',encoding='utf-8') as output_file:
+            output_file.write(text)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
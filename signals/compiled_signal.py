@@ -0,0 +1,208 @@
+import numpy as np
+from signals.functions.function import Function
+from signals.functions.baseline import BaseLine
+from signals.functions.noise import Noise
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+from signals.perturbations.step_perturbation import StepPerturbation
+
+
+class CompiledSignal:
+    """
+    The CompiledSignal class is an immutable evaluation plan of a Signal (see Signal.compile). All the
+    validation and attribute lookups are done once, when the plan is built: the baseline coefficients,
+    the noise parameters and the parameters of the perturbations are resolved into flat read-only
+    NumPy arrays (one set of arrays per perturbation class), and calculate_array evaluates a whole time
+    array with a handful of fused array expressions:
+        - the baseline and the noise in one expression each,
+        - all the constant Perturbations at once with a difference array over the grid,
+        - the supports of all the spikes (and of all the steps) with one searchsorted call, followed
+          by one bulk draw per active perturbation.
+    Components of any other class (a HarmonicBank baseline, a colored noise, other perturbations) are
+    evaluated with their own calculate_array.
+
+    The plan is a snapshot: perturbations added to the signal afterwards are not part of it. It shares
+    the random streams of the signal's components, so for the same seed a sorted array gets the same
+    values as Signal.calculate_array (up to the rounding of the sums). The plan evaluates in the dtype
+    of the signal: a float32 signal gives a float32 plan, with the same float32 draws and the same
+    reduced float32 sine as the signal.
+    """
+    __slots__ = ('_baseline','_baseline_function','_noise','_noise_rng','_noise_function','_constants',
+                 '_spikes','_spike_rngs','_steps','_step_rngs','_generic','_sample_type','_dtype')
+
+    def __init__(self,signal):
+        """
+        Constructor for the plan.
+        :param signal: the Signal that we want to compile.
+        """
+        baseline = signal._baseline
+        if type(baseline) is BaseLine:
+            self._set('_baseline',self._freeze([baseline._amplitude,baseline._period,
+                                                baseline._phase,baseline._translation]))
+            self._set('_baseline_function',None)
+        else:
+            self._set('_baseline',None)
+            self._set('_baseline_function',baseline)
+        noise = signal._noise
+        if type(noise) is Noise:
+            self._set('_noise',self._freeze([noise._mean,noise._deviation]))
+            self._set('_noise_rng',noise.random_generator())
+            self._set('_noise_function',None)
+        else:
+            self._set('_noise',None)
+            self._set('_noise_rng',None)
+            self._set('_noise_function',noise)
+
+        constants,spikes,steps,generic = [],[],[],[]
+        spike_rngs,step_rngs = [],[]
+        perturbations = signal._perturbations if signal._perturbations is not None else []
+        for pert in perturbations:
+            if type(pert) is Perturbation:
+                constants.append([pert._t0,pert._t0 + pert._support,pert._strength])
+            elif type(pert) is SpikePerturbation:
+                spikes.append([pert._t0,pert._t0 + pert._support,pert._strength,
+                               pert._position,pert._width/2])
+                spike_rngs.append(pert.random_generator())
+            elif type(pert) is StepPerturbation:
+                steps.append([pert._t0,pert._t0 + pert._support,pert._strength,
+                              pert._step,pert._direction])
+                step_rngs.append(pert.random_generator())
+            else:
+                generic.append(pert)
+        self._set('_constants',self._freeze(constants,3))
+        self._set('_spikes',self._freeze(spikes,5))
+        self._set('_spike_rngs',tuple(spike_rngs))
+        self._set('_steps',self._freeze(steps,5))
+        self._set('_step_rngs',tuple(step_rngs))
+        self._set('_generic',tuple(generic))
+        self._set('_sample_type','NORMAL' if signal._perturbations is None else 'PERT')
+        self._set('_dtype',signal._resolve_dtype())
+
+    def _set(self,name,value):
+        object.__setattr__(self,name,value)
+
+    def __setattr__(self,name,value):
+        raise AttributeError("Error: CompiledSignal is immutable")
+
+    def __delattr__(self,name):
+        raise AttributeError("Error: CompiledSignal is immutable")
+
+    @staticmethod
+    def _freeze(rows,width=None)->np.ndarray:
+        """
+        Builds a read-only float array of parameters.
+        :param rows: list of parameters (or list of rows of parameters)
+        :param width: number of columns of the table (None for a flat list)
+        :return: read-only np.ndarray
+        """
+        array = np.array(rows,dtype=float)
+        if width is not None:
+            array = array.reshape(len(rows),width)
+        array.setflags(write=False)
+        return array
+
+    @property
+    def dtype(self)->np.dtype:
+        """
+        The dtype of the values of the plan (the dtype of the compiled signal).
+        """
+        return self._dtype
+
+    def sample_type(self)->str:
+        """
+        :return: PERT if the compiled signal has perturbations, NORMAL otherwise.
+        """
+        return self._sample_type
+
+    def calculate(self,t:float)->float:
+        """
+        Evaluates the plan at a single value of t.
+        :param t: the time on which we want to calculate the signal (int or float).
+        :return: the calculated value of the signal.
+        """
+        if type(t) not in [float,int]:
+            raise TypeError("Error: function variable is not numeric ")
+        return float(self.calculate_array(np.array([t],dtype=float))[0])
+
+    def calculate_array(self,t)->np.ndarray:
+        """
+        Evaluates the plan over a whole array of times.
+        :param t: array-like of numbers on which we want to calculate the signal.
+        :return: np.ndarray with the calculated values of the signal (with the dtype of the plan, t is
+        cast to it).
+        """
+        t = np.asarray(t)
+        if t.dtype.kind not in 'iuf':
+            raise TypeError("Error: function variable is not a numeric array")
+        t = t.astype(self._dtype,copy=False)
+        if self._baseline_function is not None:
+            values = self._baseline_function.calculate_array(t)
+        elif self._dtype == np.float32:
+            values = BaseLine.sin_float32(t,*self._baseline)
+        else:
+            amp,per,phas,trans = self._baseline
+            values = amp*np.sin(per*t + phas) + trans
+        if self._noise is None:
+            values += self._noise_function.calculate_array(t)
+        elif self._dtype == np.float32:
+            values += Function.normal_draw(self._noise_rng,self._noise[0],self._noise[1],t)
+        else:
+            values += self._noise_rng.normal(loc=self._noise[0],scale=self._noise[1],size=t.shape)
+        if t.size == 0:
+            return values
+        is_sorted = t.ndim == 1 and bool(np.all(t[1:] >= t[:-1]))
+        self._add_constants(t,values,is_sorted)
+        for k,block in self._active_blocks(t,self._spikes,is_sorted):
+            start,end,strength,position,half_width = self._spikes[k]
+            t_block = t[block]
+            random_numbers = Function.normal_draw(self._spike_rngs[k],strength,strength*0.15,t_block)
+            values[block] += np.where(np.abs(t_block - position) < half_width,random_numbers,random_numbers*0.1)
+        for k,block in self._active_blocks(t,self._steps,is_sorted):
+            start,end,strength,step,direction = self._steps[k]
+            t_block = t[block]
+            random_numbers = Function.normal_draw(self._step_rngs[k],strength,strength*0.05,t_block)
+            values[block] += random_numbers*np.where(t_block < step,-direction,direction)
+        for pert in self._generic:
+            values += pert.calculate_array(t)
+        return values
+
+    def _add_constants(self,t:np.ndarray,values:np.ndarray,is_sorted:bool):
+        """
+        Adds all the constant perturbations. On a sorted array every perturbation adds its strength
+        at the first index of its support and removes it after the last one, and a single cumulative
+        sum gives their total.
+        :return: None. values is updated in place.
+        """
+        if len(self._constants) == 0:
+            return
+        starts,ends,strengths = self._constants.T
+        if is_sorted:
+            lo = np.searchsorted(t,starts,side='right')
+            hi = np.maximum(lo,np.searchsorted(t,ends,side='left'))
+            steps = np.zeros(t.size + 1,dtype=float)
+            np.add.at(steps,lo,strengths)
+            np.add.at(steps,hi,-strengths)
+            values += np.cumsum(steps[:-1])
+        else:
+            for start,end,strength in self._constants:
+                values[(t > start) & (t < end)] += strength
+
+    def _active_blocks(self,t:np.ndarray,table:np.ndarray,is_sorted:bool):
+        """
+        Finds the points of t within the support of each perturbation of a parameter table (whose
+        first two columns are the start and the end of the supports).
+        :return: generator of pairs (row of the table, slice or boolean mask of t), skipping the
+        perturbations that are not active on t.
+        """
+        if len(table) == 0:
+            return
+        if is_sorted:
+            lo = np.searchsorted(t,table[:,0],side='right')
+            hi = np.searchsorted(t,table[:,1],side='left')
+            for k in np.nonzero(hi > lo)[0]:
+                yield k,slice(lo[k],hi[k])
+        else:
+            for k in range(len(table)):
+                mask = (t > table[k,0]) & (t < table[k,1])
+                if mask.any():
+                    yield k,mask
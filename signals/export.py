@@ -0,0 +1,143 @@
+"""
+Bulk columnar export of generated signals to Parquet or Arrow IPC files. pyarrow is an optional
+dependency of the package: it is only imported when an export is requested.
+"""
+import os
+import numpy as np
+
+FORMATS = {'parquet':'.parquet','arrow':'.arrow'}
+
+
+def _import_pyarrow():
+    """
+    Imports pyarrow on demand.
+    :return: the pyarrow module (raises ImportError with an explanation if it is not installed).
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError as error:
+        raise ImportError("Error: exporting samples requires pyarrow (pip install pyarrow)") from error
+    return pyarrow
+
+
+def export_samples(signals,path:str,t0:float=0,t1:float=1,n:int=100,file_format:str='parquet',
+                   window:float=None,chunk_size:int=None)->list:
+    """
+    Writes the n point arithmetic samples over [t0,t1) of many signals as a partitioned columnar
+    dataset, one file per signal and time window laid out as
+        path/signal_id=<id>/window=<k>/part-0.parquet
+    where window k holds the points with t0 + k*window <= t < t0 + (k+1)*window. Every file has the
+    columns t, signal and type (the PERT/NORMAL indicator of create_arithmetic_sample). Samples are
+    streamed with Signal.iter_arithmetic_sample and written as one row group (or record batch) per
+    block, so memory is bounded by chunk_size.
+
+    Which perturbation is active where (see Signal.calculate_array_with_labels) is written apart, as
+    the sparse side table path/_perturbations.parquet (or .arrow) with one row per perturbation that is active
+    somewhere in the sample and the columns signal_id, perturbation (its position in the signal),
+    start and stop (the range of indices of the sample where it is active) and t_first and t_last
+    (the times of the first and last of those points), so the labels take O(P) space instead of a
+    column per perturbation. The leading underscore keeps it out of the dataset when the directory
+    is read as a whole (e.g. with pyarrow.dataset).
+    :param signals: a dictionary {signal id: Signal} or a list of Signals (their ids are their positions)
+    :param path: the root directory of the dataset
+    :param t0: the lower limit of the samples
+    :param t1: the upper limit of the samples
+    :param n: the number of points of each sample
+    :param file_format: 'parquet' or 'arrow' (Arrow IPC file format)
+    :param window: the width of the time windows (default None, a single window)
+    :param chunk_size: the number of points per block (default Signal._DEFAULT_CHUNK_SIZE)
+    :return: list with the paths of the written files (the side table last).
+    """
+    if file_format not in FORMATS:
+        raise ValueError("Error: file_format should be one of {}".format(sorted(FORMATS)))
+    if window is not None and window <= 0:
+        raise ValueError("Error: window should be positive")
+    pa = _import_pyarrow()
+    if not isinstance(signals,dict):
+        signals = dict(enumerate(signals))
+    written = []
+    ranges = {'signal_id':[],'perturbation':[],'start':[],'stop':[],'t_first':[],'t_last':[]}
+    for signal_id,signal in signals.items():
+        writer = None
+        current_window = None
+        n_perturbations = 0 if signal._perturbations is None else len(signal._perturbations)
+        starts = np.full(n_perturbations,-1,dtype=np.int64)
+        stops = np.zeros(n_perturbations,dtype=np.int64)
+        t_first = np.zeros(n_perturbations)
+        t_last = np.zeros(n_perturbations)
+        offset = 0
+        try:
+            for t,values,block_labels in signal.iter_arithmetic_sample(t0,t1,n,chunk_size,labels=True):
+                active = block_labels.stops > block_labels.starts
+                first = active & (starts < 0)
+                starts[first] = offset + block_labels.starts[first]
+                t_first[first] = t[block_labels.starts[first]]
+                stops[active] = offset + block_labels.stops[active]
+                t_last[active] = t[block_labels.stops[active] - 1]
+                offset += t.size
+                if window is None:
+                    windows = np.zeros(t.size,dtype=int)
+                else:
+                    windows = np.floor((t - t0)/window).astype(int)
+                bounds = np.flatnonzero(np.diff(windows)) + 1
+                for lo,hi in zip(np.concatenate([[0],bounds]),np.concatenate([bounds,[t.size]])):
+                    table = _block_table(pa,signal,t[lo:hi],values[lo:hi])
+                    if windows[lo] != current_window:
+                        if writer is not None:
+                            writer.close()
+                        current_window = int(windows[lo])
+                        file_name = os.path.join(path,'signal_id={}'.format(signal_id),
+                                                 'window={}'.format(current_window),
+                                                 'part-0' + FORMATS[file_format])
+                        os.makedirs(os.path.dirname(file_name),exist_ok=True)
+                        writer = _open_writer(pa,file_name,table.schema,file_format)
+                        written.append(file_name)
+                    writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        found = np.flatnonzero(starts >= 0)
+        ranges['signal_id'] += [str(signal_id)]*found.size
+        ranges['perturbation'] += found.tolist()
+        ranges['start'] += starts[found].tolist()
+        ranges['stop'] += stops[found].tolist()
+        ranges['t_first'] += t_first[found].tolist()
+        ranges['t_last'] += t_last[found].tolist()
+    os.makedirs(path,exist_ok=True)
+    file_name = os.path.join(path,'_perturbations' + FORMATS[file_format])
+    table = pa.table({'signal_id':pa.array(ranges['signal_id'],type=pa.string()),
+                      'perturbation':pa.array(ranges['perturbation'],type=pa.int64()),
+                      'start':pa.array(ranges['start'],type=pa.int64()),
+                      'stop':pa.array(ranges['stop'],type=pa.int64()),
+                      't_first':pa.array(ranges['t_first'],type=pa.float64()),
+                      't_last':pa.array(ranges['t_last'],type=pa.float64())})
+    writer = _open_writer(pa,file_name,table.schema,file_format)
+    try:
+        writer.write_table(table)
+    finally:
+        writer.close()
+    written.append(file_name)
+    return written
+
+
+def _block_table(pa,signal,t:np.ndarray,values:np.ndarray):
+    """
+    Builds the Arrow table of a block of points.
+    :return: pyarrow.Table with the columns t, signal and type.
+    """
+    sample_type = 'PERT' if signal._perturbations is not None else 'NORMAL'
+    return pa.table({'t':t,
+                     'signal':values,
+                     'type':pa.DictionaryArray.from_arrays(np.zeros(t.size,dtype=np.int8),[sample_type])})
+
+
+def _open_writer(pa,file_name:str,schema,file_format:str):
+    """
+    Opens the writer of one file of the dataset.
+    :return: a pyarrow ParquetWriter or RecordBatchFileWriter (both have write_table and close).
+    """
+    if file_format == 'parquet':
+        return pa.parquet.ParquetWriter(file_name,schema)
+    return pa.ipc.new_file(file_name,schema)
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from .function import Function
 
 class BaseLine(Function):
@@ -12,6 +13,7 @@ class BaseLine(Function):
         phas: to set the phase of the signal (default value is 0)
         trans: to set the translation of the signal (default value is 0)
     """
+    __slots__ = ('_amplitude','_period','_phase','_translation')
 
     def construct_function(self,kwargs:dict):
         """
@@ -38,6 +40,67 @@ class BaseLine(Function):
             sin_arg = self._period*t + self._phase
             return self._amplitude*math.sin(sin_arg) + self._translation
 
+    def calculate_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of calculate(t). For a float32 array the argument wt+r is computed in
+        float64 and reduced to [-pi,pi] before taking the sine in float32: a float32 argument carries
+        an absolute error of about |wt+r|*6e-8 (already 0.06 rad at wt = 10^6), while the reduced
+        one is only off by the float32 rounding of a number below 2pi, so the values are accurate to
+        float32 precision at the (float32) times of t, however large they are.
+        :param t: (np.ndarray) the values at which we want to calculate the function
+        :return: np.ndarray with A sin(wt+r) + c evaluated at every value of t (with the dtype of t).
+        """
+        t = self.check_array(t)
+        if t.dtype == np.float32:
+            return self.sin_float32(t,self._amplitude,self._period,self._phase,self._translation)
+        sin_arg = self._period*t + self._phase
+        return self._amplitude*np.sin(sin_arg) + self._translation
+
+    def accumulate_array(self,t:np.ndarray,out:np.ndarray,scratch:np.ndarray=None):
+        """
+        BaseLine implementation of accumulate_array: a float64 array is evaluated in scratch, with the
+        same operations as calculate_array, and added to out without allocating. A float32 array (or
+        a subclass that overrides calculate_array) goes through calculate_array.
+        :return: None
+        """
+        if scratch is None or t.dtype != np.float64 or type(self).calculate_array is not BaseLine.calculate_array:
+            return super().accumulate_array(t,out,scratch)
+        np.multiply(t,self._period,out=scratch)
+        scratch += self._phase
+        np.sin(scratch,out=scratch)
+        scratch *= self._amplitude
+        scratch += self._translation
+        out += scratch
+
+    @staticmethod
+    def sin_float32(t:np.ndarray,amplitude:float,period:float,phase:float,translation:float)->np.ndarray:
+        """
+        The float32 evaluation of A sin(wt+r) + c (see calculate_array), shared with CompiledSignal.
+        :param t: float32 np.ndarray
+        :return: float32 np.ndarray with the values at every value of t.
+        """
+        sin_arg = t.astype(float)
+        sin_arg *= period
+        sin_arg += phase
+        turns = sin_arg*(1/(2*math.pi))
+        np.rint(turns,out=turns)
+        turns *= 2*math.pi
+        sin_arg -= turns
+        values = np.sin(sin_arg.astype(np.float32))
+        values *= np.float32(amplitude)
+        values += np.float32(translation)
+        return values
+
+    def harmonics(self)->tuple:
+        """
+        The baseline as a sum of sinusoids plus a translation, the form in which signals.stats
+        integrates it (see HarmonicBank.harmonics).
+        :return: tuple (amplitudes,periods,phases,translation), the first three being np.ndarrays of
+        one value.
+        """
+        return (np.array([self._amplitude],dtype=float),np.array([self._period],dtype=float),
+                np.array([self._phase],dtype=float),float(self._translation))
+
     def wave_length(self):
         if self._period == 0:
             return math.inf
@@ -0,0 +1,273 @@
+import numpy as np
+from .noise import Noise
+
+_NEGLIGIBLE = 1e-20
+"""
+Below this weight, the older terms of a first order filter are dropped (see _first_order_filter).
+"""
+_SCAN_BLOCK = 64
+"""
+The number of points of the sub-blocks of _first_order_filter.
+"""
+
+
+def _first_order_filter(poles:np.ndarray,w:np.ndarray,state:np.ndarray)->np.ndarray:
+    """
+    Runs K first order recursive filters x[k] = pole*x[k-1] + w[k] over N inputs without a Python
+    loop over the points. The inputs are split in sub-blocks of _SCAN_BLOCK points, every sub-block
+    is filtered from a zero state with a prefix scan (after the pass of a shift s every point holds
+    the sum of its last 2s weighted inputs, so log2(_SCAN_BLOCK) vectorized passes at most, fewer
+    when the poles are small and the older terms become negligible), the states at the ends of the
+    sub-blocks follow the same recursion with the pole pole^_SCAN_BLOCK (solved the same way, over N
+    /_SCAN_BLOCK points), and each sub-block finally gets the decayed state of the previous one.
+    :param poles: np.ndarray of K poles in [-1,1]
+    :param w: (K x N) np.ndarray of inputs
+    :param state: np.ndarray with the K outputs before the first input
+    :return: (K x N) np.ndarray of outputs.
+    """
+    k,n = w.shape
+    size = min(n,_SCAN_BLOCK)
+    m = -(-n//size)
+    x = np.zeros((k,m*size))
+    x[:,:n] = w
+    blocks = x.reshape(k,m,size)
+    shift = 1
+    powers = poles.astype(float)
+    while shift < size and np.max(np.abs(powers)) > _NEGLIGIBLE:
+        blocks[:,:,shift:] += powers[:,np.newaxis,np.newaxis]*blocks[:,:,:-shift]
+        shift *= 2
+        powers *= powers
+    if m == 1:
+        previous = state[:,np.newaxis]
+    else:
+        ends = _first_order_filter(poles**size,blocks[:,:-1,-1],state)
+        previous = np.concatenate([state[:,np.newaxis],ends],axis=1)
+    decay = np.power(poles[:,np.newaxis],np.arange(1,size + 1))
+    blocks += previous[:,:,np.newaxis]*decay[:,np.newaxis,:]
+    return x[:,:n]
+
+
+def _bank_covariance(poles:np.ndarray,gains:np.ndarray)->np.ndarray:
+    """
+    The stationary covariance of the state (s_1,...,s_K,e[k-1]) of a filter bank driven by standard
+    white noise e, s_i[k] = p_i*s_i[k-1] + g_i*e[k] (see _FilteredNoise).
+    :return: (K+1 x K+1) np.ndarray
+    """
+    covariance = np.ones((poles.size + 1,poles.size + 1))
+    covariance[:-1,:-1] = np.outer(gains,gains)/(1 - np.outer(poles,poles))
+    covariance[:-1,-1] = covariance[-1,:-1] = gains
+    return covariance
+
+
+def _bank_variance(poles:np.ndarray,gains:np.ndarray,direct:float,delayed:float)->float:
+    """
+    The stationary variance of the output of a filter bank (see _FilteredNoise): the sum of the
+    squares of its impulse response h[n] = sum_i g_i*p_i^n + direct*[n=0] + delayed*[n=1].
+    :return: float
+    """
+    variance = np.sum(np.outer(gains,gains)/(1 - np.outer(poles,poles)))
+    variance += 2*direct*np.sum(gains) + 2*delayed*np.sum(gains*poles)
+    return float(variance + direct**2 + delayed**2)
+
+
+class _FilteredNoise(Noise):
+    """
+    The base of the colored noises: Gaussian white noise e shaped by a bank of first order filters,
+    R[k] = mu + c*(sum_i s_i[k] + direct*e[k] + delayed*e[k-1]), s_i[k] = p_i*s_i[k-1] + g_i*e[k]
+    where the poles p_i, the gains g_i and the direct and delayed weights come from _filter_bank()
+    (by default an empty bank with direct 1, plain white noise), and c scales every value to a
+    standard deviation of std (computed exactly from the stationary variance of the bank). The filter
+    starts from a state drawn from the stationary distribution of the bank.
+
+    The numbers of a block are drawn in bulk and filtered with array operations, and the state of the
+    filter is carried from one call to the next, so that sampling a grid in chunks
+    (iter_arithmetic_sample, SignalRingBuffer) gives the same values, up to rounding, as sampling it
+    at once. The values of a call thus depend on the previous calls: reset() restarts the filter, and
+    the filter state is part of the stream state (get_stream_state) and of the cache token of the
+    noise. The filters run in float64 and the values are cast to the dtype of t.
+    """
+    __slots__ = ('_state',)
+    _STATEFUL = True
+
+    def construct_function(self,kwargs:dict):
+        super().construct_function(kwargs)
+        self._state = None
+
+    def reset(self):
+        """
+        Restarts the filter: the next call starts from a fresh state.
+        :return: None
+        """
+        self._state = None
+
+    def get_stream_state(self):
+        """
+        The state of the random stream of the noise, with the state of its filter.
+        :return: pair (bit generator state, filter state) if the noise is seeded, None otherwise.
+        """
+        state = super().get_stream_state()
+        if state is None:
+            return None
+        return state,None if self._state is None else self._state.copy()
+
+    def set_stream_state(self,state):
+        """
+        Restores a state returned by get_stream_state().
+        :param state: the state to restore (None does nothing).
+        :return: None
+        """
+        if state is not None:
+            super().set_stream_state(state[0])
+            self._state = None if state[1] is None else state[1].copy()
+
+    def calculate(self,t:float)->float:
+        """
+        The next value of the noise.
+        :param t: (float) the value at which we want to return the function
+        :return: random number for value t (raises TypeError if t is not int or float).
+        """
+        if type(t) not in [float,int]:
+            raise TypeError("Error function variable is not numeric ")
+        return float(self.calculate_array(np.zeros(1))[0])
+
+    def calculate_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of calculate(t): one bulk draw of white noise, filtered in the order of
+        the array.
+        :param t: (np.ndarray) the values at which we want to return the noise
+        :return: np.ndarray of random numbers with the same shape (and dtype) as t.
+        """
+        t = self.check_array(t)
+        if t.size == 0:
+            return np.empty(t.shape,dtype=t.dtype)
+        if self._state is None:
+            self._state = self._initial_state()
+        white = self.normal_array(0.0,1.0,t).ravel().astype(float)
+        values = self._filter(white)
+        values += self._mean
+        return values.reshape(t.shape).astype(t.dtype,copy=False)
+
+    def _filter_bank(self)->tuple:
+        """
+        The filter bank of the noise.
+        :return: tuple (poles,gains,direct,delayed), poles and gains being np.ndarrays of K numbers.
+        """
+        return np.zeros(0),np.zeros(0),1.0,0.0
+
+    def _initial_state(self)->np.ndarray:
+        """
+        Draws the state of the filter before the first value from its stationary distribution.
+        :return: np.ndarray with the K states of the bank and the previous white number.
+        """
+        poles,gains,direct,delayed = self._filter_bank()
+        values,vectors = np.linalg.eigh(_bank_covariance(poles,gains))
+        factor = vectors*np.sqrt(np.maximum(values,0))
+        draws = np.asarray(self.random_generator().standard_normal(size=values.size),dtype=float)
+        return factor @ draws
+
+    def _filter(self,white:np.ndarray)->np.ndarray:
+        """
+        Filters a block of standard white noise, updating self._state.
+        :param white: np.ndarray of N standard normal numbers
+        :return: np.ndarray of N values around 0.
+        """
+        poles,gains,direct,delayed = self._filter_bank()
+        previous = self._state[-1]
+        values = direct*white
+        if poles.size > 0:
+            bank = _first_order_filter(poles,gains[:,np.newaxis]*white,self._state[:-1])
+            values += bank.sum(axis=0)
+            self._state = np.append(bank[:,-1],white[-1])
+        else:
+            self._state = white[-1:].copy()
+        if delayed != 0:
+            values[0] += delayed*previous
+            values[1:] += delayed*white[:-1]
+        values *= self._deviation/np.sqrt(_bank_variance(poles,gains,direct,delayed))
+        return values
+
+
+class AR1Noise(_FilteredNoise):
+    """
+    First order autoregressive noise (the sampled Ornstein-Uhlenbeck process), of the form
+    R[k] - mu = phi*(R[k-1] - mu) + sigma*sqrt(1 - phi^2)*e[k], e[k] ~ N(0,1)
+    the constructor expects the parameters of Noise (mean and std, which are the mean and standard
+    deviation of every value) and
+        phi: the correlation between consecutive values, in (-1,1) (default value is 0, white noise)
+    It is the filter bank with the single pole phi (see _FilteredNoise), started from its stationary
+    distribution, so every value is N(mu,sigma).
+    """
+    __slots__ = ('_phi',)
+
+    def construct_function(self,kwargs:dict):
+        """
+        AR1Noise implementation of the construct_function(kwargs) method
+        :param kwargs: a dictionary containing perhaps mean, std and phi.
+        :return: None. AR1Noise attributes are set internally.
+        """
+        super().construct_function(kwargs)
+        self.set_parameter(kwargs,'_phi','phi',0)
+        if not -1 < self._phi < 1:
+            raise ValueError("Value Error: phi should be in (-1,1)")
+
+    def __str__(self):
+        return 'AR1({:,.2f},{:,.2f},{:,.2f})'.format(self._mean,self._deviation,self._phi)
+
+    def __repr__(self):
+        return 'AR1Noise(mean={},std={},phi={})'.format(self._mean,self._deviation,self._phi)
+
+    def _filter_bank(self)->tuple:
+        return np.array([float(self._phi)]),np.ones(1),0.0,0.0
+
+
+class PinkNoise(_FilteredNoise):
+    """
+    Pink (1/f) noise, whose power falls by 3dB per octave: the filter bank (see _FilteredNoise)
+    R[k] = mu + c*(sum_i s_i[k] + 0.5362*e[k] + 0.115926*e[k-1]), s_i[k] = p_i*s_i[k-1] + g_i*e[k]
+    with the poles p_i and gains g_i of Paul Kellet's filter bank (accurate to 0.05dB above 9.2Hz at a
+    44.1kHz sample rate, i.e. over all but the lowest ~1/5000 of the band). The constructor expects the
+    parameters of Noise: mean and std, the standard deviation of every value.
+    """
+    __slots__ = ()
+    _POLES = np.array([0.99886,0.99332,0.969,0.8665,0.55,-0.7616])
+    _GAINS = np.array([0.0555179,0.0750759,0.153852,0.3104856,0.5329522,-0.016898])
+    _DIRECT = 0.5362
+    _DELAYED = 0.115926
+
+    def __str__(self):
+        return 'Pink({:,.2f},{:,.2f})'.format(self._mean,self._deviation)
+
+    def __repr__(self):
+        return 'PinkNoise(mean={},std={})'.format(self._mean,self._deviation)
+
+    def _filter_bank(self)->tuple:
+        return self._POLES,self._GAINS,self._DIRECT,self._DELAYED
+
+
+class BrownNoise(_FilteredNoise):
+    """
+    Brown (1/f^2) noise, the Gaussian random walk
+    R[k] = R[k-1] + sigma*e[k], e[k] ~ N(0,1), R[-1] = mu
+    the constructor expects the parameters of Noise: mean (the level the walk starts from) and std
+    (the standard deviation of every step). The walk is not stationary: its variance grows with the
+    number of values drawn, so instead of the stationary start and scaling of _FilteredNoise the walk
+    starts at mu and is integrated with a cumulative sum.
+    """
+    __slots__ = ()
+    _STATIONARY = False
+
+    def __str__(self):
+        return 'Brown({:,.2f},{:,.2f})'.format(self._mean,self._deviation)
+
+    def __repr__(self):
+        return 'BrownNoise(mean={},std={})'.format(self._mean,self._deviation)
+
+    def _initial_state(self)->np.ndarray:
+        return np.zeros(1)
+
+    def _filter(self,white:np.ndarray)->np.ndarray:
+        values = np.cumsum(white)
+        values *= self._deviation
+        values += self._state[0]
+        self._state = values[-1:].copy()
+        return values
@@ -1,13 +1,119 @@
 import warnings
+import numpy as np
+
 class Function:
-    """"This class is the abstract base for function calculation"""
+    """"This class is the abstract base for function calculation
+
+    Functions that draw random numbers accept a seed kwarg (an int, a numpy SeedSequence or a numpy
+    Generator). A seeded function owns its own numpy.random.Generator stream, otherwise it draws from
+    the global numpy.random state. Array evaluation (calculate_array) draws all the numbers it needs
+    in bulk from that stream, in the order of the array, so for the same seed it returns the same
+    values as calling calculate(t) point by point.
+
+    Array evaluation works in float64, or in float32 when it is given a float32 array: the values
+    come out with the dtype of the array and seeded functions draw float32 numbers natively (so a
+    float32 evaluation follows a different stream than a float64 one, or than calculate(t)).
+
+    Functions are __slots__ based: every subclass lists its attributes in __slots__, so objects carry
+    no __dict__ (get_parameters() returns their attributes as a dictionary). Function objects created
+    directly keep free parameters, so they are built as _GenericFunction objects, which have a __dict__.
+    """
+    __slots__ = ('_rng',)
+
+    _RANDOM = False
+    """
+    Class flag, True for the functions whose values are drawn from a random stream.
+    """
+
+    _STATEFUL = False
+    """
+    Class flag, True for the functions whose values depend on the previous evaluations (the
+    filtered noises of colored_noise), which have to be evaluated in the order of the samples.
+    """
+
+    def __new__(cls,*args,**kwargs):
+        if cls is Function:
+            cls = _GenericFunction
+        return object.__new__(cls)
 
     def __init__(self,**kwargs):
+        seed = kwargs.pop('seed',None)
         args_wrong = self.check_numeric(kwargs)
         if args_wrong is not None:
             raise TypeError("The Following parameters are not numeric: {}".format(args_wrong))
         else:
             self.construct_function(kwargs)
+            if seed is not None:
+                self.set_seed(seed)
+
+    def get_parameters(self)->dict:
+        """
+        The attributes of the function (without its random stream).
+        :return: dictionary {attribute name: value} of the attributes that are set.
+        """
+        parameters = {}
+        for cls in reversed(type(self).__mro__):
+            for name in cls.__dict__.get('__slots__',()):
+                if name not in ('_rng','__dict__','__weakref__') and hasattr(self,name):
+                    parameters[name] = getattr(self,name)
+        parameters.update(getattr(self,'__dict__',{}))
+        return parameters
+
+    def set_seed(self,seed):
+        """
+        Gives the function its own random number stream.
+        :param seed: an int, a numpy SeedSequence or a numpy Generator (used as is).
+        :return: None. The generator is stored in self._rng.
+        """
+        self._rng = np.random.default_rng(seed)
+
+    def is_seeded(self)->bool:
+        """
+        Checks if the function owns a random number stream.
+        :return: True if set_seed has been called, False otherwise.
+        """
+        return hasattr(self,'_rng')
+
+    def random_generator(self):
+        """
+        The source of random numbers of the function.
+        :return: the function's numpy Generator if seeded, the global numpy.random module otherwise.
+        """
+        return getattr(self,'_rng',np.random)
+
+    def get_stream_state(self):
+        """
+        The state of the random stream of the function.
+        :return: the state of the bit generator if the function is seeded, None otherwise.
+        """
+        if self.is_seeded():
+            return self._rng.bit_generator.state
+        return None
+
+    def set_stream_state(self,state):
+        """
+        Restores a state returned by get_stream_state().
+        :param state: the state to restore (None does nothing).
+        :return: None
+        """
+        if state is not None:
+            self._rng.bit_generator.state = state
+
+    def cache_token(self):
+        """
+        A string that identifies the values that calculate_array returns for a given array: the repr
+        of the function, plus the state of its stream for random functions. Only classes that define
+        their own __repr__ (so that it holds all their parameters) can be cached.
+        :return: str, or None if the values cannot be reused (random functions without a seed).
+        """
+        if '__repr__' not in type(self).__dict__:
+            return None
+        token = repr(self)
+        if self._RANDOM:
+            if not self.is_seeded():
+                return None
+            token += repr(self.get_stream_state())
+        return token
 
     def construct_function(self,kwargs):
         """
@@ -84,3 +190,75 @@ class Function:
         :return: the value calculated at t.
         """
         return 0
+
+    def check_array(self,t)->np.ndarray:
+        """
+        Converts the argument of an array evaluation into a float NumPy array.
+        :param t: an array-like of numbers (lists, tuples and NumPy arrays are accepted)
+        :return: np.ndarray of floats, float32 arrays are kept as they are and anything else is
+        converted to float64 (raises TypeError if t does not hold numbers).
+        """
+        t = np.asarray(t)
+        if t.dtype.kind not in 'iuf':
+            raise TypeError("Error: function variable is not a numeric array")
+        if t.dtype == np.float32:
+            return t
+        return t.astype(float,copy=False)
+
+    def normal_array(self,loc:float,scale:float,t:np.ndarray)->np.ndarray:
+        """
+        Bulk draw of one N(loc,scale) number per value of t, with the dtype of t. A seeded function
+        draws float32 numbers natively for a float32 array, the global numpy.random state can only
+        draw float64 numbers, which are then cast.
+        :param loc: the mean of the draws
+        :param scale: the standard deviation of the draws
+        :param t: np.ndarray of floats (see check_array)
+        :return: np.ndarray of random numbers with the shape and dtype of t.
+        """
+        return self.normal_draw(self.random_generator(),loc,scale,t)
+
+    @staticmethod
+    def normal_draw(generator,loc:float,scale:float,t:np.ndarray)->np.ndarray:
+        """
+        The draw of normal_array from a given source of random numbers (shared with CompiledSignal).
+        :param generator: a numpy Generator or the numpy.random module
+        :return: np.ndarray of random numbers with the shape and dtype of t.
+        """
+        if t.dtype == np.float32 and isinstance(generator,np.random.Generator):
+            values = generator.standard_normal(size=t.shape,dtype=np.float32)
+            values *= np.float32(scale)
+            values += np.float32(loc)
+            return values
+        return generator.normal(loc=loc,scale=scale,size=t.shape).astype(t.dtype,copy=False)
+
+    def calculate_array(self,t:np.ndarray)->np.ndarray:
+        """
+        The array version of calculate(t): evaluates the function over a whole time grid at once.
+        Subclasses override this method with a vectorized rule, the default implementation
+        falls back to calling calculate(t) point by point.
+        :param t: (np.ndarray) the values at which we want to calculate the function
+        :return: np.ndarray with the function calculated at every value of t (raises TypeError if t is not numeric).
+        """
+        t = self.check_array(t)
+        return np.fromiter((self.calculate(float(t_i)) for t_i in t.ravel()),
+                           dtype=t.dtype,count=t.size).reshape(t.shape)
+
+    def accumulate_array(self,t:np.ndarray,out:np.ndarray,scratch:np.ndarray=None):
+        """
+        Adds calculate_array(t) to out in place, the evaluation path of callers that keep their own
+        buffers (see SignalRingBuffer). Subclasses whose values can be computed in a preallocated
+        array override it, the default implementation adds the array returned by calculate_array.
+        :param t: np.ndarray of floats (already checked, see check_array)
+        :param out: np.ndarray with the shape and dtype of t, updated in place
+        :param scratch: np.ndarray with the shape and dtype of t that the function may overwrite (None
+        if there is none)
+        :return: None
+        """
+        out += self.calculate_array(t)
+
+
+class _GenericFunction(Function):
+    """
+    A Function created directly (Function(**kwargs)), its free parameters are kept in a __dict__.
+    """
+    __slots__ = ('__dict__',)
@@ -0,0 +1,149 @@
+import math
+import warnings
+import numpy as np
+from .function import Function
+
+class HarmonicBank(Function):
+    """
+    The class that holds a bank of K sinusoids (harmonics) to build rich periodic baselines (see
+    Signal.set_baseline). It is the parametric function
+    H(t) = sum_k A_k sin(w_k t + r_k) + c
+    and the constructor expects the parameters as sequences of the same length K:
+        amp: the amplitudes A_k (default empty)
+        per: the periods w_k (default empty)
+        phas: the phases r_k (default all 0)
+        trans: the translation c, a number (default value is 0)
+    An array of N points is evaluated as the single matrix operation sin(outer(t,w) + r) @ A (in blocks
+    of rows to bound the memory). For banks of at least _FFT_MIN_HARMONICS harmonics sampled over a
+    uniform grid where every harmonic completes a whole number of cycles, the N points are synthesized
+    instead with one inverse real FFT.
+    """
+    __slots__ = ('_amplitudes','_periods','_phases','_translation')
+
+    _FFT_MIN_HARMONICS = 64
+    """
+    Minimum number of harmonics for which the FFT synthesis path is tried.
+    """
+    _BLOCK_ELEMENTS = 2**20
+    """
+    Maximum number of elements of the (points x harmonics) matrix evaluated at once.
+    """
+    def __init__(self,**kwargs):
+        self.construct_function(kwargs)
+
+    def construct_function(self,kwargs:dict):
+        """
+        HarmonicBank implementation of the construct_function(kwargs) method
+        :param kwargs: a dictionary containing perhaps the parameters of a HarmonicBank. The Dictionary
+        needs to hold sequences amp (for self._amplitudes), per (for self._periods) and phas (for
+        self._phases) of the same length, and the number trans (for self._translation).
+        :return: None. HarmonicBank attributes are set internally.
+        """
+        self._set_array_parameter(kwargs,'_amplitudes','amp',None)
+        self._set_array_parameter(kwargs,'_periods','per',None)
+        size = max(self._amplitudes.size,self._periods.size)
+        self._set_array_parameter(kwargs,'_phases','phas',size)
+        self.set_parameter(kwargs,'_translation','trans',0)
+        if not (self._amplitudes.size == self._periods.size == self._phases.size):
+            raise ValueError("Value Error: amp, per and phas should have the same length")
+
+    def _set_array_parameter(self,param_dict:dict,nom_attr:str,nom_param:str,default_size:int):
+        """
+        Asserts and assigns a one dimensional array of numbers.
+        :param param_dict: the dictionary of parameters
+        :param nom_attr: the name of the attribute
+        :param nom_param: the name of the parameter
+        :param default_size: the size of the array of zeros used when the parameter is missing
+        (None for an empty array, with a warning).
+        :return: None
+        """
+        if nom_param not in param_dict:
+            if default_size is None:
+                warnings.warn('Warning: parameter {} not in kwargs, using [] instead'.format(nom_param))
+                default_size = 0
+            self.__setattr__(nom_attr,np.zeros(default_size,dtype=float))
+        else:
+            value = np.atleast_1d(np.asarray(param_dict[nom_param]))
+            if value.dtype.kind not in 'iuf' or value.ndim != 1:
+                raise TypeError('Type Error: Parameter {} is not a sequence of numbers'.format(nom_param))
+            self.__setattr__(nom_attr,value.astype(float))
+
+    def calculate(self,t:float)->float:
+        """
+        The rule that composes the function.
+        :param t: (float) the value at which we want to return the function
+        :return: the value calculated at t (raises TypeError if t is not int or float).
+        """
+        if type(t) not in [float,int]:
+            raise TypeError("Error function variable is not numeric ")
+        else:
+            return float(np.dot(self._amplitudes,np.sin(self._periods*t + self._phases))) + self._translation
+
+    def calculate_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of calculate(t).
+        :param t: (np.ndarray) the values at which we want to calculate the function
+        :return: np.ndarray with H(t) evaluated at every value of t (the harmonics are summed in
+        float64 and the result is cast to the dtype of t).
+        """
+        t = self.check_array(t)
+        flat_t = t.ravel()
+        values = None
+        if self._amplitudes.size >= self._FFT_MIN_HARMONICS:
+            values = self._fft_synthesis(flat_t)
+        if values is None:
+            values = np.empty(flat_t.shape,dtype=float)
+            rows = max(1,self._BLOCK_ELEMENTS//max(1,self._amplitudes.size))
+            for start in range(0,flat_t.size,rows):
+                t_block = flat_t[start:start + rows]
+                values[start:start + rows] = np.sin(np.outer(t_block,self._periods) + self._phases) @ self._amplitudes
+        values += self._translation
+        return values.reshape(t.shape).astype(t.dtype,copy=False)
+
+    def _fft_synthesis(self,t:np.ndarray):
+        """
+        Synthesizes the harmonics over a uniform grid with an inverse real FFT. A harmonic w that
+        completes b cycles over the N points of the grid adds -i (N/2) A e^{i(w t_0 + r)} to bin b
+        of the spectrum.
+        :param t: (np.ndarray) one dimensional array of times
+        :return: np.ndarray with the sum of the harmonics (without the translation), or None if t is
+        not a uniform grid or some harmonic does not fall on a bin below the Nyquist frequency.
+        """
+        n = t.size
+        if n < 2:
+            return None
+        dt = (t[-1] - t[0])/(n - 1)
+        if dt <= 0 or not np.allclose(np.diff(t),dt,rtol=1e-9,atol=0):
+            return None
+        amplitudes = np.where(self._periods < 0,-self._amplitudes,self._amplitudes)
+        phases = np.where(self._periods < 0,-self._phases,self._phases)
+        periods = np.abs(self._periods)
+        bins = periods*n*dt/(2*math.pi)
+        rounded = np.round(bins)
+        if np.any(np.abs(bins - rounded) > 1e-9*np.maximum(1,bins)) or np.any(2*rounded >= n):
+            return None
+        rounded = rounded.astype(int)
+        phases = periods*t[0] + phases
+        spectrum = np.zeros(n//2 + 1,dtype=complex)
+        np.add.at(spectrum,rounded,-0.5j*n*amplitudes*np.exp(1j*phases))
+        constant = np.sum(amplitudes[rounded == 0]*np.sin(phases[rounded == 0]))
+        spectrum[0] = 0
+        return np.fft.irfft(spectrum,n=n) + constant
+
+    def harmonics(self)->tuple:
+        """
+        The bank as a sum of sinusoids plus a translation, the form in which signals.stats integrates
+        it (see BaseLine.harmonics).
+        :return: tuple (amplitudes,periods,phases,translation), the first three being np.ndarrays of
+        K values.
+        """
+        return self._amplitudes.copy(),self._periods.copy(),self._phases.copy(),float(self._translation)
+
+    def __repr__(self):
+        return 'HarmonicBank(amp={},per={},phas={},trans={})'.format(self._amplitudes.tolist(),
+                                                                     self._periods.tolist(),
+                                                                     self._phases.tolist(),
+                                                                     self._translation)
+
+    def __str__(self):
+        return 'H(t)=Sum of {} harmonics+{:,.2f}'.format(self._amplitudes.size,self._translation)
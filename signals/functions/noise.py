@@ -9,8 +9,16 @@ class Noise(Function):
     R(t) ~ N(mu,sigma)
     the constructor of this Class expects parameters like
         mean: to set the mean of the Gaussian Noise (default value is 0)
-        std: to set the standard deviation of the gaussian noise (default value is 1)
+        std: to set the standard deviation of the gaussian noise (default value is 1, which is also
+             used, with a warning, when std is not positive)
     """
+    __slots__ = ('_mean','_deviation')
+    _RANDOM = True
+    _STATIONARY = True
+    """
+    Class flag, True if every value of the noise is N(mean,std) (see signals.stats).
+    """
+
     def construct_function(self,kwargs:dict):
         """
         Noise implementation of the construct_function(kwargs) method
@@ -23,6 +31,7 @@ class Noise(Function):
             std = kwargs['std']
             if std <=0:
                 warnings.warn("Warning: Deviation cannot be negative. Setting default value (sigma=1) instead")
+                self._deviation = 1
             else:
                 self.set_parameter(kwargs, '_deviation', 'std', 1)
         else:
@@ -43,7 +52,32 @@ class Noise(Function):
         if type(t) not in [float,int]:
             raise TypeError("Error function variable is not numeric ")
         else:
-            noise_number = numpy.random.normal(loc=self._mean,
-                                               scale=self._deviation,
-                                               size=1)[0]
-            return noise_number
\ No newline at end of file
+            noise_number = self.random_generator().normal(loc=self._mean,
+                                                          scale=self._deviation)
+            return noise_number
+
+    def calculate_array(self,t:numpy.ndarray)->numpy.ndarray:
+        """
+        Vectorized version of calculate(t): a single bulk draw with one random number per value of t.
+        :param t: (np.ndarray) the values at which we want to return the noise
+        :return: np.ndarray of random numbers with the same shape (and dtype) as t.
+        """
+        t = self.check_array(t)
+        return self.normal_array(self._mean,self._deviation,t)
+
+    def accumulate_array(self,t:numpy.ndarray,out:numpy.ndarray,scratch:numpy.ndarray=None):
+        """
+        Noise implementation of accumulate_array: for a seeded noise the standard normal numbers are
+        drawn straight into scratch (Generator.standard_normal(out=...)) and scaled in place, which
+        gives the same numbers as calculate_array. Unseeded noises (and subclasses that override
+        calculate_array, like the colored noises) go through calculate_array.
+        :return: None
+        """
+        generator = self.random_generator()
+        if (scratch is None or not isinstance(generator,numpy.random.Generator)
+                or type(self).calculate_array is not Noise.calculate_array):
+            return super().accumulate_array(t,out,scratch)
+        generator.standard_normal(dtype=scratch.dtype,out=scratch)
+        scratch *= scratch.dtype.type(self._deviation)
+        scratch += scratch.dtype.type(self._mean)
+        out += scratch
@@ -0,0 +1,120 @@
+import warnings
+import numpy as np
+from .function import Function
+
+class NoiseGroup(Function):
+    """
+    The class that holds the correlated Gaussian noise of a group of M channels (co-located sensors,
+    a fleet of signals), the multivariate version of Noise:
+    R(t) ~ N(mu,Sigma)
+    the constructor expects one of
+        cov: the (M x M) covariance matrix Sigma, symmetric and positive definite
+        loadings: a (M x K) factor loading matrix F, so that Sigma = F F^T (K may be smaller than M,
+                  and singular covariances can be given this way)
+    and optionally
+        mean: the mean of every channel, a number or a sequence of M numbers (default value is 0)
+    The Cholesky factor of the covariance (or the loadings) is computed once, a block of N points is
+    then a single bulk draw Z of N x K standard normal numbers and one matrix product Z F^T.
+    """
+    __slots__ = ('_factor','_mean')
+    _RANDOM = True
+
+    def __init__(self,**kwargs):
+        seed = kwargs.pop('seed',None)
+        self.construct_function(kwargs)
+        if seed is not None:
+            self.set_seed(seed)
+
+    def construct_function(self,kwargs:dict):
+        """
+        NoiseGroup implementation of the construct_function(kwargs) method
+        :param kwargs: a dictionary holding either cov (a covariance matrix) or loadings (a factor
+        loading matrix), and perhaps mean.
+        :return: None. NoiseGroup attributes are set internally.
+        """
+        if ('cov' in kwargs) == ('loadings' in kwargs):
+            raise ValueError("Value Error: a NoiseGroup needs either cov or loadings")
+        name = 'cov' if 'cov' in kwargs else 'loadings'
+        matrix = np.asarray(kwargs[name])
+        if matrix.dtype.kind not in 'iuf' or matrix.ndim != 2:
+            raise TypeError("Type Error: Parameter {} is not a matrix of numbers".format(name))
+        matrix = matrix.astype(float)
+        if name == 'cov':
+            if matrix.shape[0] != matrix.shape[1] or not np.allclose(matrix,matrix.T):
+                raise ValueError("Value Error: cov should be a symmetric matrix")
+            try:
+                self._factor = np.linalg.cholesky(matrix)
+            except np.linalg.LinAlgError:
+                raise ValueError("Value Error: cov is not positive definite (give singular covariances as loadings)")
+        else:
+            self._factor = matrix
+        if 'mean' in kwargs:
+            mean = np.asarray(kwargs['mean'])
+            if mean.dtype.kind not in 'iuf' or mean.ndim > 1:
+                raise TypeError("Type Error: Parameter mean is not a number or a sequence of numbers")
+            if mean.ndim == 1 and mean.size != self.channels:
+                raise ValueError("Value Error: mean should have one value per channel")
+            self._mean = np.broadcast_to(mean.astype(float),(self.channels,)).copy()
+        else:
+            warnings.warn('Warning: parameter mean not in kwargs, using 0 instead')
+            self._mean = np.zeros(self.channels)
+
+    @property
+    def channels(self)->int:
+        return self._factor.shape[0]
+
+    def covariance(self)->np.ndarray:
+        """
+        The covariance matrix of the channels.
+        :return: (M x M) np.ndarray
+        """
+        return self._factor @ self._factor.T
+
+    def __str__(self):
+        return 'N(mu,Sigma) over {} channels'.format(self.channels)
+
+    def __repr__(self):
+        return 'NoiseGroup(loadings={},mean={})'.format(self._factor.tolist(),self._mean.tolist())
+
+    def calculate(self,t:float)->np.ndarray:
+        """
+        The rule that produces the random noise of the channels at a single time.
+        :param t: (float) the value at which we want to return the noise
+        :return: np.ndarray with one random number per channel (raises TypeError if t is not int or float).
+        """
+        if type(t) not in [float,int]:
+            raise TypeError("Error function variable is not numeric ")
+        return self.calculate_array(np.zeros(1))[0]
+
+    def calculate_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of calculate(t): a single bulk draw and one matrix product for all the
+        values of t and all the channels.
+        :param t: (np.ndarray) the values at which we want to return the noise
+        :return: np.ndarray of shape t.shape + (M,) (with the dtype of t), the correlated noise of the
+        M channels at every value of t.
+        """
+        t = self.check_array(t)
+        shape = t.shape + (self._factor.shape[1],)
+        generator = self.random_generator()
+        if t.dtype == np.float32 and isinstance(generator,np.random.Generator):
+            draws = generator.standard_normal(size=shape,dtype=np.float32)
+        else:
+            draws = generator.standard_normal(size=shape).astype(t.dtype,copy=False)
+        values = draws @ self._factor.T.astype(t.dtype,copy=False)
+        values += self._mean.astype(t.dtype,copy=False)
+        return values
+
+    def calculate_rows(self,n:int,out:np.ndarray=None)->np.ndarray:
+        """
+        The correlated noise of n consecutive points laid out by channel: the same draws as
+        calculate_array over n points, transposed, written straight into out (for instance the rows
+        of a batch of signals) instead of being copied.
+        :param n: the number of points
+        :param out: (M x n) float64 array to write into (default a new one)
+        :return: (M x n) np.ndarray, row j holds the noise of channel j.
+        """
+        draws = self.random_generator().standard_normal(size=(n,self._factor.shape[1]))
+        values = np.matmul(self._factor,draws.T,out=out)
+        values += self._mean[:,np.newaxis]
+        return values
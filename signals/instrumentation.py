@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+
+
+class Instrumentation:
+    """
+    The Instrumentation class collects counters about the sampling of one or more signals (see
+    Signal.set_instrumentation and Signal.instrument):
+        - per component class (BaseLine, Noise, SpikePerturbation, ...): the number of evaluations,
+          the points evaluated, the time spent (time.perf_counter seconds) and the errors raised,
+        - points: the number of points of the signal evaluated,
+        - chunks: the number of blocks emitted by the streaming sampler,
+        - cache_hits and cache_misses: lookups of the component values in the signal's SampleCache,
+        - errors: the number of errors raised while evaluating the signal.
+    Signals without instrumentation only pay for an `is None` check. Counters can be updated from
+    several threads (see Signal.calculate_array with threads).
+    """
+
+    _COUNTERS = ('points','chunks','cache_hits','cache_misses','errors')
+    """
+    The names of the global counters.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Sets every counter back to 0.
+        :return: None
+        """
+        with self._lock:
+            self._counters = dict.fromkeys(self._COUNTERS,0)
+            self._components = {}
+
+    def count(self,name:str,amount:int=1):
+        """
+        Increments a global counter.
+        :param name: one of _COUNTERS
+        :param amount: the increment (default 1)
+        :return: None
+        """
+        with self._lock:
+            self._counters[name] += amount
+
+    def record(self,component,seconds:float,points:int,error:bool=False):
+        """
+        Records one evaluation of a component of a signal.
+        :param component: the Function evaluated (its counters are kept by class name)
+        :param seconds: the time the evaluation took
+        :param points: the number of points evaluated
+        :param error: True if the evaluation raised an error
+        :return: None
+        """
+        name = type(component).__name__
+        with self._lock:
+            entry = self._components.get(name)
+            if entry is None:
+                entry = self._components[name] = {'calls':0,'points':0,'seconds':0.0,'errors':0}
+            entry['calls'] += 1
+            entry['points'] += points
+            entry['seconds'] += seconds
+            if error:
+                entry['errors'] += 1
+                self._counters['errors'] += 1
+
+    def timed(self,component,function,points:int):
+        """
+        Calls function() and records it as an evaluation of component (errors are recorded and raised again).
+        :param component: the Function evaluated
+        :param function: callable without arguments that evaluates the component
+        :param points: the number of points evaluated
+        :return: what function() returns.
+        """
+        start = time.perf_counter()
+        try:
+            result = function()
+        except Exception:
+            self.record(component,time.perf_counter() - start,points,error=True)
+            raise
+        self.record(component,time.perf_counter() - start,points)
+        return result
+
+    def counters(self)->dict:
+        """
+        A snapshot of the counters.
+        :return: dictionary with the global counters and, under 'components', a dictionary
+        {class name: {'calls','points','seconds','errors'}}.
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot['components'] = {name:dict(entry) for name,entry in self._components.items()}
+        return snapshot
+
+    def to_json(self,path:str=None)->str:
+        """
+        Dumps a snapshot of the counters (see counters) as JSON.
+        :param path: if given, the file where the JSON is written
+        :return: str with the JSON text.
+        """
+        text = json.dumps(self.counters(),indent=2,sort_keys=True)
+        if path is not None:
+            with open(path,'w',encoding='utf-8') as output_file:
+                output_file.write(text)
+        return text
@@ -10,13 +10,17 @@ class Perturbation(Function):
     amplitude: the amplitude of the perturbation
 
     """
+    __slots__ = ('_t0','_support','_strength')
     def __init__(self,**kwargs):
+        seed = kwargs.pop('seed',None)
         args_wrong = self.check_numeric(kwargs)
         if args_wrong is not None:
             raise TypeError("The Following parameters are not numeric: {}".format(args_wrong))
         else:
             self.set_base_parameters(kwargs)
             self.construct_function(kwargs)
+            if seed is not None:
+                self.set_seed(seed)
 
     def set_base_parameters(self,kwargs:dict):
         """
@@ -30,6 +34,17 @@ class Perturbation(Function):
         self.set_parameter(kwargs, '_support', 'support', 0.25,check_sign=True)
         self.set_parameter(kwargs, '_strength', 'strength', 1,check_sign=True)
 
+    def construct_function(self,kwargs:dict):
+        """
+        The base Perturbation has no parameters other than the ones set by set_base_parameters(kwargs),
+        subclasses override this method to set their own.
+        :param kwargs: a dictionary containing perhaps the parameters of the Perturbation.
+        :return: None
+        """
+
+    def __repr__(self):
+        return 'Perturbation(t0={},support={},strength={})'.format(self._t0,self._support,self._strength)
+
     def check_parameter_in_support(self,param:float)->bool:
         """
         This method is to check that a perturbation parameter is within the support of the function.
@@ -52,6 +67,43 @@ class Perturbation(Function):
         """
         return self._strength
 
+    def perturbation_function_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of perturbation_function(t). Subclasses that override perturbation_function
+        should override this method too; if a subclass overrides perturbation_function below the class
+        that defines the vectorized version, perturbation_function is evaluated point by point instead,
+        so that array evaluation always follows the same rule as calculate(t).
+        :param t: np.ndarray of numbers
+        :return: np.ndarray with the perturbation logic evaluated at every value of t
+        """
+        if self._scalar_only():
+            values = [self.perturbation_function(float(x)) for x in t.ravel()]
+            return np.array(values,dtype=t.dtype).reshape(t.shape)
+        return np.full(t.shape,self._strength,dtype=t.dtype)
+
+    def _scalar_only(self)->bool:
+        """
+        Whether perturbation_function is overridden by a subclass of the class that defines
+        perturbation_function_array (so the vectorized version does not follow it).
+        :return: bool
+        """
+        mro = type(self).__mro__
+        scalar = next(cls for cls in mro if 'perturbation_function' in cls.__dict__)
+        vectorized = next(cls for cls in mro if 'perturbation_function_array' in cls.__dict__)
+        return scalar is not vectorized and issubclass(scalar,vectorized)
+
+    def stats_pieces(self)->list:
+        """
+        Describes the perturbation as pieces of its support where its values follow a fixed
+        distribution, so that statistics of a signal can be computed in closed form (see signals.stats).
+        Subclasses that override perturbation_function are expected to override this method too.
+        :return: list of tuples (a,b,mean,variance), one per interval (a,b) (pieces may be empty), or
+        None if the distribution of the values is not known.
+        """
+        if type(self).perturbation_function is not Perturbation.perturbation_function:
+            return None
+        return [(self._t0,self._t0 + self._support,self._strength,0.0)]
+
     def _char_of_support(self,t:float)->float:
         """
         This function determines wether we are within the support of the function or not
@@ -63,14 +115,70 @@ class Perturbation(Function):
         else:
             return 0
 
+    def _char_of_support_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of _char_of_support(t).
+        :param t: np.ndarray of numbers to see if within the support
+        :return: boolean np.ndarray, True where t is within the support
+        """
+        return (t > self._t0) & (t < self._t0 + self._support)
+
+    def support_slice(self,t:np.ndarray)->slice:
+        """
+        For a sorted array t, finds the contiguous block of points that fall within the support. The
+        limits are cast to the dtype of t, as in _char_of_support_array, so a float32 array is searched
+        as it is instead of being converted to float64 on every call.
+        :param t: np.ndarray of numbers sorted in ascending order
+        :return: slice of the indices of t within the support (it may be empty).
+        """
+        lo = np.searchsorted(t,self._bound(t,self._t0),side='right')
+        hi = np.searchsorted(t,self._bound(t,self._t0 + self._support),side='left')
+        return slice(int(lo),int(max(lo,hi)))
+
+    @staticmethod
+    def _bound(t:np.ndarray,value:float):
+        """
+        Casts a limit searched for in a float array to the dtype of the array (see support_slice).
+        :param t: np.ndarray
+        :param value: the limit
+        :return: the limit as a scalar of the dtype of t (unchanged if t is not a float array).
+        """
+        return t.dtype.type(value) if t.dtype.kind == 'f' else value
+
+    def active_slice(self,t:np.ndarray)->slice:
+        """
+        For a sorted array t, finds the contiguous block of points where the perturbation is active,
+        used to label samples. It is the support, unless a subclass narrows it down.
+        :param t: np.ndarray of numbers sorted in ascending order
+        :return: slice of the indices of t where the perturbation is active (it may be empty).
+        """
+        return self.support_slice(t)
+
     def calculate(self,t:float)->float:
         """
         This is the calculate function from the Function class. What distinguishes
-        perturbations is that before the _t0 parameter, there will be no perturbation.
+        perturbations is that before the _t0 parameter, there will be no perturbation. The perturbation
+        function is only called (and only draws random numbers) within the support, just like calculate_array.
         :param t: the argument of the function (numeric type). It raises error if t is not numeric.
         :return: 0 before _t0 argument and perturbation_function(t) otherwise.
         """
         if type(t) not in [float,int,np.float64]:
             raise TypeError("Error: function variable is not numeric ")
+        elif self._char_of_support(t) == 0:
+            return 0
         else:
-            return self.perturbation_function(t)*self._char_of_support(t)
\ No newline at end of file
+            return self.perturbation_function(t)
+
+    def calculate_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of calculate(t). The perturbation function is only evaluated for the
+        values of t that fall within the support, the rest of the array is 0.
+        :param t: np.ndarray with the arguments of the function. It raises TypeError if t is not numeric.
+        :return: np.ndarray with 0 outside of the support and perturbation_function(t) inside of it.
+        """
+        t = self.check_array(t)
+        values = np.zeros(t.shape,dtype=t.dtype)
+        in_support = self._char_of_support_array(t)
+        if in_support.any():
+            values[in_support] = self.perturbation_function_array(t[in_support])
+        return values
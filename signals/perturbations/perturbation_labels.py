@@ -0,0 +1,78 @@
+import numpy as np
+
+class PerturbationLabels:
+    """
+    This class holds the per-point ground truth of which perturbations are active over a sorted array
+    of N times. Since the points where a perturbation is active are always a contiguous block of a
+    sorted array (see Perturbation.active_slice), the labels are stored sparsely as one index range
+    [starts[j],stops[j]) per perturbation j, in the order in which the perturbations were added to the
+    signal. Functions that are not Perturbations are active over the whole array.
+
+    The sparse ranges can be expanded into a dense (N x P) boolean matrix, a packed (N x ceil(P/8))
+    bitmask, the number of active perturbations per point or the index of the active perturbation
+    per point.
+    """
+    def __init__(self,n_points:int,n_perturbations:int):
+        """
+        Constructor for the labels. All the perturbations start inactive.
+        :param n_points: the number of points N of the labelled array
+        :param n_perturbations: the number of perturbations P
+        """
+        self._n_points = n_points
+        self.starts = np.zeros(n_perturbations,dtype=np.int64)
+        self.stops = np.zeros(n_perturbations,dtype=np.int64)
+
+    def __len__(self):
+        return self._n_points
+
+    @property
+    def shape(self)->tuple:
+        return self._n_points,len(self.starts)
+
+    def set_active(self,j:int,block:slice):
+        """
+        Marks the j-th perturbation as active over a block of points.
+        :param j: the index of the perturbation
+        :param block: slice with the points where the perturbation is active
+        :return: None
+        """
+        self.starts[j] = block.start
+        self.stops[j] = max(block.start,block.stop)
+
+    def to_dense(self)->np.ndarray:
+        """
+        :return: (N x P) np.ndarray of booleans, True where a perturbation is active.
+        """
+        dense = np.zeros(self.shape,dtype=bool)
+        for j,(start,stop) in enumerate(zip(self.starts,self.stops)):
+            dense[start:stop,j] = True
+        return dense
+
+    def to_bitmask(self)->np.ndarray:
+        """
+        :return: (N x ceil(P/8)) np.ndarray of uint8, bit j%8 of byte j//8 is set where the j-th
+        perturbation is active (the same layout as np.packbits(to_dense(),axis=1,bitorder='little')).
+        """
+        bitmask = np.zeros((self._n_points,(len(self.starts) + 7)//8),dtype=np.uint8)
+        for j,(start,stop) in enumerate(zip(self.starts,self.stops)):
+            bitmask[start:stop,j//8] |= np.uint8(1 << (j % 8))
+        return bitmask
+
+    def active_count(self)->np.ndarray:
+        """
+        :return: np.ndarray with the number of active perturbations at every point.
+        """
+        changes = np.zeros(self._n_points + 1,dtype=np.int64)
+        np.add.at(changes,self.starts,1)
+        np.add.at(changes,self.stops,-1)
+        return np.cumsum(changes[:-1])
+
+    def which(self)->np.ndarray:
+        """
+        :return: np.ndarray with the index of the active perturbation at every point (the first one
+        added if several overlap) and -1 where no perturbation is active.
+        """
+        label = np.full(self._n_points,-1,dtype=np.int64)
+        for j in range(len(self.starts) - 1,-1,-1):
+            label[self.starts[j]:self.stops[j]] = j
+        return label
@@ -11,6 +11,9 @@ class SpikePerturbation(Perturbation):
         spike: the amplitude of the spike to construct
         t0: the time at which the spike is to take place
     """
+    __slots__ = ('_width','_position')
+    _RANDOM = True
+
     def construct_function(self,kwargs:dict):
         """
         SpikePerturbation implementation of the construct_function(kwargs) method
@@ -27,6 +30,10 @@ class SpikePerturbation(Perturbation):
         self.set_parameter(kwargs,'_width','width',0.3)
         self.set_parameter(kwargs,'_position','position',0.8)
 
+    def __repr__(self):
+        return 'SpikePerturbation(t0={},support={},strength={},position={},width={})'.format(
+            self._t0,self._support,self._strength,self._position,self._width)
+
     def perturbation_function(self,t:float) ->float:
         """
         This is the function that will calculate the spike of the perturbation. if within the
@@ -36,7 +43,47 @@ class SpikePerturbation(Perturbation):
         :return: N(_strength,_strength*0.15) if within the spike, 0.1*N(_strength,_strength*0.15) otherwise
         """
 
+        random_number = self.random_generator().normal(loc=self._strength,scale=self._strength*0.15)
         if abs(t-self._position)< self._width/2:
-            return np.random.normal(loc=self._strength,scale=self._strength*0.15,size=1)[0]
+            return random_number
         else:
-            return np.random.normal(loc=self._strength,scale=self._strength*0.15,size=1)[0]*0.1
\ No newline at end of file
+            return random_number*0.1
+
+    def perturbation_function_array(self,t:np.ndarray)->np.ndarray:
+        """
+        Vectorized version of perturbation_function(t): one bulk draw for the whole array, scaled
+        down to 10% outside of the spike.
+        :param t: np.ndarray of numbers
+        :return: np.ndarray with N(_strength,_strength*0.15) within the spike and 0.1*N(_strength,_strength*0.15) otherwise
+        """
+        if self._scalar_only():
+            return super().perturbation_function_array(t)
+        random_numbers = self.normal_array(self._strength,self._strength*0.15,t)
+        in_spike = np.abs(t-self._position) < self._width/2
+        return np.where(in_spike,random_numbers,random_numbers*0.1)
+
+    def stats_pieces(self)->list:
+        """
+        The pieces of the support within the spike (N(_strength,_strength*0.15)) and outside of it
+        (10% of that), see Perturbation.stats_pieces.
+        :return: list of tuples (a,b,mean,variance)
+        """
+        end = self._t0 + self._support
+        lo = min(max(self._position - self._width/2,self._t0),end)
+        hi = max(min(self._position + self._width/2,end),lo)
+        variance = (self._strength*0.15)**2
+        return [(self._t0,lo,0.1*self._strength,0.01*variance),
+                (lo,hi,self._strength,variance),
+                (hi,end,0.1*self._strength,0.01*variance)]
+
+    def active_slice(self,t:np.ndarray)->slice:
+        """
+        A spike is only labelled as active within the spike window (|t-_position| < _width/2) that
+        falls inside the support, outside of it the perturbation is only 10% of its strength.
+        :param t: np.ndarray of numbers sorted in ascending order
+        :return: slice of the indices of t within the spike and the support (it may be empty).
+        """
+        support = self.support_slice(t)
+        lo = max(support.start,int(np.searchsorted(t,self._bound(t,self._position - self._width/2),side='right')))
+        hi = min(support.stop,int(np.searchsorted(t,self._bound(t,self._position + self._width/2),side='left')))
+        return slice(lo,max(lo,hi))
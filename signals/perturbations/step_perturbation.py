@@ -12,6 +12,9 @@ class StepPerturbation(Perturbation):
         step: the time at which the step is to take place
         direction: the direction in which the step is to happen (before (-1) or after t0 (+1)).
     """
+    __slots__ = ('_step','_direction')
+    _RANDOM = True
+
     def construct_function(self,kwargs:dict):
         """
         StepPerturbation implementation of the construct_function(kwargs) method
@@ -28,6 +31,10 @@ class StepPerturbation(Perturbation):
         self.set_parameter(kwargs,'_step','step',1)
         self.set_parameter(kwargs,'_direction','dir',1)
 
+    def __repr__(self):
+        return 'StepPerturbation(t0={},support={},strength={},step={},dir={})'.format(
+            self._t0,self._support,self._strength,self._step,self._direction)
+
     def perturbation_function(self, t: float) -> float:
         """
         For the Step function, we will return a random number N(strength,strength*0.15) but the
@@ -36,11 +43,33 @@ class StepPerturbation(Perturbation):
         :param t: a number
         :return: float
         """
-        random_number = np.random.normal(loc=self._strength,
-                                         scale=self._strength * 0.05,
-                                         size=1)[0]
+        random_number = self.random_generator().normal(loc=self._strength,
+                                                       scale=self._strength * 0.05)
         if t < self._step:
             random_number *=-1
         else:
             random_number *= 1
-        return random_number*self._direction
\ No newline at end of file
+        return random_number*self._direction
+
+    def stats_pieces(self)->list:
+        """
+        The pieces of the support before and after the step, see Perturbation.stats_pieces.
+        :return: list of tuples (a,b,mean,variance)
+        """
+        end = self._t0 + self._support
+        step = min(max(self._step,self._t0),end)
+        variance = (self._strength*0.05*self._direction)**2
+        return [(self._t0,step,-self._strength*self._direction,variance),
+                (step,end,self._strength*self._direction,variance)]
+
+    def perturbation_function_array(self, t: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of perturbation_function(t): one bulk draw for the whole array, with the
+        sign flipped before the step.
+        :param t: np.ndarray of numbers
+        :return: np.ndarray
+        """
+        if self._scalar_only():
+            return super().perturbation_function_array(t)
+        random_numbers = self.normal_array(self._strength,self._strength * 0.05,t)
+        return np.where(t < self._step,-random_numbers,random_numbers)*self._direction
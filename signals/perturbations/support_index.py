@@ -0,0 +1,74 @@
+import bisect
+from .perturbation import Perturbation
+
+class SupportIndex:
+    """
+    This class keeps a sorted index over the supports of the perturbations of a signal, so that
+    evaluating the signal over a time range only touches the perturbations whose support overlaps it.
+    A Perturbation is non-zero only in the open interval (_t0, _t0+_support) (see _char_of_support),
+    any other Function added as a perturbation is considered to have an unbounded support and is
+    always returned.
+
+    Supports are kept sorted by their start. A query over [t_min,t_max] binary searches the starts
+    in [t_min - max_support, t_max) and keeps the ones whose end is past t_min, so the cost is
+    O(log P + c) for P indexed perturbations and the c candidates that start in that window (plus
+    sorting the results back in order). When supports have similar lengths c is close to the number
+    of results, but a single long support widens the window for every query, and in the worst case
+    c = P. The index is updated incrementally by add(pert).
+    """
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+        self._orders = []
+        self._items = []
+        self._unbounded = []
+        self._max_support = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self,pert):
+        """
+        Adds a perturbation to the index.
+        :param pert: the Function that is being added as a perturbation.
+        :return: None. The index is updated internally.
+        """
+        if isinstance(pert,Perturbation):
+            start = pert._t0
+            k = bisect.bisect_right(self._starts,start)
+            self._starts.insert(k,start)
+            self._ends.insert(k,start + pert._support)
+            self._orders.insert(k,self._count)
+            self._items.insert(k,pert)
+            self._max_support = max(self._max_support,pert._support)
+        else:
+            self._unbounded.append((self._count,pert))
+        self._count += 1
+
+    def query(self,t_min:float,t_max:float)->list:
+        """
+        Finds the perturbations whose support overlaps the closed interval [t_min,t_max].
+        :param t_min: the lower limit of the query
+        :param t_max: the upper limit of the query
+        :return: list of perturbations, in the order in which they were added.
+        """
+        return [pert for order,pert in self.query_with_order(t_min,t_max)]
+
+    def query_with_order(self,t_min:float,t_max:float)->list:
+        """
+        Same as query(t_min,t_max) but keeping the position of every perturbation.
+        :param t_min: the lower limit of the query
+        :param t_max: the upper limit of the query
+        :return: list of pairs (position in which the perturbation was added, perturbation).
+        """
+        margin = 1e-9*(abs(t_min) + self._max_support)
+        lo = bisect.bisect_left(self._starts,t_min - self._max_support - margin)
+        hi = bisect.bisect_left(self._starts,t_max)
+        found = [(self._orders[k],self._items[k]) for k in range(lo,hi) if self._ends[k] > t_min]
+        if self._unbounded:
+            found.extend(self._unbounded)
+            found.sort(key=lambda entry: entry[0])
+        elif len(found) > 1:
+            found.sort(key=lambda entry: entry[0])
+        return found
@@ -0,0 +1,124 @@
+import numpy as np
+
+
+class SignalRingBuffer:
+    """
+    The SignalRingBuffer class keeps the last `capacity` points of a signal sampled over the endless
+    grid t_k = t0 + k*step, in two preallocated NumPy arrays (times and values) used as a ring. It is
+    meant for live consumers (dashboards, detectors) that only look at the latest window of many
+    signals: advance(n) evaluates the next n points of the grid and writes them into the ring, and the
+    window is exposed as read-only views of the ring (one contiguous segment, or two when the window
+    wraps around the end of the ring), so reading the window copies nothing. The grid times are
+    computed in place in the ring and the values are evaluated straight into it: the baseline and a
+    seeded Gaussian noise are accumulated in place with the help of a preallocated scratch array (see
+    Function.accumulate_array), so only the perturbations (over the points of their supports) and the
+    components without an in-place path (an unseeded or colored noise, a float32 baseline, a
+    HarmonicBank) allocate temporary arrays, of at most capacity points.
+
+    The grid is evaluated in contiguous blocks and seeded components draw their numbers in grid order,
+    so the window holds exactly the values that sampling the whole grid at once would give. Times are
+    kept in float64, values in the dtype of the signal (or the dtype given to the constructor).
+    """
+    def __init__(self,signal,capacity:int,step:float,t0:float=0,dtype=None):
+        """
+        Constructor for the ring buffer.
+        :param signal: the Signal to sample
+        :param capacity: the number of points of the window (positive int)
+        :param step: the time between two points of the grid (positive number)
+        :param t0: the time of the first point of the grid (default 0)
+        :param dtype: the dtype of the values, float32 or float64 (default the dtype of the signal)
+        """
+        if type(capacity) is not int:
+            raise TypeError("Error: capacity should be an integer")
+        if capacity <= 0:
+            raise ValueError("Error: capacity should be positive")
+        if type(step) not in [int,float] or type(t0) not in [int,float]:
+            raise TypeError("Error: step and t0 should be numeric")
+        if step <= 0:
+            raise ValueError("Error: step should be positive")
+        self._signal = signal
+        self._dtype = signal._resolve_dtype(dtype)
+        self._step = step
+        self._t0 = t0
+        self._offsets = np.arange(capacity,dtype=float)
+        self._t = np.zeros(capacity,dtype=float)
+        self._values = np.zeros(capacity,dtype=self._dtype)
+        self._scratch = np.empty(capacity,dtype=self._dtype)
+        self._t_cast = None if self._dtype == self._t.dtype else np.empty(capacity,dtype=self._dtype)
+        self._head = 0
+        self._size = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self)->int:
+        return self._t.size
+
+    @property
+    def count(self)->int:
+        """
+        The total number of points evaluated since the buffer was created.
+        """
+        return self._count
+
+    def advance(self,n:int):
+        """
+        Evaluates the next n points of the grid and writes them into the ring, overwriting the oldest
+        ones. Points that would be overwritten within the same call are still evaluated (so random
+        streams stay in grid order), but at most capacity points are evaluated per block.
+        :param n: the number of points to advance (non negative int)
+        :return: None
+        """
+        if type(n) is not int:
+            raise TypeError("Error: n should be an integer")
+        if n < 0:
+            raise ValueError("Error: n should not be negative")
+        capacity = self._t.size
+        while n > 0:
+            m = min(n,capacity - self._head)
+            block = slice(self._head,self._head + m)
+            t = self._t[block]
+            np.add(self._offsets[:m],self._count,out=t)
+            t *= self._step
+            t += self._t0
+            if self._t_cast is not None:
+                t = self._t_cast[:m]
+                np.copyto(t,self._t[block],casting='same_kind')
+            self._signal._calculate_array(t,out=self._values[block],scratch=self._scratch[:m])
+            self._head = (self._head + m) % capacity
+            self._size = min(capacity,self._size + m)
+            self._count += m
+            n -= m
+
+    def _segments(self,column:np.ndarray)->tuple:
+        """
+        The views of a column of the ring that hold the window, oldest points first.
+        :return: tuple of one or two read-only views.
+        """
+        start = (self._head - self._size) % self._t.size
+        if start + self._size <= self._t.size:
+            segments = (column[start:start + self._size],)
+        else:
+            segments = (column[start:],column[:self._head])
+        for segment in segments:
+            segment.flags.writeable = False
+        return segments
+
+    def views(self)->tuple:
+        """
+        The current window as zero-copy views of the ring, oldest points first. The views are only
+        valid until the next call to advance.
+        :return: tuple of one or two pairs (t,values) of read-only np.ndarray views.
+        """
+        return tuple(zip(self._segments(self._t),self._segments(self._values)))
+
+    def window(self)->tuple:
+        """
+        A copy of the current window, in a single pair of arrays.
+        :return: pair (t,values) of np.ndarrays with the last len(self) points, oldest first.
+        """
+        segments = self.views()
+        return (np.concatenate([t for t,values in segments]),
+                np.concatenate([values for t,values in segments]))
@@ -0,0 +1,226 @@
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import numpy as np
+
+
+def _encode_state(value):
+    """
+    json default hook for the NumPy objects of a stream state (the arrays of some bit generator
+    states and of the filter state of the colored noises).
+    :return: a JSON serializable version of value (raises TypeError for other objects).
+    """
+    if isinstance(value,np.ndarray):
+        return {'__ndarray__':value.tolist(),'dtype':value.dtype.str}
+    if isinstance(value,np.generic):
+        return value.item()
+    raise TypeError("Error: {} is not JSON serializable".format(type(value).__name__))
+
+
+def _decode_state(value:dict):
+    """
+    json object hook, the inverse of _encode_state.
+    :return: np.ndarray for an encoded array, the dictionary itself otherwise.
+    """
+    if '__ndarray__' in value:
+        return np.array(value['__ndarray__'],dtype=value['dtype'])
+    return value
+
+
+class SampleCache:
+    """
+    The SampleCache class memoizes the arrays that the components of a signal return over a time grid
+    (see Signal.set_cache). Entries are kept per component, keyed on a hash of the component's
+    cache_token() (its repr, plus the state of its random stream when it is seeded) and of the bytes
+    of the time array. So:
+        - adding a perturbation to a signal only adds entries for the new perturbation, the entries of
+          the baseline, the noise and the other perturbations are still valid,
+        - random components without a seed are never cached (only the deterministic components of a
+          signal with seedless noise are),
+        - a seeded component that hits the cache has its stream moved to the state it would have
+          after drawing the values, so cached and uncached sampling produce the same sequence.
+
+    The memory tier is an LRU bounded by max_bytes. If a directory is given, entries are also written
+    there and looked up on memory misses, so they survive the process. An entry is a <key>.npy file
+    with the values (read with allow_pickle=False) and a <key>.json file with the stream state, both
+    written to a temporary file and moved in place, so a reader never sees a partial entry (and a
+    file that cannot be read is a miss). Nothing in the directory is unpickled. A cache can be used
+    from several threads (see Signal.calculate_array with threads), disk reads and writes are done
+    outside of its lock.
+    """
+
+    _DEFAULT_MAX_BYTES = 256*2**20
+    """
+    Default memory bound of the cache (256 MiB).
+    """
+    def __init__(self,max_bytes:int=None,directory:str=None):
+        """
+        Constructor for the cache.
+        :param max_bytes: the maximum number of bytes of arrays held in memory (default 256 MiB)
+        :param directory: directory of the on-disk tier (default None, memory only)
+        """
+        self._max_bytes = self._DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        self._directory = directory
+        if directory is not None:
+            os.makedirs(directory,exist_ok=True)
+        self._entries = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self)->int:
+        return self._nbytes
+
+    def clear(self):
+        """
+        Empties the memory tier (the on-disk tier is kept).
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def key(self,token:str,t:np.ndarray)->str:
+        """
+        Builds the key of the values of a component over a time array.
+        :param token: the cache_token() of the component
+        :param t: np.ndarray of times
+        :return: str, hexadecimal digest
+        """
+        digest = hashlib.blake2b(token.encode('utf-8'),digest_size=20)
+        digest.update(repr((t.dtype.str,t.shape)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(t).tobytes())
+        return digest.hexdigest()
+
+    def evaluate(self,component,t:np.ndarray)->np.ndarray:
+        """
+        Returns component.calculate_array(t), from the cache when possible.
+        :param component: the Function to evaluate
+        :param t: np.ndarray of times
+        :return: np.ndarray with the values of the component (a fresh array the caller may modify).
+        """
+        return self.lookup(component,t)[0]
+
+    def lookup(self,component,t:np.ndarray)->tuple:
+        """
+        Same as evaluate(component,t), but it also tells where the values come from.
+        :param component: the Function to evaluate
+        :param t: np.ndarray of times
+        :return: pair (values,hit), hit being True if the values come from the cache, False if they
+        were calculated and stored, and None if the component cannot be cached.
+        """
+        token = component.cache_token()
+        if token is None:
+            return component.calculate_array(t),None
+        key = self.key(token,t)
+        entry = self.get(key)
+        if entry is not None:
+            values,state = entry
+            component.set_stream_state(state)
+            return values.copy(),True
+        values = component.calculate_array(t)
+        self.put(key,values.copy(),component.get_stream_state())
+        return values,False
+
+    def get(self,key:str):
+        """
+        Looks up an entry in memory, then on disk.
+        :param key: the key of the entry
+        :return: pair (values,stream state after the evaluation), or None on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        entry = self._read_entry(key) if self._directory is not None else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            entry[0].setflags(write=False)
+            self._remember(key,entry)
+            self.hits += 1
+            return entry
+
+    def put(self,key:str,values:np.ndarray,state=None):
+        """
+        Stores an entry.
+        :param key: the key of the entry
+        :param values: np.ndarray with the values (it must not be modified afterwards)
+        :param state: the stream state of the component after the evaluation
+        :return: None
+        """
+        values.setflags(write=False)
+        with self._lock:
+            self._remember(key,(values,state))
+        if self._directory is not None:
+            self._write_entry(key,values,state)
+
+    def _read_entry(self,key:str):
+        """
+        Reads an entry of the on-disk tier.
+        :param key: the key of the entry
+        :return: pair (values,stream state), or None if the entry is missing or cannot be read.
+        """
+        path = os.path.join(self._directory,key)
+        try:
+            with open(path + '.json','r',encoding='utf-8') as state_file:
+                state = json.load(state_file,object_hook=_decode_state)
+            values = np.load(path + '.npy',allow_pickle=False)
+        except (OSError,ValueError,EOFError):
+            return None
+        return values,state
+
+    def _write_entry(self,key:str,values:np.ndarray,state):
+        """
+        Writes an entry to the on-disk tier: the values first and the state last, each one through a
+        temporary file replaced atomically. States that are not JSON serializable stay in memory only.
+        :return: None
+        """
+        try:
+            state_text = json.dumps(state,default=_encode_state)
+        except TypeError:
+            return
+        path = os.path.join(self._directory,key)
+        self._replace(path + '.npy',lambda entry_file: np.save(entry_file,values,allow_pickle=False))
+        self._replace(path + '.json',lambda entry_file: entry_file.write(state_text.encode('utf-8')))
+
+    def _replace(self,file_name:str,write):
+        """
+        Writes a file through a temporary file in the same directory and os.replace.
+        :param file_name: the final name of the file
+        :param write: function that writes the content to a binary file object
+        :return: None
+        """
+        descriptor,temporary = tempfile.mkstemp(dir=self._directory,suffix='.tmp')
+        try:
+            with os.fdopen(descriptor,'wb') as entry_file:
+                write(entry_file)
+            os.replace(temporary,file_name)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def _remember(self,key:str,entry:tuple):
+        """
+        Adds an entry to the memory tier, evicting the least recently used ones beyond max_bytes.
+        :return: None
+        """
+        if key in self._entries:
+            self._nbytes -= self._entries.pop(key)[0].nbytes
+        if entry[0].nbytes > self._max_bytes:
+            return
+        self._entries[key] = entry
+        self._nbytes += entry[0].nbytes
+        while self._nbytes > self._max_bytes:
+            evicted_key,evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted[0].nbytes
@@ -0,0 +1,127 @@
+import os
+import numpy as np
+
+
+class SampleStore:
+    """
+    The SampleStore class keeps a (possibly huge) sample of a signal on disk. A store is a directory
+    holding one standard .npy file per column (t.npy and signal.npy), so downstream jobs can open them
+    with np.load(path,mmap_mode='r') and slice them without parsing or copying.
+
+    The headers of both files are padded to a fixed size (_HEADER_SIZE bytes). Appending a block only
+    writes the new data after the last point of each file and then rewrites the shape in the header in
+    place: the existing data is never rewritten, and since the header is updated last, readers always
+    see a consistent prefix of the sample.
+    """
+
+    _HEADER_SIZE = 128
+    """
+    Total size in bytes of the .npy preamble (magic string, version, header length and header).
+    """
+    _COLUMNS = ('t','signal')
+    """
+    The columns of the store, one .npy file each.
+    """
+    def __init__(self,path:str,dtype=float):
+        """
+        Opens the store at path, creating the directory and empty columns if they do not exist. Existing
+        columns must be 1-D, C ordered .npy (version 1.0) files with a _HEADER_SIZE bytes preamble and
+        the same dtype and length (as np.save writes them for 1-D arrays), otherwise ValueError is raised
+        since appending to them would corrupt them.
+        :param path: the directory of the store
+        :param dtype: the dtype of the columns of a new store (an existing store keeps its own dtype)
+        """
+        self._path = path
+        os.makedirs(path,exist_ok=True)
+        self._dtype = np.dtype(dtype)
+        self._length = 0
+        lengths,dtypes = [],[]
+        for column in self._COLUMNS:
+            file_name = self._column_path(column)
+            if os.path.exists(file_name):
+                with open(file_name,'rb') as column_file:
+                    if np.lib.format.read_magic(column_file) != (1,0):
+                        raise ValueError("Error: {} is not a version 1.0 .npy file".format(file_name))
+                    shape,fortran_order,dtype = np.lib.format.read_array_header_1_0(column_file)
+                    if column_file.tell() != self._HEADER_SIZE:
+                        raise ValueError("Error: the header of {} is not {} bytes long".format(file_name,self._HEADER_SIZE))
+                if len(shape) != 1 or fortran_order:
+                    raise ValueError("Error: {} does not hold a 1-D C ordered array".format(file_name))
+                self._dtype = dtype
+                dtypes.append(dtype)
+                lengths.append(shape[0])
+            else:
+                with open(file_name,'wb') as column_file:
+                    column_file.write(self._header(0))
+                lengths.append(0)
+        if len(set(lengths)) != 1:
+            raise ValueError("Error: the columns of the store at {} have different lengths".format(path))
+        if len(set(dtypes)) > 1:
+            raise ValueError("Error: the columns of the store at {} have different dtypes".format(path))
+        self._length = lengths[0]
+
+    def __len__(self):
+        return self._length
+
+    def _column_path(self,column:str)->str:
+        return os.path.join(self._path,column + '.npy')
+
+    def _header(self,length:int)->bytes:
+        """
+        Builds the fixed size .npy (version 1.0) preamble of a column with length points.
+        :param length: the number of points of the column
+        :return: bytes of the preamble
+        """
+        header = "{{'descr': {!r}, 'fortran_order': False, 'shape': ({},), }}".format(
+            np.lib.format.dtype_to_descr(self._dtype),length)
+        header_length = self._HEADER_SIZE - 10
+        header = header.ljust(header_length - 1) + '\n'
+        return b'\x93NUMPY\x01\x00' + header_length.to_bytes(2,'little') + header.encode('latin1')
+
+    def append(self,t,values):
+        """
+        Appends a block of points to the store.
+        :param t: array-like with the times of the block
+        :param values: array-like with the values of the signal at those times
+        :return: None. The block is written at the end of the columns.
+        """
+        t = np.ascontiguousarray(t,dtype=self._dtype).ravel()
+        values = np.ascontiguousarray(values,dtype=self._dtype).ravel()
+        if t.size != values.size:
+            raise ValueError("Error: t and values should have the same length")
+        offset = self._HEADER_SIZE + self._length*self._dtype.itemsize
+        length = self._length + t.size
+        for column,data in zip(self._COLUMNS,(t,values)):
+            with open(self._column_path(column),'r+b') as column_file:
+                column_file.seek(offset)
+                column_file.write(data.tobytes())
+                column_file.truncate()
+                column_file.seek(0)
+                column_file.write(self._header(length))
+        self._length = length
+
+    def write_arithmetic_sample(self,signal,t0:float,t1:float,n:int,chunk_size:int=None):
+        """
+        Streams the n point arithmetic sample of a signal over [t0,t1) into the store, block by block
+        (see Signal.iter_arithmetic_sample), so memory stays bounded. Float32 and float64 stores are
+        sampled directly in their own dtype. Call it again with the following
+        time range to extend the store.
+        :param signal: the Signal to sample
+        :param t0: the lower limit of the sample
+        :param t1: the upper limit of the sample
+        :param n: the number of points of the sample
+        :param chunk_size: the number of points per block (default Signal._DEFAULT_CHUNK_SIZE)
+        :return: None
+        """
+        dtype = self._dtype if self._dtype in (np.float32,np.float64) else None
+        for t,values in signal.iter_arithmetic_sample(t0,t1,n,chunk_size,dtype=dtype):
+            self.append(t,values)
+
+    def open(self)->tuple:
+        """
+        Opens the columns of the store as read-only memory maps (no data is read or copied).
+        :return: a pair (t,values) of np.memmap arrays (plain empty arrays for an empty store).
+        """
+        if self._length == 0:
+            return np.empty(0,dtype=self._dtype),np.empty(0,dtype=self._dtype)
+        return tuple(np.load(self._column_path(column),mmap_mode='r') for column in self._COLUMNS)
@@ -1,10 +1,20 @@
+import contextlib
+import copy
 import time
 import datetime
-import pandas as pd
+import warnings
+import numpy as np
 from signals.functions.function import Function
 from signals.functions.baseline import BaseLine
+from signals.functions.harmonic_bank import HarmonicBank
 from signals.functions.noise import Noise
 from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.support_index import SupportIndex
+from signals.perturbations.perturbation_labels import PerturbationLabels
+from signals.compiled_signal import CompiledSignal
+from signals.signal_sample import SignalSample
+from signals.ring_buffer import SignalRingBuffer
+from signals.instrumentation import Instrumentation
 
 
 class Signal:
@@ -16,133 +26,824 @@ class Signal:
     This Signal can be sampled in two ways: specifying the range on which we want to
     sample the signal (i.e. over an interval [t0,t1]) or using the current time as a
     sampling strategy (i.e. from the time the method is called, 200 points with a wait time)
+
+    pandas, asyncio and concurrent.futures are only imported by the methods that use them (the ones
+    that build DataFrames, the asynchronous emitter and the threaded evaluation), so that importing
+    the module and evaluating signals stays cheap.
     """
 
     _DEFAULT_SAMPLE_SIZE = 100
     """
     This MAX_SAMPLING value is the number of default sample size the program will use. 
     """
+    _DEFAULT_CHUNK_SIZE = 65536
+    """
+    This is the number of points per block that the streaming sampler yields by default.
+    """
+    _THREAD_BLOCK_SIZE = 65536
+    """
+    This is the number of points per block of the threaded evaluation (see _calculate_threaded).
+    """
+    _SPEC_DEFAULTS = {'amp':0,'per':0,'phas':0,'trans':0,'mean':0,'std':1,'sample_size':_DEFAULT_SAMPLE_SIZE}
+    """
+    The parameters of a signal spec and their default values (see from_specs).
+    """
+    _DTYPES = (np.dtype(np.float64),np.dtype(np.float32))
+    """
+    The dtypes in which a signal can be sampled, the first one is the default.
+    """
     def __init__(self,**kwargs):
         """
         Constructor for the signal. Here we only specify the baseline and the noise factors
         read the documentation on the BaseLine and Noise constructors to see what we
         can introduce as kwargs.
         :param kwargs: the dictionary with the parameters to create the baseline and the
-        noise factors of the signal.
+        noise factors of the signal. It can also hold a seed (an int, a numpy SeedSequence or a
+        numpy Generator) to make the signal reproducible, see set_seed, and the dtype in which the
+        signal is sampled (float64 by default, or float32: grids, noise draws and perturbations are
+        then produced natively in float32, see BaseLine.calculate_array for the precision of the sine).
         """
-        self._baseline = BaseLine(**kwargs)
-        self._noise = Noise(**kwargs)
-        self._perturbations = None
+        seed = kwargs.pop('seed',None)
+        dtype = kwargs.pop('dtype',None)
         if 'sample_size' in kwargs:
             val = kwargs['sample_size']
             if type(val) not in [int,float]:
                 raise TypeError("Type Error: Sample size is not of numeric.")
             else:
-                self._sample_size = round(val)
+                sample_size = round(val)
         else:
-            self._sample_size = self._DEFAULT_SAMPLE_SIZE
+            sample_size = self._DEFAULT_SAMPLE_SIZE
+        self._setup(BaseLine(**kwargs),Noise(**kwargs),sample_size,seed,dtype)
+
+    def _setup(self,baseline:BaseLine,noise:Noise,sample_size:int,seed=None,dtype=None):
+        """
+        Sets the attributes of a new signal from its already validated components.
+        :param baseline: the BaseLine of the signal
+        :param noise: the Noise of the signal
+        :param sample_size: the sample size of the signal
+        :param seed: the seed of the signal (None for no seed)
+        :param dtype: the dtype of the samples (None for float64)
+        :return: None
+        """
+        self._dtype = self._DTYPES[0]
+        if dtype is not None:
+            self._dtype = self._resolve_dtype(dtype)
+        self._baseline = baseline
+        self._noise = noise
+        self._perturbations = None
+        self._perturbation_index = SupportIndex()
+        self._seed_sequence = None
+        self._cache = None
+        self._instrumentation = None
+        self._sample_size = sample_size
+        if seed is not None:
+            self.set_seed(seed)
+
+    @classmethod
+    def from_spec(cls,spec:dict):
+        """
+        Builds a single signal through the bulk construction path (see from_specs).
+        :param spec: dictionary with the kwargs of a Signal and optionally 'perturbations'.
+        :return: Signal
+        """
+        return cls.from_specs([spec])[0]
+
+    @classmethod
+    def from_specs(cls,specs)->list:
+        """
+        Bulk constructor for many signals. Every parameter must be an int or a float, the same per value
+        check as Function.check_numeric (columns given as NumPy arrays or pandas Series are converted
+        to Python numbers first), missing parameters silently take their default values (amp, per,
+        phas, trans and mean 0, std 1, sample_size _DEFAULT_SAMPLE_SIZE) and the components are built
+        directly, without the per-object checks and warnings of the regular constructors. Invalid
+        deviations (std <= 0), found with array operations, are replaced by 1 with a single warning for
+        the whole table.
+        :param specs: the table of parameters: a list of dictionaries (one per signal, with the kwargs
+        of a Signal and optionally a 'seed', a 'dtype' and a list of 'perturbations'), or a table of columns (a
+        dictionary {parameter: sequence} or a pandas DataFrame).
+        :return: list of Signals, one per row of the table.
+        """
+        if isinstance(specs,(list,tuple)):
+            n_rows = len(specs)
+            def column(name,default):
+                return [spec.get(name,default) for spec in specs]
+        else:
+            names = list(specs.keys())
+            n_rows = len(specs[names[0]]) if names else 0
+            def column(name,default):
+                if name in specs:
+                    values = specs[name]
+                    return values.tolist() if hasattr(values,'tolist') else list(values)
+                return [default]*n_rows
+        parameters = {}
+        for name,default in cls._SPEC_DEFAULTS.items():
+            values = column(name,default)
+            rows = [k for k,value in enumerate(values) if type(value) not in [float,int]]
+            if rows:
+                raise TypeError("The Following parameters are not numeric: {} (rows {})".format(name,rows))
+            parameters[name] = values
+        deviations = np.asarray(parameters['std'],dtype=float)
+        invalid = np.flatnonzero(deviations <= 0)
+        if invalid.size > 0:
+            warnings.warn("Warning: Deviation cannot be negative (rows {}). Setting default value (sigma=1) instead".format(invalid.tolist()))
+            for k in invalid.tolist():
+                parameters['std'][k] = 1
+        sample_sizes = np.rint(np.asarray(parameters['sample_size'],dtype=float)).astype(int).tolist()
+        seeds = column('seed',None)
+        dtypes = column('dtype',None)
+        perturbations = column('perturbations',None)
+
+        signals = []
+        for k in range(n_rows):
+            baseline = BaseLine.__new__(BaseLine)
+            baseline._amplitude = parameters['amp'][k]
+            baseline._period = parameters['per'][k]
+            baseline._phase = parameters['phas'][k]
+            baseline._translation = parameters['trans'][k]
+            noise = Noise.__new__(Noise)
+            noise._mean = parameters['mean'][k]
+            noise._deviation = parameters['std'][k]
+            signal = cls.__new__(cls)
+            signal._setup(baseline,noise,sample_sizes[k],seeds[k],dtypes[k])
+            if perturbations[k] is not None:
+                for pert in perturbations[k]:
+                    signal.add_perturbation(pert)
+            signals.append(signal)
+        return signals
+
+    def set_seed(self,seed):
+        """
+        Makes the signal reproducible: a numpy SeedSequence is built from the seed and every random
+        component (the noise and each perturbation) gets its own independent Generator stream spawned
+        from it. Perturbations added later on are seeded from the same sequence. Unlike add_perturbation
+        and set_noise, which keep the stream of a component that is already seeded, set_seed reseeds
+        all the components, including the ones that were seeded on their own.
+        :param seed: an int, a numpy SeedSequence or a numpy Generator (used to draw the entropy).
+        :return: None. Components are seeded internally.
+        """
+        if isinstance(seed,np.random.SeedSequence):
+            self._seed_sequence = seed
+        elif isinstance(seed,np.random.Generator):
+            self._seed_sequence = np.random.SeedSequence(seed.integers(0,2**32,size=4).tolist())
+        else:
+            self._seed_sequence = np.random.SeedSequence(seed)
+        self._noise.set_seed(self._seed_sequence.spawn(1)[0])
+        if self._perturbations is not None:
+            for per in self._perturbations:
+                per.set_seed(self._seed_sequence.spawn(1)[0])
+
+    def set_baseline(self,baseline):
+        """
+        Replaces the baseline of the signal, for instance by a HarmonicBank to build a richer periodic
+        baseline. The baseline is not a perturbation: it does not change the sample type of the signal
+        nor its perturbation labels, and stats still computes its moments in closed form.
+        :param baseline: the new BaseLine or HarmonicBank (raises TypeError if it is neither).
+        :return: None
+        """
+        if not isinstance(baseline,(BaseLine,HarmonicBank)):
+            raise TypeError("Error: the baseline should be a BaseLine or a HarmonicBank")
+        self._baseline = baseline
+
+    def set_noise(self,noise:Noise):
+        """
+        Replaces the noise of the signal, for instance by one of the colored noises (AR1Noise,
+        PinkNoise, BrownNoise). If the signal is seeded and the noise is not, the noise gets its own
+        stream spawned from the seed of the signal.
+        :param noise: the new Noise (raises TypeError if it is not a Noise).
+        :return: None
+        """
+        if not isinstance(noise,Noise):
+            raise TypeError("Error: the noise should be a Noise")
+        if self._seed_sequence is not None and not noise.is_seeded():
+            noise.set_seed(self._seed_sequence.spawn(1)[0])
+        self._noise = noise
+
+    def _resolve_dtype(self,dtype=None)->np.dtype:
+        """
+        Checks the dtype requested for a sample.
+        :param dtype: float32 or float64 (anything numpy.dtype understands), None for the dtype of the signal
+        :return: numpy dtype. Raises TypeError if dtype is not a dtype and ValueError if it is not supported.
+        """
+        if dtype is None:
+            return self._dtype
+        try:
+            dtype = np.dtype(dtype)
+        except TypeError:
+            raise TypeError("Error: dtype {} is not a numpy dtype".format(dtype))
+        if dtype not in self._DTYPES:
+            raise ValueError("Error: dtype should be float64 or float32, not {}".format(dtype))
+        return dtype
+
+    def set_cache(self,cache):
+        """
+        Turns on (or off) the memoization of the array evaluation of the signal. Every component's
+        values are looked up in the cache by its parameters, the time array and its seed state (see
+        SampleCache), so resampling the same deterministic configuration over the same grid reuses
+        the stored arrays.
+        :param cache: a SampleCache (it can be shared among signals), or None to turn caching off.
+        :return: None
+        """
+        self._cache = cache
+
+    def set_instrumentation(self,instrumentation):
+        """
+        Turns on (or off) the instrumentation of the signal: while it is set, every evaluation of the
+        signal records the time spent in each component, the points evaluated, the blocks emitted by
+        the streaming sampler and the cache lookups (see Instrumentation).
+        :param instrumentation: an Instrumentation (it can be shared among signals), or None to turn it off.
+        :return: None
+        """
+        self._instrumentation = instrumentation
+
+    @contextlib.contextmanager
+    def instrument(self,instrumentation:Instrumentation=None):
+        """
+        Context manager that instruments the signal within a with block, restoring the previous
+        instrumentation on exit:
+
+            with signal.instrument() as stats:
+                signal.create_arithmetic_sample(0,10)
+            stats.to_json()
+
+        :param instrumentation: the Instrumentation to use (default a new one)
+        :return: the Instrumentation collecting the counters.
+        """
+        if instrumentation is None:
+            instrumentation = Instrumentation()
+        previous = self._instrumentation
+        self._instrumentation = instrumentation
+        try:
+            yield instrumentation
+        finally:
+            self._instrumentation = previous
 
     def add_perturbation(self,pert):
         """
         Method to add a perturbation to a function. The perturbations should be of
-        Function type (otherwise it will raise a TypeError).
+        Function type (otherwise it will raise a TypeError). If the signal is seeded and the
+        perturbation is not, the perturbation gets its own stream spawned from the signal's seed.
         :param pert: The Function that is going to be added as a perturbation of the signal
         :return: None. Perturbation is added to the Signal.
         """
         if not isinstance(pert,Perturbation) and not isinstance(pert,Function):
             raise TypeError("Perturbation is not an instance of Perturbation")
         else:
+            if self._seed_sequence is not None and not pert.is_seeded():
+                pert.set_seed(self._seed_sequence.spawn(1)[0])
             if self._perturbations is None:
                 self._perturbations = [pert]
             else:
                 self._perturbations.append(pert)
+            self._perturbation_index.add(pert)
 
     def calculate(self,t):
         """
-        MEthod to evaluate the signal at a particular t (of type int or float). If another
-        value is provided, the method will raise a TypeError Exception.
+        MEthod to evaluate the signal at a particular t (of type int or float). If a component fails
+        (for instance if t is not numeric) a RuntimeWarning is issued, the error is counted by the
+        instrumentation (if any) and None is returned. Only the perturbations whose support
+        contains t are evaluated.
         :param t: the time on which we want to caclulate the signal.
-        :return: the calculated value of the signal (with and without perturbations).
+        :return: the calculated value of the signal (with and without perturbations), None on errors.
         """
         value = 0
         try:
-            value += self._baseline.calculate(t)
-            value += self._noise.calculate(t)
-            if self._perturbations is not None:
-                for per in self._perturbations:
-                    value += per.calculate(t)
-        except (Exception,ValueError) as error:
-            print("Error ocurred:",error)
+            if self._instrumentation is None:
+                value += self._baseline.calculate(t)
+                value += self._noise.calculate(t)
+                if self._perturbations is not None:
+                    for per in self._perturbation_index.query(t,t):
+                        value += per.calculate(t)
+            else:
+                instrumentation = self._instrumentation
+                instrumentation.count('points')
+                value += instrumentation.timed(self._baseline,lambda: self._baseline.calculate(t),1)
+                value += instrumentation.timed(self._noise,lambda: self._noise.calculate(t),1)
+                if self._perturbations is not None:
+                    for per in self._perturbation_index.query(t,t):
+                        value += instrumentation.timed(per,lambda: per.calculate(t),1)
+        except Exception as error:
+            warnings.warn("Error ocurred: {}".format(error),RuntimeWarning)
             value = None
-        finally:
-            return value
+        return value
+
+    def calculate_array(self,t,dtype=None,threads:int=None):
+        """
+        Vectorized version of calculate(t): evaluates the signal over a whole array of times with
+        one array evaluation per component (baseline, noise and each perturbation). Only the
+        perturbations whose support overlaps the range of t are evaluated and, when t is sorted,
+        only over the block of points within their support.
+        :param t: array-like of numbers on which we want to calculate the signal (raises TypeError
+        if it is not numeric).
+        :param dtype: the dtype of the evaluation, float32 or float64 (default the dtype of the signal),
+        t is cast to it.
+        :param threads: if given, t is evaluated in blocks by a pool of that many threads (see
+        _calculate_threaded).
+        :return: np.ndarray with the calculated values of the signal (with and without perturbations).
+        """
+        t = self._baseline.check_array(t).astype(self._resolve_dtype(dtype),copy=False)
+        if threads is not None:
+            return self._calculate_threaded(t,threads)
+        return self._calculate_array(t)
+
+    def calculate_array_with_labels(self,t,dtype=None,threads:int=None):
+        """
+        Same as calculate_array(t), but it also returns the ground truth of which perturbation is
+        active at every point (see Perturbation.active_slice), computed in the same pass from the
+        blocks that are evaluated anyway.
+        :param t: sorted array-like of numbers on which we want to calculate the signal (raises
+        ValueError if it is not a sorted one dimensional array).
+        :param dtype: the dtype of the evaluation (see calculate_array).
+        :param threads: the number of threads of the evaluation (see calculate_array).
+        :return: a pair (values,labels): np.ndarray with the values of the signal and PerturbationLabels.
+        """
+        t = self._baseline.check_array(t).astype(self._resolve_dtype(dtype),copy=False)
+        if t.ndim != 1 or not bool(np.all(t[1:] >= t[:-1])):
+            raise ValueError("Error: labels need a sorted one dimensional array of times")
+        n_perturbations = 0 if self._perturbations is None else len(self._perturbations)
+        labels = PerturbationLabels(t.size,n_perturbations)
+        if threads is not None:
+            return self._calculate_threaded(t,threads,labels),labels
+        return self._calculate_array(t,labels),labels
+
+    def _calculate_array(self,t:np.ndarray,labels:PerturbationLabels=None,streams:tuple=None,
+                         noise:bool=True,active:list=None,out:np.ndarray=None,
+                         scratch:np.ndarray=None)->np.ndarray:
+        """
+        Evaluates the signal over an array of times that has already been checked.
+        :param t: np.ndarray of floats
+        :param labels: PerturbationLabels to fill in with the active blocks (None to skip labelling).
+        :param streams: the random streams of a block of the threaded evaluation (see _evaluate_component).
+        :param noise: False to leave the noise out (when it is drawn elsewhere, see SignalBatch).
+        :param active: the perturbations to evaluate, as returned by _active_perturbations(t) (default
+        None, they are queried).
+        :param out: np.ndarray with the shape and dtype of t to write the values into (default None, a
+        new array). The baseline and the noise are then accumulated in place with the help of scratch,
+        an array like out (see Function.accumulate_array); only the perturbations allocate, over the
+        points of their supports.
+        :return: np.ndarray with the calculated values of the signal (out if it is given).
+        """
+        if self._instrumentation is not None:
+            self._instrumentation.count('points',t.size)
+        if out is None:
+            values = self._evaluate_component(self._baseline,t,streams)
+            if noise:
+                values += self._evaluate_component(self._noise,t,streams)
+        else:
+            values = out
+            values.fill(0)
+            self._accumulate_component(self._baseline,t,values,scratch)
+            if noise:
+                self._accumulate_component(self._noise,t,values,scratch)
+        if active is None:
+            active = self._active_perturbations(t)
+        for j,per,block in active:
+            if block is not None:
+                values[block] += self._evaluate_component(per,t[block],streams)
+                if labels is not None:
+                    labels.set_active(j,per.active_slice(t))
+            else:
+                values += self._evaluate_component(per,t,streams)
+                if labels is not None:
+                    labels.set_active(j,slice(0,t.size))
+        return values
+
+    def _active_perturbations(self,t:np.ndarray)->list:
+        """
+        Queries the perturbations whose support overlaps the range of an array of times.
+        :param t: np.ndarray of floats
+        :return: list of triples (position of the perturbation,perturbation,block), block being the
+        slice of the points within its support when t is sorted and the perturbation is a
+        Perturbation, and None when it has to be evaluated over the whole array.
+        """
+        if self._perturbations is None or t.size == 0:
+            return []
+        is_sorted = t.ndim == 1 and bool(np.all(t[1:] >= t[:-1]))
+        active = []
+        for j,per in self._perturbation_index.query_with_order(t.min(),t.max()):
+            if is_sorted and isinstance(per,Perturbation):
+                active.append((j,per,per.support_slice(t)))
+            else:
+                active.append((j,per,None))
+        return active
+
+    def _calculate_threaded(self,t:np.ndarray,threads:int,labels:PerturbationLabels=None)->np.ndarray:
+        """
+        Evaluates the signal over an array of times that has already been checked, split in blocks of
+        _THREAD_BLOCK_SIZE points that a pool of threads evaluates concurrently (NumPy ufuncs and
+        Generator draws release the GIL, so blocks run in parallel). The perturbations are queried
+        once for the whole array and, when it is sorted, every block only gets the ones whose support
+        covers some of its points. A random component that is evaluated in more than one block (the
+        noise, the random perturbations whose support spans several blocks) draws one seed from its
+        own stream per call, and block k draws from the k-th jump of that seed (bit_generator.jumped),
+        an independent stream of its own, while a component that falls within a single block draws
+        from its own stream, as in the unthreaded evaluation, without the cost of a copy and a jumped
+        generator. So, for a seeded signal, the values only depend on the seed and on t: they are the
+        same for any number of threads (but, for the components evaluated in several blocks, they are
+        not the values of the unthreaded evaluation). A stateful noise (see Function._STATEFUL) is
+        left out of the blocks and evaluated over the whole array once they are done, so it keeps the
+        values of the unthreaded evaluation.
+        :param t: np.ndarray of floats
+        :param threads: the number of threads of the pool (raises TypeError if it is not an int and
+        ValueError if it is not positive).
+        :param labels: PerturbationLabels to fill in with the active blocks (None to skip labelling).
+        :return: np.ndarray with the calculated values of the signal.
+        """
+        if type(threads) is not int:
+            raise TypeError("Error: threads should be an integer")
+        if threads <= 0:
+            raise ValueError("Error: threads should be positive")
+        flat_t = t.ravel()
+        values = np.empty(flat_t.shape,dtype=t.dtype)
+        block_size = self._THREAD_BLOCK_SIZE
+        n_blocks = -(-flat_t.size//block_size)
+        active = self._active_perturbations(flat_t)
+        sorted_blocks = all(block is not None for j,per,block in active)
+        if sorted_blocks:
+            active = [(j,per,block) for j,per,block in active if block.stop > block.start]
+        sequential = self._noise._STATEFUL
+        components = [] if sequential or n_blocks <= 1 else [self._noise]
+        for j,per,block in active:
+            if per._RANDOM and (block is None or (block.stop - 1)//block_size > block.start//block_size):
+                components.append(per)
+        bases = {id(component):self._block_bit_generator(component) for component in components}
+        block_active = None
+        if sorted_blocks:
+            block_active = [[] for k in range(n_blocks)]
+            for j,per,block in active:
+                for k in range(block.start//block_size,(block.stop - 1)//block_size + 1):
+                    start = k*block_size
+                    block_active[k].append((j,per,slice(max(block.start,start) - start,
+                                                         min(block.stop,start + block_size) - start)))
+
+        def evaluate_block(k):
+            block = slice(k*block_size,min((k+1)*block_size,flat_t.size))
+            values[block] = self._calculate_array(flat_t[block],None,(k,bases),not sequential,
+                                                  None if block_active is None else block_active[k])
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(threads,max(1,n_blocks))) as pool:
+            list(pool.map(evaluate_block,range(n_blocks)))
+        if sequential:
+            values += self._evaluate_component(self._noise,flat_t)
+        if labels is not None:
+            for j,per,block in active:
+                labels.set_active(j,slice(0,t.size) if block is None else per.active_slice(t))
+        return values.reshape(t.shape)
+
+    def _block_bit_generator(self,component)->np.random.BitGenerator:
+        """
+        Draws the seed of the blocks of a threaded evaluation from the stream of a random component.
+        :param component: the random Function
+        :return: a PCG64 bit generator, block k draws from its k-th jump.
+        """
+        generator = component.random_generator()
+        if isinstance(generator,np.random.Generator):
+            entropy = generator.integers(0,2**32,size=4)
+        else:
+            entropy = generator.randint(0,2**32,size=4,dtype=np.int64)
+        return np.random.PCG64(np.random.SeedSequence(entropy.tolist()))
+
+    def _evaluate_component(self,component,t:np.ndarray,streams:tuple=None)->np.ndarray:
+        """
+        Evaluates one component of the signal over an array of times, through the cache if there is one.
+        :param component: the Function to evaluate
+        :param t: np.ndarray of floats
+        :param streams: None, or the pair (k,bases) of a block of the threaded evaluation: a random
+        component is then evaluated as a copy that draws from the k-th jump of its bit generator in
+        bases ({id(component): bit generator}).
+        :return: np.ndarray with the values of the component.
+        """
+        if streams is not None and id(component) in streams[1]:
+            k,bases = streams
+            generator = np.random.Generator(bases[id(component)].jumped(k+1))
+            component = copy.copy(component)
+            component._rng = generator
+        if self._instrumentation is not None:
+            return self._evaluate_instrumented(component,t)
+        if self._cache is None:
+            return component.calculate_array(t)
+        return self._cache.evaluate(component,t)
+
+    def _accumulate_component(self,component,t:np.ndarray,out:np.ndarray,scratch:np.ndarray):
+        """
+        Adds the values of one component of the signal to out in place (see Function.accumulate_array),
+        through the cache or the instrumentation if there is one.
+        :param component: the Function to evaluate
+        :param t: np.ndarray of floats
+        :param out: np.ndarray with the shape and dtype of t
+        :param scratch: np.ndarray like out that the component may overwrite
+        :return: None
+        """
+        if self._cache is None and self._instrumentation is None:
+            component.accumulate_array(t,out,scratch)
+        else:
+            out += self._evaluate_component(component,t)
+
+    def _evaluate_instrumented(self,component,t:np.ndarray)->np.ndarray:
+        """
+        Same as _evaluate_component, recording the evaluation in the instrumentation of the signal.
+        :param component: the Function to evaluate
+        :param t: np.ndarray of floats
+        :return: np.ndarray with the values of the component.
+        """
+        instrumentation = self._instrumentation
+        if self._cache is None:
+            return instrumentation.timed(component,lambda: component.calculate_array(t),t.size)
+        values,hit = instrumentation.timed(component,lambda: self._cache.lookup(component,t),t.size)
+        if hit is not None:
+            instrumentation.count('cache_hits' if hit else 'cache_misses')
+        return values
+
+    def stats(self,t0:float=0,t1:float=1)->dict:
+        """
+        Statistics of the signal over [t0,t1] computed in closed form from the parameters of its
+        components, without sampling it: mean, var and std over t uniform in [t0,t1], the exact range
+        (min,max) of its expected value, noise_std, the perturbed_fraction of the interval and the
+        anomaly_mean and anomaly_max expected shifts caused by the perturbations (see signals.stats,
+        whose signal_stats computes them for many signals at once).
+        :param t0: the lower limit of the interval
+        :param t1: the upper limit of the interval
+        :return: dictionary {statistic: float}
+        """
+        from signals.stats import signal_stats
+        return {name:float(values[0]) for name,values in signal_stats([self],t0,t1).items()}
 
-    def create_arithmetic_sample(self,t0:float=0,t1:float=1):
+    def compile(self):
+        """
+        Builds an immutable evaluation plan of the signal (see CompiledSignal): the parameters of every
+        component are validated and flattened into NumPy arrays once, so that sampling the plan over
+        and over only runs fused array expressions.
+        :return: CompiledSignal, a snapshot of the signal with its current perturbations.
+        """
+        return CompiledSignal(self)
+
+    @staticmethod
+    def _check_interval(t0:float,t1:float):
+        """
+        Checks that [t0,t1) is a valid sampling interval.
+        :param t0: the lower limit of the interval
+        :param t1: the upper limit of the interval
+        :return: None. Raises ValueError if t0 >= t1.
+        """
+        if t1 == t0:
+            raise ValueError("Error: sample size is 0, t0 = t1")
+        if t1 < t0:
+            raise ValueError("Sampling error: t1 should be larger than t0")
+
+    @staticmethod
+    def _arithmetic_grid(t0:float,t1:float,n:int,start:int=0,stop:int=None,dtype=float)->np.ndarray:
+        """
+        Builds (a slice of) the n point arithmetic grid over the clopen interval [t0,t1). Points
+        are computed from their index (t_i = t0 + i*step) so no rounding error is accumulated.
+        :param t0: the lower limit of the grid
+        :param t1: the upper limit of the grid
+        :param n: the number of points of the whole grid
+        :param start: the index of the first point we want (default 0)
+        :param stop: the index after the last point we want (default n)
+        :param dtype: the dtype of the grid, points are computed in float64 and rounded once to it.
+        :return: np.ndarray with the points start,...,stop-1 of the grid
+        """
+        if stop is None:
+            stop = n
+        step = (t1-t0)/float(n)
+        return (np.arange(start,stop,dtype=float)*step + t0).astype(dtype,copy=False)
+
+    def create_arithmetic_sample(self,t0:float=0,t1:float=1,labels:bool=False,dtype=None,threads:int=None):
         """
         This method allows us to sample the signal as if we had a mathematical function, provided with
         the limits of an interval (clopen). If limits are not of numeric type it will raise TypeError,
-        as well as if t0 >= t1. It always produces 200 points.
+        as well as if t0 >= t1. It produces _sample_size points (100 by default), the grid and the
+        signal values are calculated as whole arrays and the DataFrame is built once.
 
         :param t0: the lower limit of the sample we wish to calculate
         :param t1: the upper limit of the sample we wish to calculate
+        :param labels: if True, the per-point PerturbationLabels of the sample are also returned
+        (see calculate_array_with_labels).
+        :param dtype: the dtype of the sample, float32 or float64 (default the dtype of the signal).
+        :param threads: if given, the grid is evaluated in blocks by a pool of that many threads (see
+        calculate_array).
         :return: a pair (indicator,DF): composed of an indicator (PERT if there are perturbations involved,
-        NORMAL if not) and DF a Pandas DataFrame containing the 200 points of the signal sample.
+        NORMAL if not) and DF a Pandas DataFrame containing the _sample_size points of the signal sample.
+        With labels=True, a triple (indicator,DF,labels).
         """
-        if t1 == t0:
-            raise ValueError("Error: sample size is 0, t0 = t1")
-        if t1 < t0:
-            raise ValueError("Sampling error: t1 should be larger than t0")
-        step = (t1-t0)/float(self._sample_size)
-        t = t0
-        signal_sample = pd.DataFrame(columns=['t','signal'])
-        for i in range(self._sample_size):
-            try:
-                S_t = self.calculate(t)
-                signal_sample = signal_sample.append({'t':t,'signal':S_t},
-                                                     ignore_index=True)
-                t += step
-            except (ValueError,TypeError,Exception) as error:
-                print("Could not sample",error)
+        self._check_interval(t0,t1)
+        dtype = self._resolve_dtype(dtype)
+        t = self._arithmetic_grid(t0,t1,self._sample_size,dtype=dtype)
+        if not labels:
+            return self._sample_frame(t,self.calculate_array(t,dtype,threads))
+        values,sample_labels = self.calculate_array_with_labels(t,dtype,threads)
+        return self._sample_frame(t,values,sample_labels)
+
+    def create_irregular_sample(self,timestamps,labels:bool=False,dtype=None,threads:int=None):
+        """
+        Samples the signal over an arbitrary sorted array of time stamps (jittered, bursty or with
+        missing samples, see the signals.timestamps generators) in a single vectorized pass: the block
+        of time stamps within the support of every perturbation is found with np.searchsorted.
+        :param timestamps: sorted one dimensional array-like of times (raises ValueError if it is not
+        sorted and TypeError if it is not numeric).
+        :param labels: if True, the per-point PerturbationLabels of the sample are also returned.
+        :param dtype: the dtype of the sample, float32 or float64 (default the dtype of the signal).
+        :param threads: if given, the time stamps are evaluated in blocks by a pool of that many threads.
+        :return: a pair (indicator,DF) like create_arithmetic_sample, with one row per time stamp
+        (a triple (indicator,DF,labels) with labels=True).
+        """
+        dtype = self._resolve_dtype(dtype)
+        t = self._baseline.check_array(timestamps).astype(dtype,copy=False)
+        values,sample_labels = self.calculate_array_with_labels(t,dtype,threads)
+        return self._sample_frame(t,values,sample_labels if labels else None)
+
+    def create_jittered_sample(self,t0:float=0,t1:float=1,jitter:float=0.5,dropout:float=0,seed=None,
+                               labels:bool=False,dtype=None,threads:int=None):
+        """
+        Samples the signal over _sample_size jittered time stamps over [t0,t1), some of which may be
+        missing (see signals.timestamps.jittered_timestamps and create_irregular_sample).
+        :param t0: the lower limit of the sample we wish to calculate
+        :param t1: the upper limit of the sample we wish to calculate
+        :param jitter: the width of the jitter, as a fraction of the nominal step (in [0,1))
+        :param dropout: the probability of a missing sample (in [0,1))
+        :param seed: the seed of the time stamps (the values of the signal follow the seed of the signal)
+        :param labels: if True, the per-point PerturbationLabels of the sample are also returned.
+        :param dtype: the dtype of the sample, float32 or float64 (default the dtype of the signal).
+        :param threads: if given, the time stamps are evaluated in blocks by a pool of that many threads.
+        :return: a pair (indicator,DF) (a triple (indicator,DF,labels) with labels=True).
+        """
+        from signals.timestamps import jittered_timestamps
+        self._check_interval(t0,t1)
+        timestamps = jittered_timestamps(t0,t1,self._sample_size,jitter,dropout,seed)
+        return self.create_irregular_sample(timestamps,labels,dtype,threads)
+
+    def _sample_frame(self,t:np.ndarray,values:np.ndarray,labels:PerturbationLabels=None)->tuple:
+        """
+        Builds the DataFrame of a sample.
+        :param t: np.ndarray with the times of the sample
+        :param values: np.ndarray with the values of the signal
+        :param labels: the PerturbationLabels of the sample, if they are to be returned
+        :return: a pair (indicator,DF) or, if labels are given, a triple (indicator,DF,labels).
+        """
+        import pandas as pd
+        signal_sample = pd.DataFrame({'t':t,'signal':values},
+                                     columns=['t','signal'])
 
         type = 'NORMAL'
         if self._perturbations is not None:
             type = 'PERT'
 
+        if labels is not None:
+            return type,signal_sample,labels
         return type,signal_sample
 
-    def create_time_sample(self,wait_time):
+    def create_incremental_sample(self,t0:float=0,t1:float=1,dtype=None):
         """
-        Creates a MAX_SAMPLE point sample of the signal, aligned by time, starting on the
-        time in which the method is called (datetime.now()), and spaces samples according to the
-        wait_time parameter. It raises TypeError if wait_time is not numeric, and raises
-        ValueError if the wait_time is negative.
+        Samples the signal over the same _sample_size point grid as create_arithmetic_sample, but as a
+        SignalSample: an editable sample where perturbations added through SignalSample.add_perturbation
+        are applied only over the points within their support.
+        :param t0: the lower limit of the sample we wish to calculate
+        :param t1: the upper limit of the sample we wish to calculate
+        :param dtype: the dtype of the sample, float32 or float64 (default the dtype of the signal).
+        :return: SignalSample
+        """
+        self._check_interval(t0,t1)
+        return SignalSample(self,self._arithmetic_grid(t0,t1,self._sample_size,dtype=self._resolve_dtype(dtype)))
+
+    def create_ring_buffer(self,capacity:int,step:float,t0:float=0,dtype=None)->SignalRingBuffer:
+        """
+        Creates a fixed memory emitter of the signal over the endless grid t0 + k*step, that keeps the
+        last capacity points in a preallocated ring (see SignalRingBuffer).
+        :param capacity: the number of points of the window
+        :param step: the time between two points of the grid
+        :param t0: the time of the first point of the grid (default 0)
+        :param dtype: the dtype of the values, float32 or float64 (default the dtype of the signal)
+        :return: SignalRingBuffer, empty until it is advanced.
+        """
+        return SignalRingBuffer(self,capacity,step,t0,dtype)
+
+    def iter_arithmetic_sample(self,t0:float=0,t1:float=1,n:int=None,chunk_size:int=None,labels:bool=False,dtype=None,
+                               threads:int=None):
+        """
+        Streaming version of create_arithmetic_sample: a generator that walks the n point grid over
+        [t0,t1) in contiguous blocks of at most chunk_size points, so memory stays bounded no matter
+        how large n is. The grid is exactly the single-shot one, and every seeded component draws its
+        numbers from its own stream in grid order, so for the same seed the blocks follow the same
+        noise stream as a single-shot evaluation (without a seed, this only holds when the noise is
+        the only random component, since all components share the global numpy.random state).
+        :param t0: the lower limit of the sample we wish to calculate
+        :param t1: the upper limit of the sample we wish to calculate
+        :param n: the total number of points of the sample (default _sample_size)
+        :param chunk_size: the maximum number of points per block (default _DEFAULT_CHUNK_SIZE)
+        :param labels: if True, the PerturbationLabels of every block are also yielded.
+        :param dtype: the dtype of the blocks, float32 or float64 (default the dtype of the signal).
+        :param threads: if given, every block is evaluated in sub-blocks by a pool of that many threads
+        (see calculate_array), the values then depend on chunk_size but not on the number of threads.
+        :return: generator of pairs (t,values) of np.ndarrays, one pair per block (triples
+        (t,values,labels) with labels=True).
+        """
+        self._check_interval(t0,t1)
+        if n is None:
+            n = self._sample_size
+        if chunk_size is None:
+            chunk_size = self._DEFAULT_CHUNK_SIZE
+        if type(n) is not int or type(chunk_size) is not int:
+            raise TypeError("Error: n and chunk_size should be integers")
+        if n <= 0 or chunk_size <= 0:
+            raise ValueError("Error: n and chunk_size should be positive")
+        dtype = self._resolve_dtype(dtype)
+        for start in range(0,n,chunk_size):
+            t = self._arithmetic_grid(t0,t1,n,start,min(start+chunk_size,n),dtype)
+            if self._instrumentation is not None:
+                self._instrumentation.count('chunks')
+            if labels:
+                values,block_labels = self.calculate_array_with_labels(t,dtype,threads)
+                yield t,values,block_labels
+            else:
+                yield t,self.calculate_array(t,dtype,threads)
+
+    def _check_wait_time(self,wait_time):
+        """
+        Checks the time between the samples of a real time sample.
         :param wait_time: waiting time between samples (in seconds).
-        :return: a pair (indicator,DF): composed of an indicator (PERT if there are perturbations involved,
-        NORMAL if not) and DF a Pandas DataFrame containing the 200 points of the signal sample.
+        :return: None. It raises TypeError if wait_time is not numeric, and ValueError if it is negative.
         """
         if type(wait_time) not in [int,float]:
             raise TypeError("Error: wait_time is not numeric")
         elif wait_time < 0:
             raise ValueError("Error: wait_time is negative")
-        else:
-            signal_sample = pd.DataFrame(columns=['t', 'signal'])
-            start_time = datetime.now()
-            i = 0
-            while i < self._sample_size:
-                time.wait(wait_time)
-                now_time = datetime.now()
-                t = (now_time-start_time).timedelta()
-                try:
-                    S_t = self.evaluate(t)
-                    signal_sample = signal_sample.append({'t': now_time, 'signal': S_t},
-                                                         ignore_index=True)
-                except (ValueError,TypeError,Exception) as error:
-                    print("Could not sample signal",error)
-                finally:
-                    i +=1
-        type = 'NORMAL'
-        if self._perturbations is not None:
-            type = 'PERT'
 
-        return type, signal_sample
+    def _check_tick_count(self,n):
+        """
+        Checks the number of samples of a real time emitter.
+        :param n: the number of samples to emit (None for an endless emitter).
+        :return: None. It raises TypeError if n is not an int (or None), and ValueError if it is not positive.
+        """
+        if n is None:
+            return
+        if type(n) is not int:
+            raise TypeError("Error: n should be an integer")
+        if n <= 0:
+            raise ValueError("Error: n should be positive")
+
+    def iter_time_sample(self,wait_time,n:int=None):
+        """
+        Real time emitter of the signal: a generator that yields one sample every wait_time seconds.
+        Tick k is scheduled against the time.monotonic() clock at start + k*wait_time (instead of
+        sleeping wait_time after each sample), so the schedule does not drift: a late tick only
+        shortens the following sleep. The signal is evaluated at t = k*wait_time, the seconds elapsed
+        since the start of the schedule.
+        :param wait_time: waiting time between samples (in seconds).
+        :param n: the number of samples to emit (default None, emits samples until the generator is closed).
+        :return: generator of pairs (timestamp,value), timestamp being the datetime at which the tick is
+        due (its scheduled time, not the time at which it is actually emitted).
+        """
+        self._check_wait_time(wait_time)
+        self._check_tick_count(n)
+        start = time.monotonic()
+        start_time = datetime.datetime.now()
+        k = 1
+        while n is None or k <= n:
+            t = k*wait_time
+            delay = start + t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            yield start_time + datetime.timedelta(seconds=t),self.calculate(float(t))
+            k += 1
+
+    async def aiter_time_sample(self,wait_time,n:int=None):
+        """
+        Asynchronous version of iter_time_sample, to be consumed with async for. Ticks are scheduled
+        against the (monotonic) clock of the running event loop and waiting is done with asyncio.sleep,
+        so a single event loop can drive thousands of signals concurrently.
+        :param wait_time: waiting time between samples (in seconds).
+        :param n: the number of samples to emit (default None, emits samples until the generator is closed).
+        :return: asynchronous generator of pairs (timestamp,value), timestamp being the scheduled datetime
+        of the tick.
+        """
+        self._check_wait_time(wait_time)
+        self._check_tick_count(n)
+        import asyncio
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        start_time = datetime.datetime.now()
+        k = 1
+        while n is None or k <= n:
+            t = k*wait_time
+            await asyncio.sleep(max(0,start + t - loop.time()))
+            yield start_time + datetime.timedelta(seconds=t),self.calculate(float(t))
+            k += 1
+
+    def create_time_sample(self,wait_time):
+        """
+        Creates a _sample_size point sample of the signal, aligned by time, starting on the
+        time in which the method is called (datetime.now()), and spaces samples according to the
+        wait_time parameter (see iter_time_sample). It raises TypeError if wait_time is not numeric,
+        and raises ValueError if the wait_time is negative.
+        :param wait_time: waiting time between samples (in seconds).
+        :return: a pair (indicator,DF): composed of an indicator (PERT if there are perturbations involved,
+        NORMAL if not) and DF a Pandas DataFrame containing the _sample_size points of the signal sample.
+        """
+        samples = list(self.iter_time_sample(wait_time,self._sample_size))
+        import pandas as pd
+        signal_sample = pd.DataFrame(samples,columns=['t','signal'])
+        sample_type = 'NORMAL'
+        if self._perturbations is not None:
+            sample_type = 'PERT'
 
+        return sample_type, signal_sample
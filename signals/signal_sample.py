@@ -0,0 +1,102 @@
+import numpy as np
+from signals.perturbations.perturbation import Perturbation
+
+
+class SignalSample:
+    """
+    The SignalSample class is a sample of a Signal over a fixed, sorted time grid that can be edited
+    incrementally. It keeps the component-wise partial sums of the sample (the baseline, the noise and
+    the sum of the perturbations) and the total, so adding a perturbation only evaluates it over the
+    grid points within its support and adds its contribution there: an edit costs time proportional to
+    the width of the support instead of the whole grid.
+
+    Since the perturbations are added to the total in the same order as Signal.calculate_array does,
+    for the same seed the sample holds exactly the values a fresh create_arithmetic_sample would.
+    """
+    def __init__(self,signal,t):
+        """
+        Constructor for the sample. It evaluates the signal (with its current perturbations) over t.
+        :param signal: the Signal being sampled
+        :param t: sorted array-like with the time grid of the sample (raises ValueError if not sorted).
+        """
+        t = signal._baseline.check_array(t)
+        if t.ndim != 1 or not bool(np.all(t[1:] >= t[:-1])):
+            raise ValueError("Error: the grid of a sample should be a sorted one dimensional array")
+        self._signal = signal
+        self._t = t
+        self._baseline = signal._evaluate_component(signal._baseline,t)
+        self._noise = signal._evaluate_component(signal._noise,t)
+        self._perturbation_sum = np.zeros(t.shape,dtype=t.dtype)
+        self._values = self._baseline + self._noise
+        if signal._perturbations is not None and t.size > 0:
+            for per in signal._perturbation_index.query(t[0],t[-1]):
+                self._apply(per)
+
+    def __len__(self):
+        return self._t.size
+
+    @property
+    def t(self)->np.ndarray:
+        return self._read_only(self._t)
+
+    @property
+    def values(self)->np.ndarray:
+        return self._read_only(self._values)
+
+    @property
+    def baseline(self)->np.ndarray:
+        return self._read_only(self._baseline)
+
+    @property
+    def noise(self)->np.ndarray:
+        return self._read_only(self._noise)
+
+    @property
+    def perturbation_sum(self)->np.ndarray:
+        return self._read_only(self._perturbation_sum)
+
+    @staticmethod
+    def _read_only(array:np.ndarray)->np.ndarray:
+        view = array.view()
+        view.setflags(write=False)
+        return view
+
+    def add_perturbation(self,pert):
+        """
+        Adds a perturbation to the signal (see Signal.add_perturbation) and updates the sample over
+        the points within its support.
+        :param pert: The Function that is going to be added as a perturbation of the signal
+        :return: slice (or None for functions with an unbounded support) with the points that changed.
+        """
+        self._signal.add_perturbation(pert)
+        return self._apply(pert)
+
+    def _apply(self,pert):
+        """
+        Adds the contribution of a perturbation to the partial sums.
+        :param pert: the perturbation
+        :return: slice with the points that changed, None if the whole grid changed.
+        """
+        if isinstance(pert,Perturbation):
+            block = pert.support_slice(self._t)
+            if block.stop > block.start:
+                contribution = self._signal._evaluate_component(pert,self._t[block])
+                self._perturbation_sum[block] += contribution
+                self._values[block] += contribution
+            return block
+        contribution = self._signal._evaluate_component(pert,self._t)
+        self._perturbation_sum += contribution
+        self._values += contribution
+        return None
+
+    def to_frame(self)->tuple:
+        """
+        Builds the DataFrame of the sample, like create_arithmetic_sample does.
+        :return: a pair (indicator,DF): composed of an indicator (PERT if there are perturbations involved,
+        NORMAL if not) and DF a Pandas DataFrame with the columns t and signal.
+        """
+        sample_type = 'NORMAL'
+        if self._signal._perturbations is not None:
+            sample_type = 'PERT'
+        import pandas as pd
+        return sample_type,pd.DataFrame({'t':self._t,'signal':self._values.copy()},columns=['t','signal'])
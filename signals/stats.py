@@ -0,0 +1,194 @@
+"""
+Closed-form statistics of signals over a time interval, without sampling them (see Signal.stats).
+
+A signal X(t) = B(t) + R + P(t) is seen as a random variable over t uniform in [t0,t1] and the draws
+of its random components. Its expected value E[X(t)] = B(t) + mu + M(t) and its variance
+Var[X(t)] = sigma^2 + V(t) are known in closed form: B is the baseline (a BaseLine or a HarmonicBank,
+a sum of H sines), R ~ N(mu,sigma) the Noise, and every perturbation is described by pieces of its
+support where its values have a fixed mean and variance (Perturbation.stats_pieces), so M and V are
+piecewise constant. The interval is split at the ends of the pieces and the integrals of B and B^2
+are taken exactly over every segment. All the signals of a table are processed together with array
+operations, in O(K log K + K H^2) for K components.
+"""
+import math
+import numpy as np
+from signals.perturbations.perturbation import Perturbation
+
+STATS = ('mean','var','std','min','max','noise_std','perturbed_fraction','anomaly_mean','anomaly_max')
+"""
+The statistics computed by signal_stats.
+"""
+
+
+_BLOCK_ELEMENTS = 2**20
+"""
+Maximum number of elements of the (segments x harmonics x harmonics) products evaluated at once.
+"""
+
+
+def _cos_integral(frequency:np.ndarray,offset:np.ndarray,u:np.ndarray,w:np.ndarray)->np.ndarray:
+    """
+    Exact integrals of cos(frequency*t + offset) over the segments [u,w].
+    :return: np.ndarray
+    """
+    constant = frequency == 0
+    safe = np.where(constant,1.0,frequency)
+    return np.where(constant,np.cos(offset)*(w - u),
+                    (np.sin(frequency*w + offset) - np.sin(frequency*u + offset))/safe)
+
+
+def _sin_integrals(amplitude:np.ndarray,period:np.ndarray,phase:np.ndarray,u:np.ndarray,w:np.ndarray)->tuple:
+    """
+    Exact integrals of the sum of harmonics H(t) = sum_k amplitude_k sin(period_k*t + phase_k) and of
+    its square over the segments [u,w]. The square is integrated term by term, every product of two
+    harmonics being half the difference of the cosines of their difference and of their sum.
+    :param amplitude: (S x K) np.ndarray with the K harmonics of each of the S segments (and so
+    period and phase)
+    :param u: np.ndarray with the S starts of the segments
+    :param w: np.ndarray with the S ends of the segments
+    :return: pair (I1,I2) of np.ndarrays of S values
+    """
+    u = u[:,np.newaxis]
+    w = w[:,np.newaxis]
+    first = np.sum(amplitude*_cos_integral(period,phase - math.pi/2,u,w),axis=1)
+    second = np.empty(first.shape)
+    size = amplitude.shape[1]
+    rows = max(1,_BLOCK_ELEMENTS//max(1,size*size))
+    for start in range(0,first.size,rows):
+        block = slice(start,start + rows)
+        a,p,r = amplitude[block],period[block],phase[block]
+        lo,hi = u[block,:,np.newaxis],w[block,:,np.newaxis]
+        difference = _cos_integral(p[:,:,np.newaxis] - p[:,np.newaxis,:],r[:,:,np.newaxis] - r[:,np.newaxis,:],lo,hi)
+        addition = _cos_integral(p[:,:,np.newaxis] + p[:,np.newaxis,:],r[:,:,np.newaxis] + r[:,np.newaxis,:],lo,hi)
+        second[block] = np.einsum('sj,sjk,sk->s',a,difference - addition,a)/2
+    return first,second
+
+
+def _sin_range(period:np.ndarray,phase:np.ndarray,u:np.ndarray,w:np.ndarray)->tuple:
+    """
+    Exact minimum and maximum of sin(period*t + phase) over the segments [u,w].
+    :return: pair (minimum,maximum) of np.ndarrays
+    """
+    theta_u = period*u + phase
+    theta_w = period*w + phase
+    lo = np.minimum(theta_u,theta_w)
+    hi = np.maximum(theta_u,theta_w)
+    ends_min = np.minimum(np.sin(lo),np.sin(hi))
+    ends_max = np.maximum(np.sin(lo),np.sin(hi))
+    def reaches(crest):
+        return np.floor((hi - crest)/(2*math.pi)) >= np.ceil((lo - crest)/(2*math.pi))
+    return np.where(reaches(-math.pi/2),-1.0,ends_min),np.where(reaches(math.pi/2),1.0,ends_max)
+
+
+def signal_stats(signals,t0:float,t1:float)->dict:
+    """
+    Computes, in closed form, statistics of a list of signals over [t0,t1]:
+        - mean, var, std: moments of X(t) over t uniform in [t0,t1] and the random draws,
+        - min, max: exact range of the expected signal E[X(t)] (add a multiple of the standard
+          deviation of the noise to bound the sampled values). For a HarmonicBank baseline the
+          range of a sum of harmonics is bounded by the sum of their ranges instead,
+        - noise_std: the standard deviation of the noise,
+        - perturbed_fraction: the fraction of [t0,t1] within the support of some perturbation,
+        - anomaly_mean, anomaly_max: the mean and the maximum of |M(t)|, the expected shift caused by
+          the perturbations, over the perturbed time (0 if there is none).
+    :param signals: list of Signals, whose baseline is a BaseLine or a HarmonicBank. Their perturbations should be Perturbations whose pieces are
+    known (see Perturbation.stats_pieces) and their noise should be stationary (every value N(mu,sigma),
+    which is the case of Noise, AR1Noise and PinkNoise but not of BrownNoise), otherwise a TypeError
+    is raised.
+    :param t0: the lower limit of the interval
+    :param t1: the upper limit of the interval
+    :return: dictionary {statistic: np.ndarray with one value per signal}.
+    """
+    if type(t0) not in [int,float] or type(t1) not in [int,float]:
+        raise TypeError("Error: the limits of the interval are not numeric")
+    if t1 <= t0:
+        raise ValueError("Error: t1 should be larger than t0")
+    n = len(signals)
+    for signal in signals:
+        if not signal._noise._STATIONARY:
+            raise TypeError("Error: the statistics of {} are not known in closed form".format(repr(signal._noise)))
+    if n == 0:
+        return {name:np.empty(0) for name in STATS}
+    baselines = [signal._baseline.harmonics() for signal in signals]
+    size = max(len(amplitudes) for amplitudes,periods,phases,trans in baselines)
+    amplitude,period,phase = np.zeros((n,size)),np.zeros((n,size)),np.zeros((n,size))
+    for k,(amplitudes,periods,phases,trans) in enumerate(baselines):
+        amplitude[k,:amplitudes.size] = amplitudes
+        period[k,:periods.size] = periods
+        phase[k,:phases.size] = phases
+    parameters = np.array([(trans,signal._noise._mean,signal._noise._deviation)
+                           for (amplitudes,periods,phases,trans),signal in zip(baselines,signals)],dtype=float)
+    translation,noise_mean,noise_std = parameters.T
+    ids,times,means,variances,covers = [],[],[],[],[]
+    for k,signal in enumerate(signals):
+        if signal._perturbations is None:
+            continue
+        for per in signal._perturbations:
+            pieces = per.stats_pieces() if isinstance(per,Perturbation) else None
+            if pieces is None:
+                raise TypeError("Error: the statistics of {} are not known in closed form".format(repr(per)))
+            for a,b,mean,variance in pieces:
+                a,b = max(a,t0),min(b,t1)
+                if b > a:
+                    ids += [k,k]
+                    times += [a,b]
+                    means += [mean,-mean]
+                    variances += [variance,-variance]
+                    covers += [1,-1]
+    bounds = np.repeat(np.arange(n),2)
+    ids = np.r_[bounds,np.array(ids,dtype=int)]
+    times = np.r_[np.tile([float(t0),float(t1)],n),np.array(times,dtype=float)]
+    means = np.r_[np.zeros(2*n),means]
+    variances = np.r_[np.zeros(2*n),variances]
+    covers = np.r_[np.zeros(2*n),covers]
+    order = np.lexsort((times,ids))
+    ids,times = ids[order],times[order]
+    cumulated = [np.cumsum(column[order]) for column in (means,variances,covers)]
+    starts = np.flatnonzero(np.r_[True,ids[1:] != ids[:-1]])
+    levels = []
+    for column in cumulated:
+        before = np.r_[0.0,column][starts]
+        levels.append(column - np.repeat(before,np.diff(np.r_[starts,ids.size])))
+    shift,variance,cover = levels
+
+    segment = np.flatnonzero(ids[:-1] == ids[1:])
+    sid = ids[segment]
+    u,w = times[segment],times[segment + 1]
+    length = w - u
+    perturbed = np.rint(cover[segment]) > 0
+    shift = np.where(perturbed,shift[segment],0.0)
+    variance = np.where(perturbed,variance[segment],0.0)
+    amp,per,phas = amplitude[sid],period[sid],phase[sid]
+    level = translation[sid] + noise_mean[sid] + shift
+    first,second = _sin_integrals(amp,per,phas,u,w)
+    integral = first + level*length
+    square = second + 2*level*first + level**2*length
+
+    total = t1 - t0
+    mean = np.bincount(sid,integral,minlength=n)/total
+    second_moment = (np.bincount(sid,square + variance*length,minlength=n))/total + noise_std**2
+    var = np.maximum(second_moment - mean**2,0.0)
+
+    lowest,highest = _sin_range(per,phas,u[:,np.newaxis],w[:,np.newaxis])
+    sign = amp >= 0
+    low = np.sum(np.where(sign,amp*lowest,amp*highest),axis=1) + level
+    high = np.sum(np.where(sign,amp*highest,amp*lowest),axis=1) + level
+    valid = length > 0
+    minimum = np.full(n,np.inf)
+    maximum = np.full(n,-np.inf)
+    np.minimum.at(minimum,sid[valid],low[valid])
+    np.maximum.at(maximum,sid[valid],high[valid])
+
+    perturbed_length = np.bincount(sid,np.where(perturbed,length,0.0),minlength=n)
+    anomaly = np.bincount(sid,np.abs(shift)*length,minlength=n)
+    anomaly_max = np.zeros(n)
+    np.maximum.at(anomaly_max,sid[valid],np.abs(shift[valid]))
+    return {'mean':mean,
+            'var':var,
+            'std':np.sqrt(var),
+            'min':minimum,
+            'max':maximum,
+            'noise_std':noise_std.copy(),
+            'perturbed_fraction':perturbed_length/total,
+            'anomaly_mean':np.divide(anomaly,perturbed_length,out=np.zeros(n),where=perturbed_length > 0),
+            'anomaly_max':anomaly_max}
@@ -0,0 +1,81 @@
+"""
+Generators of irregular time stamps, to sample signals the way real sensors report them (see
+Signal.create_irregular_sample). Every generator builds the whole sorted array in bulk.
+"""
+import numpy as np
+
+
+def _check_interval(t0:float,t1:float):
+    """
+    Checks that [t0,t1) is a valid interval of time stamps.
+    :return: None. Raises TypeError if the limits are not numeric and ValueError if t0 >= t1.
+    """
+    if type(t0) not in [int,float] or type(t1) not in [int,float]:
+        raise TypeError("Error: the limits of the interval are not numeric")
+    if t1 <= t0:
+        raise ValueError("Error: t1 should be larger than t0")
+
+
+def _check_fraction(name:str,value:float):
+    """
+    Checks a parameter that should be a number in [0,1).
+    :return: None. Raises TypeError if the value is not numeric and ValueError if it is out of [0,1).
+    """
+    if type(value) not in [int,float]:
+        raise TypeError("Error: {} is not numeric".format(name))
+    if value < 0 or value >= 1:
+        raise ValueError("Error: {} should be in [0,1)".format(name))
+
+
+def jittered_timestamps(t0:float,t1:float,n:int,jitter:float=0.5,dropout:float=0,seed=None)->np.ndarray:
+    """
+    Time stamps of a sensor that reports at a nominal rate of n points over [t0,t1), with jitter and
+    missing samples: point i is reported at t0 + (i + u_i)*step, u_i ~ U(-jitter/2,jitter/2), and it is
+    dropped with probability dropout. Since |u_i| < 1/2 the time stamps keep their order.
+    :param t0: the lower limit of the interval
+    :param t1: the upper limit of the interval
+    :param n: the nominal number of points
+    :param jitter: the width of the jitter, as a fraction of the nominal step (in [0,1), default 0.5)
+    :param dropout: the probability of a missing sample (in [0,1), default 0)
+    :param seed: the seed of the jitter and dropout draws (an int, a SeedSequence or a Generator)
+    :return: sorted np.ndarray of time stamps within [t0,t1).
+    """
+    _check_interval(t0,t1)
+    if type(n) is not int:
+        raise TypeError("Error: n should be an integer")
+    if n <= 0:
+        raise ValueError("Error: n should be positive")
+    _check_fraction('jitter',jitter)
+    _check_fraction('dropout',dropout)
+    rng = np.random.default_rng(seed)
+    step = (t1-t0)/float(n)
+    offsets = np.arange(n,dtype=float)
+    if jitter > 0:
+        offsets += rng.uniform(-jitter/2,jitter/2,size=n)
+    t = np.maximum(offsets*step + t0,t0)
+    if dropout > 0:
+        t = t[rng.random(n) >= dropout]
+    return t
+
+
+def poisson_timestamps(t0:float,t1:float,rate:float,seed=None)->np.ndarray:
+    """
+    Time stamps of a sensor that reports at random, as the arrivals of a Poisson process: the gaps
+    between time stamps are independent exponential draws, which gives bursts and long silences.
+    :param t0: the lower limit of the interval
+    :param t1: the upper limit of the interval
+    :param rate: the mean number of time stamps per unit of time (positive)
+    :param seed: the seed of the draws (an int, a SeedSequence or a Generator)
+    :return: sorted np.ndarray of time stamps within [t0,t1).
+    """
+    _check_interval(t0,t1)
+    if type(rate) not in [int,float]:
+        raise TypeError("Error: rate is not numeric")
+    if rate <= 0:
+        raise ValueError("Error: rate should be positive")
+    rng = np.random.default_rng(seed)
+    expected = rate*(t1-t0)
+    t = t0 + np.cumsum(rng.exponential(1/rate,size=int(expected + 6*np.sqrt(expected)) + 10))
+    while t[-1] < t1:
+        t = np.concatenate([t,t[-1] + np.cumsum(rng.exponential(1/rate,size=t.size))])
+    return t[:int(np.searchsorted(t,t1,side='left'))]
@@ -1,5 +1,6 @@
 import unittest
 import math
+import numpy as np
 from signals.functions.baseline import BaseLine
 
 class BaselineTest(unittest.TestCase):
@@ -7,12 +8,12 @@ class BaselineTest(unittest.TestCase):
     def test_functionDefaultCreate(self):
         base_test = BaseLine()
         base_dict = {'_amplitude':0,'_period':0,'_phase':0,'_translation':0}
-        self.assertEqual(base_test.__dict__,base_dict)
+        self.assertEqual(base_test.get_parameters(),base_dict)
 
     def test_functionParamCreate(self):
         base_test = BaseLine(amp=1,per=1,phas=1,trans=1)
         base_dict = {'_amplitude': 1, '_period': 1, '_phase': 1, '_translation': 1}
-        self.assertEqual(base_test.__dict__, base_dict)
+        self.assertEqual(base_test.get_parameters(), base_dict)
 
     def test_print(self):
         self.assertEqual(BaseLine().__str__(), 'S(t)=0.0')
@@ -40,5 +41,22 @@ class BaselineTest(unittest.TestCase):
                 S_t = a*math.sin(p*t+f)+tr
                 self.assertEqual(test_func.calculate(t),S_t)
 
+    def test_funcValuesArray(self):
+        t_vals = np.linspace(0,10,101)
+        test_func = BaseLine(amp=2,per=3,phas=1,trans=0.5)
+        S_t = test_func.calculate_array(t_vals)
+        self.assertEqual(S_t.shape,t_vals.shape)
+        for t,s in zip(t_vals,S_t):
+            self.assertAlmostEqual(test_func.calculate(float(t)),s)
+        self.assertRaises(TypeError,test_func.calculate_array,['a','b'])
+
+    def test_funcValuesFloat32(self):
+        test_func = BaseLine(amp=2,per=1.5,phas=0.3,trans=0.5)
+        t_vals = (np.float32(1e6) + np.arange(100,dtype=np.float32)).astype(np.float32)
+        S_t = test_func.calculate_array(t_vals)
+        self.assertEqual(S_t.dtype,np.float32)
+        expected = 2*np.sin(1.5*t_vals.astype(float) + 0.3) + 0.5
+        self.assertLess(np.abs(S_t - expected).max(),1e-5)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from signals.functions.colored_noise import AR1Noise, PinkNoise, BrownNoise, _FilteredNoise, _first_order_filter
+from signals.sample_cache import SampleCache
+
+def chunked(noise,sizes):
+    return np.concatenate([noise.calculate_array(np.zeros(size)) for size in sizes])
+
+class ColoredNoiseTest(unittest.TestCase):
+
+    def test_firstOrderFilter(self):
+        rng = np.random.default_rng(0)
+        poles = np.array([0.9,-0.5,0.999,0.0])
+        w = rng.normal(size=(4,1000))
+        state = rng.normal(size=4)
+        expected = np.empty_like(w)
+        previous = state.copy()
+        for k in range(w.shape[1]):
+            previous = poles*previous + w[:,k]
+            expected[:,k] = previous
+        self.assertTrue(np.allclose(_first_order_filter(poles,w,state),expected))
+        self.assertTrue(np.allclose(_first_order_filter(poles,w[:,:5],state),expected[:,:5]))
+
+    def test_defaultBank(self):
+        values = _FilteredNoise(mean=1,std=2,seed=3).calculate_array(np.zeros(100000))
+        self.assertAlmostEqual(values.mean(),1,delta=0.05)
+        self.assertAlmostEqual(values.std(),2,delta=0.05)
+        self.assertAlmostEqual(np.corrcoef(values[1:],values[:-1])[0,1],0,delta=0.02)
+
+    def test_ar1(self):
+        values = AR1Noise(mean=1,std=2,phi=0.8,seed=3).calculate_array(np.zeros(200000))
+        self.assertAlmostEqual(values.mean(),1,delta=0.1)
+        self.assertAlmostEqual(values.std(),2,delta=0.05)
+        self.assertAlmostEqual(np.corrcoef(values[1:],values[:-1])[0,1],0.8,delta=0.01)
+        starts = [AR1Noise(mean=0,std=1,phi=0.9,seed=seed).calculate(0) for seed in range(5000)]
+        self.assertAlmostEqual(np.std(starts),1,delta=0.05)
+        self.assertRaises(ValueError,AR1Noise,mean=0,std=1,phi=1)
+        self.assertRaises(TypeError,AR1Noise,mean=0,std=1,phi='a')
+
+    def test_pink(self):
+        values = PinkNoise(mean=0,std=1.5,seed=2).calculate_array(np.zeros(2**20))
+        self.assertAlmostEqual(values.std(),1.5,delta=0.1)
+        power = np.abs(np.fft.rfft(values))**2
+        frequencies = np.arange(power.size)
+        low = power[(frequencies >= 100) & (frequencies < 200)].mean()
+        high = power[(frequencies >= 10000) & (frequencies < 20000)].mean()
+        self.assertAlmostEqual(np.log10(low/high),2,delta=0.15)
+        starts = [PinkNoise(mean=0,std=1,seed=seed).calculate(0) for seed in range(5000)]
+        self.assertAlmostEqual(np.std(starts),1,delta=0.05)
+
+    def test_brown(self):
+        noise = BrownNoise(mean=5,std=0.5,seed=1)
+        values = noise.calculate_array(np.zeros(1000))
+        self.assertAlmostEqual(np.diff(values).std(),0.5,delta=0.05)
+        walks = np.array([BrownNoise(mean=0,std=1,seed=seed).calculate_array(np.zeros(100)) for seed in range(2000)])
+        self.assertAlmostEqual(walks[:,-1].var()/100,1,delta=0.1)
+
+    def test_streaming(self):
+        sizes = [1,63,64,65,1000,3807]
+        for make in [lambda: AR1Noise(mean=1,std=2,phi=0.95,seed=9),lambda: PinkNoise(mean=0,std=1,seed=9),
+                     lambda: BrownNoise(mean=0,std=1,seed=9)]:
+            single = make().calculate_array(np.zeros(sum(sizes)))
+            self.assertTrue(np.allclose(chunked(make(),sizes),single))
+            noise = make()
+            noise.calculate_array(np.zeros(10))
+            noise.reset()
+            self.assertFalse(np.allclose(noise.calculate_array(np.zeros(10)),make().calculate_array(np.zeros(10))))
+        values = PinkNoise(mean=0,std=1,seed=9).calculate_array(np.zeros((20,50),dtype=np.float32))
+        self.assertEqual(values.shape,(20,50))
+        self.assertEqual(values.dtype,np.float32)
+
+    def test_streamState(self):
+        t = np.zeros(100)
+        cache = SampleCache()
+        noise = AR1Noise(mean=0,std=1,phi=0.5,seed=4)
+        first = cache.evaluate(noise,t)
+        second = cache.evaluate(noise,t)
+        self.assertFalse(np.array_equal(first,second))
+        replay = AR1Noise(mean=0,std=1,phi=0.5,seed=4)
+        self.assertTrue(np.array_equal(cache.evaluate(replay,t),first))
+        self.assertTrue(np.array_equal(cache.evaluate(replay,t),second))
+        self.assertTrue(np.allclose(replay.calculate_array(t),noise.calculate_array(t)))
+        self.assertIsNone(AR1Noise(mean=0,std=1,phi=0.5).cache_token())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,5 +21,11 @@ class TestFunction(unittest.TestCase):
         test_func = Function()
         self.assertRaises(TypeError,test_func.evaluate,'w')
 
+    def test_calculateArray(self):
+        test_func = Function()
+        values = test_func.calculate_array([0,1,2])
+        self.assertEqual(list(values),[0,0,0])
+        self.assertRaises(TypeError,test_func.calculate_array,['w'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,40 @@
+import math
+import unittest
+import numpy as np
+from signals.functions.baseline import BaseLine
+from signals.functions.harmonic_bank import HarmonicBank
+
+class HarmonicBankTest(unittest.TestCase):
+
+    def test_matchesBaseLines(self):
+        amps,pers,phases = [1,0.5,2],[1,3,-2],[0,1,0.5]
+        bank = HarmonicBank(amp=amps,per=pers,phas=phases,trans=1.5)
+        t = np.linspace(-3,7,1001)
+        expected = 1.5 + sum(BaseLine(amp=a,per=p,phas=f,trans=0).calculate_array(t)
+                             for a,p,f in zip(amps,pers,phases))
+        self.assertTrue(np.allclose(bank.calculate_array(t),expected))
+        self.assertAlmostEqual(bank.calculate(2.0),expected[500])
+        self.assertTrue(np.allclose(bank.calculate_array(t.reshape(7,143)),expected.reshape(7,143)))
+
+    def test_fftSynthesis(self):
+        rng = np.random.default_rng(1)
+        k = 200
+        n = 4096
+        t = 2 + np.arange(n)*(10/n)
+        pers = 2*math.pi*rng.integers(-n//2 + 1,n//2,size=k)/10
+        bank = HarmonicBank(amp=rng.normal(size=k),per=pers,phas=rng.uniform(0,6,size=k),trans=0.5)
+        self.assertIsNotNone(bank._fft_synthesis(t))
+        direct = np.sin(np.outer(t,bank._periods) + bank._phases) @ bank._amplitudes + 0.5
+        self.assertTrue(np.allclose(bank.calculate_array(t),direct))
+        self.assertIsNone(bank._fft_synthesis(t**2))
+
+    def test_construction(self):
+        self.assertRaises(ValueError,HarmonicBank,amp=[1,2],per=[1])
+        self.assertRaises(TypeError,HarmonicBank,amp=['a'],per=[1])
+        bank = HarmonicBank(amp=[1,2],per=[1,2])
+        self.assertEqual(list(bank._phases),[0,0])
+        self.assertEqual(bank.__repr__(),'HarmonicBank(amp=[1.0, 2.0],per=[1.0, 2.0],phas=[0.0, 0.0],trans=0)')
+        self.assertRaises(TypeError,bank.calculate,'t')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import warnings
+import numpy as np
+from signals.functions.noise_group import NoiseGroup
+
+COV = [[1.0,0.8,0.2],[0.8,2.0,-0.5],[0.2,-0.5,0.5]]
+
+class NoiseGroupTest(unittest.TestCase):
+
+    def test_covariance(self):
+        group = NoiseGroup(cov=COV,mean=[1,-2,0],seed=4)
+        self.assertEqual(group.channels,3)
+        self.assertTrue(np.allclose(group.covariance(),COV))
+        values = group.calculate_array(np.linspace(0,1,200000))
+        self.assertEqual(values.shape,(200000,3))
+        self.assertTrue(np.allclose(values.mean(axis=0),[1,-2,0],atol=0.02))
+        self.assertTrue(np.allclose(np.cov(values.T),COV,atol=0.03))
+        self.assertEqual(group.calculate(1.5).shape,(3,))
+
+    def test_loadings(self):
+        loadings = [[1.0],[0.5],[-2.0]]
+        group = NoiseGroup(loadings=loadings,mean=0.5,seed=1)
+        self.assertTrue(np.allclose(group.covariance(),np.outer(loadings,loadings)))
+        rows = group.calculate_rows(1000)
+        self.assertEqual(rows.shape,(3,1000))
+        self.assertTrue(np.allclose(rows[1] - 0.5,(rows[0] - 0.5)*0.5))
+        out = np.zeros((3,10))
+        self.assertIs(NoiseGroup(loadings=loadings,mean=0,seed=1).calculate_rows(10,out=out),out)
+
+    def test_seeded(self):
+        t = np.linspace(0,1,100)
+        first = NoiseGroup(cov=COV,mean=0,seed=7).calculate_array(t)
+        self.assertTrue(np.array_equal(first,NoiseGroup(cov=COV,mean=0,seed=7).calculate_array(t)))
+        rows = NoiseGroup(cov=COV,mean=0,seed=7).calculate_rows(100)
+        self.assertTrue(np.allclose(rows,first.T))
+        single = NoiseGroup(cov=COV,mean=0,seed=7).calculate_array(t.astype(np.float32))
+        self.assertEqual(single.dtype,np.float32)
+
+    def test_errors(self):
+        self.assertRaises(ValueError,NoiseGroup,mean=0)
+        self.assertRaises(ValueError,NoiseGroup,cov=COV,loadings=COV,mean=0)
+        self.assertRaises(TypeError,NoiseGroup,cov=[1,2],mean=0)
+        self.assertRaises(ValueError,NoiseGroup,cov=[[1,2],[0,1]],mean=0)
+        self.assertRaises(ValueError,NoiseGroup,cov=[[1,2],[2,1]],mean=0)
+        self.assertRaises(ValueError,NoiseGroup,cov=COV,mean=[1,2])
+        self.assertRaises(TypeError,NoiseGroup(cov=COV,mean=0).calculate,'a')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            group = NoiseGroup(cov=COV)
+        self.assertEqual(len(caught),1)
+        self.assertTrue(np.array_equal(group._mean,np.zeros(3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
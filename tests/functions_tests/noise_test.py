@@ -1,4 +1,6 @@
+import numpy as np
 import unittest
+import warnings
 from signals.functions.noise import Noise
 
 class NoiseTest(unittest.TestCase):
@@ -19,7 +21,45 @@ class NoiseTest(unittest.TestCase):
             self.assertEqual(noise_test.__repr__(), str_rep)
 
     def test_constructor(self):
-        noise_test = Noise(mean=0,std=-1)
+        for std in [-1,0]:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                noise_test = Noise(mean=0,std=std)
+            self.assertEqual(len(caught),1)
+            self.assertEqual(noise_test._deviation,1)
+            self.assertEqual(noise_test.calculate_array(np.zeros(5)).shape,(5,))
+
+    def test_calculateArray(self):
+        noise_test = Noise(mean=2,std=0.5)
+        values = noise_test.calculate_array(np.zeros(10000))
+        self.assertEqual(values.shape,(10000,))
+        self.assertAlmostEqual(values.mean(),2,delta=0.05)
+        self.assertAlmostEqual(values.std(),0.5,delta=0.05)
+
+    def test_seededBulkMatchesPointwise(self):
+        t = np.linspace(0,1,500)
+        pointwise = Noise(mean=1,std=2,seed=42)
+        bulk = Noise(mean=1,std=2,seed=42)
+        values = [pointwise.calculate(float(t_i)) for t_i in t]
+        self.assertTrue(np.array_equal(bulk.calculate_array(t),values))
+        self.assertTrue(bulk.is_seeded())
+        self.assertFalse(Noise(mean=1,std=2).is_seeded())
+
+    def test_calculateArrayFloat32(self):
+        t = np.zeros(10000,dtype=np.float32)
+        values = Noise(mean=2,std=0.5,seed=3).calculate_array(t)
+        self.assertEqual(values.dtype,np.float32)
+        self.assertAlmostEqual(float(values.mean()),2,delta=0.05)
+        self.assertAlmostEqual(float(values.std()),0.5,delta=0.05)
+        self.assertTrue(np.array_equal(values,Noise(mean=2,std=0.5,seed=3).calculate_array(t)))
+        self.assertEqual(Noise(mean=2,std=0.5).calculate_array(t).dtype,np.float32)
+
+    def test_accumulateArray(self):
+        for dtype in [np.float64,np.float32]:
+            t = np.linspace(0,1,1000).astype(dtype)
+            out = np.ones(t.shape,dtype=dtype)
+            Noise(mean=2,std=0.5,seed=4).accumulate_array(t,out,np.empty_like(t))
+            self.assertTrue(np.array_equal(out,1 + Noise(mean=2,std=0.5,seed=4).calculate_array(t)))
 
 
 if __name__ == '__main__':
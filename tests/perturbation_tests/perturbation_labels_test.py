@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from signals.signal import Signal
+from signals.functions.baseline import BaseLine
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+from signals.perturbations.step_perturbation import StepPerturbation
+from signals.perturbations.perturbation_labels import PerturbationLabels
+
+def make_signal():
+    test_signal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=0.1,seed=9,sample_size=1000)
+    test_signal.add_perturbation(StepPerturbation(t0=2,support=3,strength=3,step=3.5,dir=1))
+    test_signal.add_perturbation(SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8))
+    test_signal.add_perturbation(Perturbation(t0=4,support=3,strength=1))
+    test_signal.add_perturbation(Perturbation(t0=20,support=3,strength=1))
+    test_signal.add_perturbation(BaseLine(amp=0.1,per=5,phas=0,trans=0))
+    return test_signal
+
+class PerturbationLabelsTest(unittest.TestCase):
+
+    def test_representations(self):
+        labels = PerturbationLabels(10,9)
+        labels.set_active(0,slice(2,5))
+        labels.set_active(3,slice(4,8))
+        labels.set_active(8,slice(0,10))
+        dense = labels.to_dense()
+        self.assertEqual(dense.shape,(10,9))
+        self.assertEqual(labels.shape,(10,9))
+        self.assertTrue(np.array_equal(labels.to_bitmask(),np.packbits(dense,axis=1,bitorder='little')))
+        self.assertTrue(np.array_equal(labels.active_count(),dense.sum(axis=1)))
+        self.assertEqual(list(labels.which()),[8,8,0,0,0,3,3,3,8,8])
+
+    def test_signalLabels(self):
+        t = make_signal()._arithmetic_grid(0,10,1000)
+        values,labels = make_signal().calculate_array_with_labels(t)
+        self.assertTrue(np.array_equal(values,make_signal().calculate_array(t)))
+        expected = np.stack([(t > 2) & (t < 5),
+                             (t > 6) & (t < 9) & (np.abs(t - 7.5) < 0.4),
+                             (t > 4) & (t < 7),
+                             np.zeros(t.size,dtype=bool),
+                             np.ones(t.size,dtype=bool)],axis=1)
+        self.assertTrue(np.array_equal(labels.to_dense(),expected))
+        type,sample,sample_labels = make_signal().create_arithmetic_sample(0,10,labels=True)
+        self.assertTrue(np.array_equal(sample_labels.to_dense(),expected))
+        self.assertTrue(np.array_equal(make_signal().create_arithmetic_sample(0,10)[1]['signal'],sample['signal']))
+        blocks = list(make_signal().iter_arithmetic_sample(0,10,1000,chunk_size=300,labels=True))
+        self.assertTrue(np.array_equal(np.concatenate([block_labels.to_dense() for t,values,block_labels in blocks]),
+                                       expected))
+        self.assertRaises(ValueError,make_signal().calculate_array_with_labels,t[::-1])
+
+if __name__ == '__main__':
+    unittest.main()
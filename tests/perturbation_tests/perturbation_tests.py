@@ -4,11 +4,26 @@ from signals.perturbations.perturbation import Perturbation
 from signals.perturbations.spike_perturbation import SpikePerturbation
 from signals.perturbations.step_perturbation import StepPerturbation
 
+class Ramp(Perturbation):
+    """
+    A perturbation that only overrides perturbation_function: it grows by 1 every unit of time.
+    """
+    __slots__ = ()
+
+    def perturbation_function(self,t:float)->float:
+        return self._strength*(t - self._t0)
+
+class RampSpike(SpikePerturbation):
+    __slots__ = ()
+
+    def perturbation_function(self,t:float)->float:
+        return t
+
 class PerturbationTest(unittest.TestCase):
 
     def test_createPerturbation(self):
         test_pert = Perturbation()
-        self.assertEqual(test_pert.__dict__,{'_t0':0.5,'_support':0.25,'_strength':1})
+        self.assertEqual(test_pert.get_parameters(),{'_t0':0.5,'_support':0.25,'_strength':1})
 
     def test_perturbationValues(self):
         t_values = list(np.linspace(start=0,stop=1.0,num=50,endpoint=True))
@@ -23,7 +38,7 @@ class PerturbationTest(unittest.TestCase):
 
     def test_createSpike(self):
         test_spike = SpikePerturbation(t0=0.8,strength=8,support=10,position=1.2,width=0.3)
-        self.assertEqual(test_spike.__dict__,{'_t0':0.8,'_support':10,'_strength':8,'_position':1.2,'_width':0.3})
+        self.assertEqual(test_spike.get_parameters(),{'_t0':0.8,'_support':10,'_strength':8,'_position':1.2,'_width':0.3})
 
     def test_spikeValues(self):
         s,p,w = 2,1.2,0.3
@@ -65,6 +80,63 @@ class PerturbationTest(unittest.TestCase):
                         self.assertTrue(-s*(1+0.3) <= P_t <= -s*(1-0.3))
                     else:
                         self.assertTrue(s*(1-0.3) <= P_t <= s*(1+0.3))
+    def test_perturbationValuesArray(self):
+        t_values = np.linspace(start=0,stop=1.0,num=50,endpoint=True)
+        test_pert = Perturbation()
+        P_t = test_pert.calculate_array(t_values)
+        for t,p in zip(t_values,P_t):
+            self.assertEqual(p,test_pert.calculate(float(t)))
+
+    def test_spikeValuesArray(self):
+        s,p,w = 2,1.2,0.3
+        test_spike = SpikePerturbation(t0=0.8,support=2,strength=s,position=p,width=w,seed=1)
+        t_values = np.linspace(start=0, stop=4.0, num=400, endpoint=True)
+        P_t = test_spike.calculate_array(t_values)
+        outside = (t_values <= 0.8) | (t_values >= 2.8)
+        in_spike = ~outside & (np.abs(t_values-p) < w/2)
+        self.assertTrue(np.all(P_t[outside] == 0))
+        self.assertTrue(np.all((s*0.4 <= P_t[in_spike]) & (P_t[in_spike] <= s*1.6)))
+        tail = ~outside & ~in_spike
+        self.assertTrue(np.all((0.1*s*0.4 <= P_t[tail]) & (P_t[tail] <= 0.1*s*1.6)))
+
+    def test_stepValuesArray(self):
+        s, step = 2, 1.2
+        test_step = StepPerturbation(t0=0.8,support=2,strength=s,step=step,dir=-1,seed=1)
+        t_values = np.linspace(start=0, stop=4.0, num=400, endpoint=True)
+        P_t = test_step.calculate_array(t_values)
+        outside = (t_values <= 0.8) | (t_values >= 2.8)
+        self.assertTrue(np.all(P_t[outside] == 0))
+        before = ~outside & (t_values < step)
+        after = ~outside & (t_values >= step)
+        self.assertTrue(np.all((s*0.7 <= P_t[before]) & (P_t[before] <= s*1.3)))
+        self.assertTrue(np.all((-s*1.3 <= P_t[after]) & (P_t[after] <= -s*0.7)))
+
+    def test_seededBulkMatchesPointwise(self):
+        t_values = np.linspace(start=0, stop=4.0, num=400, endpoint=True)
+        for pert_class,kwargs in [(SpikePerturbation,dict(t0=0.8,support=2,strength=2,position=1.2,width=0.3)),
+                                  (StepPerturbation,dict(t0=0.8,support=2,strength=2,step=1.2,dir=-1))]:
+            pointwise = pert_class(seed=3,**kwargs)
+            bulk = pert_class(seed=3,**kwargs)
+            P_t = [pointwise.calculate(float(t)) for t in t_values]
+            self.assertTrue(np.array_equal(bulk.calculate_array(t_values),P_t))
+
+    def test_supportSliceFloat32(self):
+        t = np.linspace(0,10,100001).astype(np.float32)
+        for pert in [Perturbation(t0=1/3,support=2/3,strength=1),
+                     SpikePerturbation(t0=1/3,support=2/3,strength=1,position=0.7,width=0.1)]:
+            support = np.flatnonzero(pert._char_of_support_array(t))
+            block = pert.support_slice(t)
+            self.assertEqual((block.start,block.stop),(support[0],support[-1] + 1))
+
+    def test_overriddenPerturbationFunction(self):
+        ramp = Ramp(t0=2,support=10,strength=1)
+        self.assertEqual(ramp.calculate(5.0),3.0)
+        t_values = np.linspace(start=0,stop=15,num=61)
+        P_t = [ramp.calculate(float(t)) for t in t_values]
+        self.assertTrue(np.allclose(ramp.calculate_array(t_values),P_t))
+        spike = RampSpike(t0=0.8,support=2,strength=2,position=1.2,width=0.3)
+        self.assertTrue(np.allclose(spike.calculate_array(t_values),[spike.calculate(float(t)) for t in t_values]))
+
 
 
 
@@ -0,0 +1,33 @@
+import unittest
+import numpy as np
+from signals.functions.function import Function
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.support_index import SupportIndex
+
+class SupportIndexTest(unittest.TestCase):
+
+    def test_query(self):
+        rng = np.random.default_rng(0)
+        perts = [Perturbation(t0=float(t0),support=float(s),strength=1)
+                 for t0,s in zip(rng.uniform(0,100,500),rng.uniform(0,3,500))]
+        index = SupportIndex()
+        for pert in perts:
+            index.add(pert)
+        self.assertEqual(len(index),500)
+        for t_min,t_max in [(10,12),(50.5,50.5),(-5,0),(99,200),(0,100)]:
+            expected = [p for p in perts if p._t0 < t_max and p._t0 + p._support > t_min]
+            self.assertEqual(index.query(t_min,t_max),expected)
+
+    def test_unboundedFunctions(self):
+        index = SupportIndex()
+        first = Perturbation(t0=1,support=1,strength=1)
+        generic = Function()
+        last = Perturbation(t0=0,support=1,strength=1)
+        for pert in [first,generic,last]:
+            index.add(pert)
+        self.assertEqual(index.query(1.5,1.5),[first,generic])
+        self.assertEqual(index.query(0,10),[first,generic,last])
+        self.assertEqual(index.query(50,60),[generic])
+
+if __name__ == '__main__':
+    unittest.main()
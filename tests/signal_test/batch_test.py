@@ -0,0 +1,80 @@
+import unittest
+import warnings
+import numpy as np
+
+from signals.batch import SignalBatch, generate_many
+from signals.signal import Signal
+from signals.functions.noise_group import NoiseGroup
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+def make_specs(n_specs):
+    specs = []
+    for k in range(n_specs):
+        spike = SpikePerturbation(t0=2,support=3,strength=k+1,position=3,width=0.5)
+        specs.append({'amp':k,'per':1,'phas':0,'trans':0,'mean':0,'std':0.5,'perturbations':[spike]})
+    return specs
+
+class TestSignalBatch(unittest.TestCase):
+
+    def test_generate(self):
+        specs = make_specs(6)
+        t,values = generate_many(specs,t0=0,t1=10,n=500,workers=1,seed=99)
+        self.assertEqual(values.shape,(6,500))
+        self.assertEqual(len(t),500)
+        seeds = np.random.SeedSequence(99).spawn(6)
+        for k,spec in enumerate(specs):
+            signal = Signal(amp=k,per=1,phas=0,trans=0,mean=0,std=0.5,seed=seeds[k])
+            signal.add_perturbation(SpikePerturbation(t0=2,support=3,strength=k+1,position=3,width=0.5))
+            self.assertTrue(np.array_equal(values[k],signal.calculate_array(t)))
+        self.assertFalse(specs[0]['perturbations'][0].is_seeded())
+
+    def test_workersIndependent(self):
+        batch = SignalBatch(make_specs(7))
+        self.assertEqual(len(batch),7)
+        t,single = batch.generate(t0=0,t1=10,n=300,workers=1,seed=5)
+        t,pooled = batch.generate(t0=0,t1=10,n=300,workers=2,seed=5)
+        self.assertTrue(np.array_equal(single,pooled))
+        self.assertRaises(TypeError,batch.add_spec,[1,2])
+        self.assertRaises(TypeError,batch.generate,t0=0,t1=10,n=10.5)
+        self.assertRaises(ValueError,batch.generate,t0=0,t1=10,n=0)
+        self.assertRaises(TypeError,batch.generate,t0='0',t1=10,n=10)
+        self.assertRaises(ValueError,batch.generate,t0=10,t1=0,n=10)
+        self.assertRaises(TypeError,batch.generate,t0=0,t1=10,n=10,workers=2.0)
+        self.assertRaises(ValueError,batch.generate,t0=0,t1=10,n=10,workers=0)
+
+    def test_specWarnings(self):
+        specs = make_specs(6)
+        for spec in specs:
+            spec['std'] = 0
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            t,values = generate_many(specs,t0=0,t1=10,n=50,workers=1,seed=2)
+        self.assertEqual(len(caught),1)
+        self.assertRaises(TypeError,generate_many,[{'amp':'1'}],workers=1)
+
+    def test_noiseGroup(self):
+        specs = make_specs(4)
+        cov = 0.25*(np.eye(4) + 3*np.ones((4,4)))/4
+        group = NoiseGroup(cov=cov,mean=0)
+        t,single = generate_many(specs,t0=0,t1=10,n=20000,workers=1,seed=3,noise=group)
+        t,pooled = generate_many(specs,t0=0,t1=10,n=20000,workers=2,seed=3,noise=group)
+        self.assertTrue(np.array_equal(single,pooled))
+        self.assertFalse(group.is_seeded())
+        seeds = np.random.SeedSequence(3).spawn(4)
+        clean = []
+        for k in range(4):
+            signal = Signal(amp=k,per=1,phas=0,trans=0,mean=0,std=0.5,seed=seeds[k])
+            signal.add_perturbation(SpikePerturbation(t0=2,support=3,strength=k+1,position=3,width=0.5))
+            clean.append(signal._calculate_array(t,noise=False))
+        residual = single - np.array(clean)
+        self.assertTrue(np.allclose(np.cov(residual[:,t >= 5]),cov,atol=0.01))
+        self.assertRaises(ValueError,generate_many,specs,noise=NoiseGroup(cov=np.eye(3),mean=0))
+        self.assertRaises(TypeError,generate_many,specs,noise=cov)
+        seeded = NoiseGroup(cov=cov,mean=0,seed=11)
+        t,first = generate_many(specs,t0=0,t1=10,n=500,workers=1,seed=3,noise=seeded)
+        t,second = generate_many(specs,t0=0,t1=10,n=500,workers=2,seed=3,noise=seeded)
+        self.assertTrue(np.array_equal(first,second))
+        self.assertEqual(seeded.get_stream_state(),NoiseGroup(cov=cov,mean=0,seed=11).get_stream_state())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+import unittest
+
+from signals import bench
+
+class TestBench(unittest.TestCase):
+
+    def test_runBenchmarks(self):
+        report = bench.run_benchmarks(sizes=[100,1000],perturbation_counts=[0,6],repeat=1)
+        paths = {entry['path'] for entry in report['results']}
+        self.assertEqual(paths,{'calculate','calculate_array','create_arithmetic_sample',
+                                'iter_arithmetic_sample','compiled','noise','perturbations',
+                                'construct','from_specs','calculate_array_float32',
+                                'calculate_array_threaded'})
+        for entry in report['results']:
+            self.assertGreater(entry['points_per_sec'],0)
+            self.assertGreaterEqual(entry['peak_memory_bytes'],0)
+
+    def test_compare(self):
+        report = {'results':[{'path':'compiled','points':100,'perturbations':0,'points_per_sec':50.0},
+                             {'path':'noise','points':100,'perturbations':0,'points_per_sec':100.0}]}
+        baseline = {'results':[{'path':'compiled','points':100,'perturbations':0,'points_per_sec':100.0},
+                               {'path':'noise','points':100,'perturbations':0,'points_per_sec':110.0}]}
+        regressions = bench.compare(report,baseline,tolerance=0.2)
+        self.assertEqual([entry['path'] for entry in regressions],['compiled'])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory,'report.json')
+            args = ['--sizes','100','--perturbations','0','--repeat','1','--output',output]
+            self.assertEqual(bench.main(args),0)
+            with open(output,'r',encoding='utf-8') as report_file:
+                report = json.load(report_file)
+            for entry in report['results']:
+                entry['points_per_sec'] *= 1000
+            with open(output,'w',encoding='utf-8') as report_file:
+                json.dump(report,report_file)
+            self.assertEqual(bench.main(args[:-2] + ['--baseline',output,'--output',output]),1)
+
+if __name__ == '__main__':
+    unittest.main()
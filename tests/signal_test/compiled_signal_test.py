@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+
+from signals.signal import Signal
+from signals.functions.baseline import BaseLine
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.step_perturbation import StepPerturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+def make_signal(dtype=None):
+    test_signal = Signal(amp=4,per=1.5,phas=0.3,trans=2,mean=0.15,std=0.1,seed=21,dtype=dtype)
+    rng = np.random.default_rng(8)
+    for t0 in rng.uniform(0,10,30):
+        t0 = float(t0)
+        test_signal.add_perturbation(Perturbation(t0=t0,support=0.7,strength=1.5))
+        test_signal.add_perturbation(SpikePerturbation(t0=t0,support=1,strength=3,position=t0+0.5,width=0.2))
+        test_signal.add_perturbation(StepPerturbation(t0=t0,support=2,strength=2,step=t0+1,dir=-1))
+    test_signal.add_perturbation(BaseLine(amp=0.5,per=7,phas=0,trans=0))
+    return test_signal
+
+class TestCompiledSignal(unittest.TestCase):
+
+    def test_matchesSignal(self):
+        t = np.linspace(0,12,4000)
+        plan = make_signal().compile()
+        self.assertEqual(plan.sample_type(),'PERT')
+        self.assertTrue(np.allclose(plan.calculate_array(t),make_signal().calculate_array(t)))
+        shuffled = np.random.default_rng(0).permutation(t)
+        self.assertTrue(np.allclose(make_signal().compile().calculate_array(shuffled),
+                                    make_signal().calculate_array(shuffled)))
+        self.assertAlmostEqual(make_signal().compile().calculate(3.3),make_signal().calculate(3.3))
+        self.assertRaises(TypeError,plan.calculate_array,['a'])
+
+    def test_overriddenPerturbationFunction(self):
+        class Ramp(Perturbation):
+            __slots__ = ()
+
+            def perturbation_function(self,t:float)->float:
+                return self._strength*(t - self._t0)
+
+        test_signal = Signal(amp=0,per=1,phas=0,trans=0,mean=0,std=1e-9,seed=1)
+        test_signal.add_perturbation(Ramp(t0=2,support=10,strength=1))
+        self.assertAlmostEqual(test_signal.calculate(5.0),3.0)
+        self.assertAlmostEqual(test_signal.calculate_array(np.array([5.0]))[0],3.0)
+        sample = test_signal.create_arithmetic_sample(4,6)[1]
+        self.assertTrue(np.allclose(sample['signal'],sample['t'] - 2,atol=1e-6))
+        self.assertAlmostEqual(test_signal.compile().calculate(5.0),3.0)
+
+    def test_float32(self):
+        t = np.linspace(0,12,4000)
+        plan = make_signal('float32').compile()
+        self.assertEqual(plan.dtype,np.float32)
+        values = plan.calculate_array(t)
+        self.assertEqual(values.dtype,np.float32)
+        self.assertTrue(np.allclose(values,make_signal('float32').calculate_array(t),atol=1e-4))
+        self.assertEqual(make_signal().compile().calculate_array(t).dtype,np.float64)
+
+    def test_immutable(self):
+        plan = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=1).compile()
+        self.assertEqual(plan.sample_type(),'NORMAL')
+        with self.assertRaises(AttributeError):
+            plan._baseline = None
+        with self.assertRaises(ValueError):
+            plan._baseline[0] = 2
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from signals.signal import Signal
+from signals.export import export_samples
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+def make_signals():
+    normal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=0.1,seed=1)
+    perturbed = Signal(amp=2,per=1,phas=0,trans=0,mean=0,std=0.1,seed=2)
+    perturbed.add_perturbation(Perturbation(t0=1,support=2,strength=1))
+    perturbed.add_perturbation(SpikePerturbation(t0=5,support=1,strength=4,position=5.5,width=0.2))
+    return {'a':normal,'b':perturbed}
+
+@unittest.skipIf(pyarrow is None,"pyarrow is not installed")
+class TestExport(unittest.TestCase):
+
+    def test_parquet(self):
+        with tempfile.TemporaryDirectory() as directory:
+            written = export_samples(make_signals(),directory,t0=0,t1=10,n=1000,window=2.5,chunk_size=64)
+            self.assertEqual(len(written),9)
+            table = pyarrow.parquet.read_table(os.path.join(directory,'signal_id=b','window=0','part-0.parquet'))
+            self.assertEqual(table.column_names,['t','signal','type'])
+            self.assertEqual(table.num_rows,250)
+            self.assertEqual(set(table.column('type').to_pylist()),{'PERT'})
+
+            ranges = pyarrow.parquet.read_table(os.path.join(directory,'_perturbations.parquet')).to_pydict()
+            self.assertEqual(written[-1],os.path.join(directory,'_perturbations.parquet'))
+            self.assertEqual(ranges['signal_id'],['b','b'])
+            self.assertEqual(ranges['perturbation'],[0,1])
+            t = make_signals()['b']._arithmetic_grid(0,10,1000)
+            labels = make_signals()['b'].calculate_array_with_labels(t)[1]
+            self.assertEqual(ranges['start'],labels.starts.tolist())
+            self.assertEqual(ranges['stop'],labels.stops.tolist())
+            self.assertEqual(ranges['t_first'],t[labels.starts].tolist())
+            self.assertEqual(ranges['t_last'],t[labels.stops - 1].tolist())
+
+            expected_signal = make_signals()['b']
+            expected = expected_signal.calculate_array(expected_signal._arithmetic_grid(0,10,1000))
+            parts = [pyarrow.parquet.read_table(os.path.join(directory,'signal_id=b','window={}'.format(k),'part-0.parquet'))
+                     for k in range(4)]
+            values = np.concatenate([part.column('signal').to_numpy() for part in parts])
+            self.assertTrue(np.array_equal(values,expected))
+
+    def test_arrow(self):
+        with tempfile.TemporaryDirectory() as directory:
+            written = export_samples(list(make_signals().values()),directory,t0=0,t1=10,n=100,file_format='arrow')
+            self.assertEqual(len(written),3)
+            with pyarrow.ipc.open_file(os.path.join(directory,'signal_id=0','window=0','part-0.arrow')) as reader:
+                table = reader.read_all()
+            self.assertEqual(table.column_names,['t','signal','type'])
+            self.assertEqual(table.num_rows,100)
+            with pyarrow.ipc.open_file(os.path.join(directory,'_perturbations.arrow')) as reader:
+                ranges = reader.read_all()
+            self.assertEqual(ranges.column('signal_id').to_pylist(),['1','1'])
+            self.assertRaises(ValueError,export_samples,[],directory,file_format='csv')
+
+if __name__ == '__main__':
+    unittest.main()
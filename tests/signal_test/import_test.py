@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import signals
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_SCRIPT = """
+import json,sys,time
+start = time.perf_counter()
+import signals
+package_modules = sorted(name for name in sys.modules if name.split('.')[0] in ('numpy','pandas'))
+from signals import Signal
+signal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=1,seed=1)
+signal.calculate(0.5)
+signal.calculate_array([0.1,0.2])
+elapsed = time.perf_counter() - start
+loaded = sorted(sys.modules)
+signal.create_arithmetic_sample(0,1)
+print(json.dumps({'elapsed':elapsed,'package_modules':package_modules,'loaded':loaded,
+                  'pandas_after_sample':'pandas' in sys.modules}))
+"""
+
+class TestImports(unittest.TestCase):
+
+    _TIME_BUDGET = 2.0
+    """
+    Seconds allowed to import signals and evaluate a signal in a fresh interpreter (pandas alone
+    usually takes longer than numpy and the package together).
+    """
+
+    def test_lazy_imports(self):
+        output = subprocess.run([sys.executable,'-c',_SCRIPT],cwd=_ROOT,check=True,
+                                stdout=subprocess.PIPE,universal_newlines=True).stdout
+        report = json.loads(output)
+        self.assertEqual(report['package_modules'],[])
+        loaded = set(report['loaded'])
+        for module in ['pandas','asyncio','concurrent.futures','signals.batch','signals.export',
+                       'signals.sample_store','signals.bench','multiprocessing']:
+            self.assertNotIn(module,loaded)
+        self.assertTrue(report['pandas_after_sample'])
+        self.assertLess(report['elapsed'],self._TIME_BUDGET)
+
+    def test_exports(self):
+        from signals.signal import Signal
+        from signals.perturbations.spike_perturbation import SpikePerturbation
+        self.assertIs(signals.Signal,Signal)
+        self.assertIs(signals.SpikePerturbation,SpikePerturbation)
+        self.assertIn('SampleStore',dir(signals))
+        self.assertRaises(AttributeError,getattr,signals,'NotAClass')
+        for name in signals.__all__:
+            self.assertTrue(hasattr(signals,name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+import warnings
+import numpy as np
+
+from signals.signal import Signal
+from signals.sample_cache import SampleCache
+from signals.instrumentation import Instrumentation
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+def make_signal():
+    test_signal = Signal(amp=2,per=1,phas=0,trans=0,mean=0,std=0.1,seed=3,sample_size=1000)
+    test_signal.add_perturbation(Perturbation(t0=1,support=2,strength=1))
+    test_signal.add_perturbation(SpikePerturbation(t0=4,support=2,strength=3,position=5,width=0.5))
+    return test_signal
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_counters(self):
+        test_signal = make_signal()
+        with test_signal.instrument() as stats:
+            test_signal.create_arithmetic_sample(0,10)
+            blocks = list(test_signal.iter_arithmetic_sample(0,10,n=1000,chunk_size=300))
+            test_signal.calculate(1.5)
+        self.assertIsNone(test_signal._instrumentation)
+        counters = stats.counters()
+        self.assertEqual(counters['points'],2001)
+        self.assertEqual(counters['chunks'],len(blocks))
+        self.assertEqual(counters['errors'],0)
+        components = counters['components']
+        self.assertEqual(set(components),{'BaseLine','Noise','Perturbation','SpikePerturbation'})
+        self.assertEqual(components['BaseLine']['calls'],1 + len(blocks) + 1)
+        self.assertEqual(components['BaseLine']['points'],2001)
+        self.assertEqual(components['Perturbation']['points'],2*199 + 1)
+        self.assertTrue(all(entry['seconds'] >= 0 for entry in components.values()))
+        test_signal.calculate(2.5)
+        self.assertEqual(stats.counters()['points'],2001)
+
+    def test_same_values(self):
+        t = np.linspace(0,10,500)
+        test_signal = make_signal()
+        with test_signal.instrument():
+            values = test_signal.calculate_array(t)
+        self.assertTrue(np.array_equal(values,make_signal().calculate_array(t)))
+
+    def test_cache_and_json(self):
+        t = np.linspace(0,10,500)
+        stats = Instrumentation()
+        test_signal = Signal(amp=2,per=1,phas=0,trans=0,mean=0,std=0.1,seed=3)
+        test_signal.set_cache(SampleCache())
+        test_signal.set_instrumentation(stats)
+        test_signal.calculate_array(t)
+        test_signal.calculate_array(t)
+        counters = stats.counters()
+        self.assertEqual(counters['cache_hits'],1)
+        self.assertEqual(counters['cache_misses'],3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory,'stats.json')
+            text = stats.to_json(path)
+            with open(path,'r',encoding='utf-8') as stats_file:
+                self.assertEqual(json.load(stats_file),json.loads(text))
+        stats.reset()
+        self.assertEqual(stats.counters()['points'],0)
+
+    def test_errors(self):
+        test_signal = make_signal()
+        with test_signal.instrument() as stats:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                self.assertIsNone(test_signal.calculate('a'))
+        self.assertEqual(len(caught),1)
+        self.assertTrue(issubclass(caught[0].category,RuntimeWarning))
+        counters = stats.counters()
+        self.assertEqual(counters['errors'],1)
+        self.assertEqual(counters['components']['BaseLine']['errors'],1)
+
+
+if __name__ == '__main__':
+    unittest.main()
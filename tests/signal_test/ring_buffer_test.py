@@ -0,0 +1,73 @@
+import tracemalloc
+import unittest
+import numpy as np
+
+from signals.signal import Signal
+from signals.ring_buffer import SignalRingBuffer
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+def make_signal():
+    test_signal = Signal(amp=2,per=1,phas=0,trans=0,mean=0,std=0.1,seed=9)
+    test_signal.add_perturbation(SpikePerturbation(t0=4,support=2,strength=3,position=5,width=0.5))
+    return test_signal
+
+class TestSignalRingBuffer(unittest.TestCase):
+
+    def test_window(self):
+        t = np.arange(1000)*0.01 + 1
+        expected = make_signal().calculate_array(t)
+        buffer = make_signal().create_ring_buffer(300,0.01,t0=1)
+        self.assertEqual(len(buffer),0)
+        advanced = 0
+        for n in [50,170,0,333,1,446]:
+            buffer.advance(n)
+            advanced += n
+            self.assertEqual(buffer.count,advanced)
+            self.assertEqual(len(buffer),min(300,advanced))
+            window_t,window_values = buffer.window()
+            self.assertTrue(np.array_equal(window_t,t[advanced - len(buffer):advanced]))
+            self.assertTrue(np.array_equal(window_values,expected[advanced - len(buffer):advanced]))
+
+    def test_views(self):
+        buffer = SignalRingBuffer(make_signal(),100,0.1)
+        buffer.advance(150)
+        views = buffer.views()
+        self.assertEqual(len(views),2)
+        self.assertEqual([t.size for t,values in views],[50,50])
+        for t,values in views:
+            self.assertTrue(np.shares_memory(values,buffer._values))
+            self.assertFalse(values.flags.writeable)
+        self.assertEqual(views[0][0][0],5.0)
+        buffer.advance(50)
+        self.assertEqual(len(buffer.views()),1)
+        self.assertTrue(buffer._values.flags.writeable)
+
+    def test_inPlace(self):
+        buffer = make_signal().create_ring_buffer(100000,0.001)
+        buffer.advance(1000)
+        tracemalloc.start()
+        try:
+            buffer.advance(200000)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak,100000*8/4)
+        t = np.arange(201000)*0.001
+        self.assertTrue(np.array_equal(buffer.window()[1],make_signal().calculate_array(t)[-100000:]))
+        float32_buffer = make_signal().create_ring_buffer(300,0.01,dtype='float32')
+        float32_buffer.advance(1000)
+        expected = make_signal().calculate_array(np.arange(1000)*0.01,'float32')
+        self.assertTrue(np.array_equal(float32_buffer.window()[1],expected[-300:]))
+
+    def test_errors(self):
+        self.assertRaises(ValueError,SignalRingBuffer,make_signal(),0,0.1)
+        self.assertRaises(ValueError,SignalRingBuffer,make_signal(),10,-1)
+        self.assertRaises(TypeError,SignalRingBuffer,make_signal(),10.0,0.1)
+        self.assertRaises(ValueError,SignalRingBuffer(make_signal(),10,0.1).advance,-1)
+        float32_buffer = SignalRingBuffer(make_signal(),10,0.1,dtype='float32')
+        float32_buffer.advance(25)
+        self.assertEqual(float32_buffer.window()[1].dtype,np.float32)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from signals.signal import Signal
+from signals.sample_cache import SampleCache
+from signals.functions.colored_noise import AR1Noise
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+def make_signal(seed=5):
+    test_signal = Signal(amp=2,per=3,phas=0,trans=1,mean=0,std=0.2,seed=seed)
+    test_signal.add_perturbation(Perturbation(t0=1,support=2,strength=1))
+    test_signal.add_perturbation(SpikePerturbation(t0=4,support=2,strength=5,position=5,width=0.3))
+    return test_signal
+
+class TestSampleCache(unittest.TestCase):
+
+    def test_seededHits(self):
+        t = np.linspace(0,10,1000)
+        uncached = make_signal()
+        expected = [uncached.calculate_array(t),uncached.calculate_array(t)]
+        cache = SampleCache()
+        first = make_signal()
+        first.set_cache(cache)
+        self.assertTrue(np.array_equal(first.calculate_array(t),expected[0]))
+        self.assertEqual((cache.hits,cache.misses),(0,4))
+        second = make_signal()
+        second.set_cache(cache)
+        self.assertTrue(np.array_equal(second.calculate_array(t),expected[0]))
+        self.assertEqual((cache.hits,cache.misses),(4,4))
+        self.assertTrue(np.array_equal(second.calculate_array(t),expected[1]))
+        self.assertTrue(np.array_equal(first.calculate_array(t),expected[1]))
+
+    def test_addPerturbation(self):
+        t = np.linspace(0,10,1000)
+        cache = SampleCache()
+        test_signal = make_signal(seed=None)
+        test_signal.set_cache(cache)
+        test_signal.calculate_array(t)
+        self.assertEqual(len(cache),2)
+        test_signal.add_perturbation(Perturbation(t0=7,support=1,strength=2))
+        values = test_signal.calculate_array(t)
+        self.assertEqual((cache.hits,cache.misses),(2,3))
+        self.assertEqual(len(cache),3)
+        values[0] = 100
+        self.assertFalse(np.array_equal(test_signal.calculate_array(t),values))
+
+    def test_boundsAndDisk(self):
+        t = np.linspace(0,10,1000)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SampleCache(max_bytes=10000,directory=directory)
+            test_signal = make_signal()
+            test_signal.set_cache(cache)
+            test_signal.calculate_array(t)
+            self.assertLessEqual(cache.nbytes,10000)
+            self.assertLess(len(cache),4)
+            disk_cache = SampleCache(directory=directory)
+            fresh = make_signal()
+            fresh.set_cache(disk_cache)
+            self.assertTrue(np.array_equal(fresh.calculate_array(t),make_signal().calculate_array(t)))
+            self.assertEqual(disk_cache.misses,0)
+            names = os.listdir(directory)
+            self.assertFalse([name for name in names if not name.endswith(('.npy','.json'))])
+
+    def test_diskEntries(self):
+        t = np.linspace(0,10,1000)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SampleCache(directory=directory)
+            noise = AR1Noise(mean=0,std=1,phi=0.5,seed=2)
+            first = cache.evaluate(noise,t)
+            key = cache.key(AR1Noise(mean=0,std=1,phi=0.5,seed=2).cache_token(),t)
+            replay = AR1Noise(mean=0,std=1,phi=0.5,seed=2)
+            self.assertTrue(np.array_equal(SampleCache(directory=directory).evaluate(replay,t),first))
+            self.assertTrue(np.allclose(replay.calculate_array(t),noise.calculate_array(t)))
+            with open(os.path.join(directory,key + '.npy'),'r+b') as entry_file:
+                entry_file.truncate(100)
+            broken = SampleCache(directory=directory)
+            self.assertIsNone(broken.get(key))
+            self.assertEqual(broken.misses,1)
+            with open(os.path.join(directory,key + '.json'),'w') as state_file:
+                state_file.write('{')
+            self.assertIsNone(SampleCache(directory=directory).get(key))
+
+if __name__ == '__main__':
+    unittest.main()
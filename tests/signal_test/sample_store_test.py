@@ -0,0 +1,89 @@
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from signals.signal import Signal
+from signals.sample_store import SampleStore
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+def make_signal():
+    test_signal = Signal(amp=2,per=3,phas=0,trans=1,mean=0,std=0.2,seed=17)
+    test_signal.add_perturbation(SpikePerturbation(t0=1,support=2,strength=5,position=1.5,width=0.3))
+    return test_signal
+
+class TestSampleStore(unittest.TestCase):
+
+    def test_writeAndOpen(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory,'store')
+            store = SampleStore(path)
+            self.assertEqual(len(store),0)
+            self.assertEqual(len(store.open()[0]),0)
+            test_signal = make_signal()
+            store.write_arithmetic_sample(test_signal,0,4,1000,chunk_size=128)
+            size = os.path.getsize(os.path.join(path,'signal.npy'))
+            store.write_arithmetic_sample(test_signal,4,8,1000,chunk_size=300)
+            self.assertEqual(os.path.getsize(os.path.join(path,'signal.npy')),size + 8000)
+
+            expected_signal = make_signal()
+            t = np.concatenate([expected_signal._arithmetic_grid(0,4,1000),expected_signal._arithmetic_grid(4,8,1000)])
+            expected = expected_signal.calculate_array(t)
+            t_column,values = SampleStore(path).open()
+            self.assertIsInstance(values,np.memmap)
+            self.assertTrue(np.array_equal(t_column,t))
+            self.assertTrue(np.array_equal(values,expected))
+            self.assertTrue(np.array_equal(np.load(os.path.join(path,'t.npy')),t))
+            self.assertEqual(len(SampleStore(path)),2000)
+
+    def test_dtype(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = SampleStore(directory,dtype=np.float32)
+            store.append([0,1,2],[0.5,1.5,2.5])
+            store = SampleStore(directory)
+            store.append([3],[3.5])
+            t,values = store.open()
+            self.assertEqual(values.dtype,np.float32)
+            self.assertEqual(list(values),[0.5,1.5,2.5,3.5])
+            self.assertRaises(ValueError,store.append,[1,2],[1])
+
+    def test_openSavedColumns(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory,'store')
+            os.makedirs(path)
+            np.save(os.path.join(path,'t.npy'),np.arange(10.0))
+            np.save(os.path.join(path,'signal.npy'),np.arange(10.0)*2)
+            store = SampleStore(path)
+            self.assertEqual(len(store),10)
+            store.append(np.arange(10.0,15.0),np.arange(10.0,15.0)*2)
+            self.assertTrue(np.array_equal(np.load(os.path.join(path,'t.npy')),np.arange(15.0)))
+            self.assertTrue(np.array_equal(SampleStore(path).open()[1],np.arange(15.0)*2))
+
+    def test_rejectsColumns(self):
+        def check(t_column):
+            with tempfile.TemporaryDirectory() as directory:
+                with open(os.path.join(directory,'t.npy'),'wb') as column_file:
+                    t_column(column_file)
+                np.save(os.path.join(directory,'signal.npy'),np.zeros(6))
+                self.assertRaises(ValueError,SampleStore,directory)
+        check(lambda column_file: np.save(column_file,np.zeros((2,3))))
+        check(lambda column_file: np.save(column_file,np.asfortranarray(np.zeros((2,3)))))
+        check(lambda column_file: np.lib.format.write_array(column_file,np.zeros(6),version=(2,0)))
+        def long_header(column_file):
+            header = "{'descr': '<f8', 'fortran_order': False, 'shape': (6,), }".ljust(181) + '\n'
+            column_file.write(b'\x93NUMPY\x01\x00' + (182).to_bytes(2,'little') + header.encode('latin1'))
+            column_file.write(np.zeros(6).tobytes())
+        buffer = io.BytesIO()
+        long_header(buffer)
+        buffer.seek(0)
+        self.assertEqual(np.load(buffer).shape,(6,))
+        check(long_header)
+        with tempfile.TemporaryDirectory() as directory:
+            np.save(os.path.join(directory,'t.npy'),np.zeros(6))
+            np.save(os.path.join(directory,'signal.npy'),np.zeros(6,dtype=np.float32))
+            self.assertRaises(ValueError,SampleStore,directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
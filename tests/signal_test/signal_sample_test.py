@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+
+from signals.signal import Signal
+from signals.functions.baseline import BaseLine
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.step_perturbation import StepPerturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+
+def make_perturbations():
+    return [StepPerturbation(t0=2,support=3,strength=3,step=3.5,dir=1),
+            SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8),
+            Perturbation(t0=4,support=0.5,strength=2),
+            BaseLine(amp=0.2,per=4,phas=0,trans=0)]
+
+class TestSignalSample(unittest.TestCase):
+
+    def test_incrementalEdits(self):
+        test_signal = Signal(amp=4,per=1.5,phas=0,trans=2,mean=0.15,std=0.1,seed=3,sample_size=2000)
+        sample = test_signal.create_incremental_sample(t0=0,t1=10)
+        type,frame = sample.to_frame()
+        self.assertEqual(type,'NORMAL')
+        perturbations = make_perturbations()
+        previous = sample.values.copy()
+        block = sample.add_perturbation(perturbations[0])
+        changed = np.flatnonzero(sample.values != previous)
+        self.assertTrue(np.array_equal(changed,np.arange(block.start,block.stop)))
+        for pert in perturbations[1:]:
+            sample.add_perturbation(pert)
+
+        expected_signal = Signal(amp=4,per=1.5,phas=0,trans=2,mean=0.15,std=0.1,seed=3,sample_size=2000)
+        for pert in make_perturbations():
+            expected_signal.add_perturbation(pert)
+        type,expected = expected_signal.create_arithmetic_sample(t0=0,t1=10)
+        self.assertEqual(len(test_signal._perturbations),4)
+        self.assertTrue(np.allclose(sample.values,expected['signal'].to_numpy()))
+        self.assertTrue(np.allclose(sample.baseline + sample.noise + sample.perturbation_sum,sample.values))
+        type,frame = sample.to_frame()
+        self.assertEqual(type,'PERT')
+        self.assertEqual(len(frame),len(sample))
+        with self.assertRaises(ValueError):
+            sample.values[0] = 1
+
+if __name__ == '__main__':
+    unittest.main()
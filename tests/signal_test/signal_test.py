@@ -1,7 +1,15 @@
+import time
+import asyncio
 import unittest
+from unittest import mock
+import warnings
+import numpy as np
 
 from signals.signal import Signal
+from signals.functions.colored_noise import AR1Noise, BrownNoise
+from signals.functions.harmonic_bank import HarmonicBank
 from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.support_index import SupportIndex
 from signals.perturbations.step_perturbation import StepPerturbation
 from signals.perturbations.spike_perturbation import SpikePerturbation
 
@@ -12,14 +20,37 @@ trans = [0,0.1,0.15,0.25]
 means = [0,1,2,3,4]
 stds = [1,2,3,4,5]
 
+class FakeClock:
+    """
+    Stands in for the time module (and the clock of an event loop): sleeping advances the clock by
+    the requested delay plus a fixed oversleep, like a real scheduler that always wakes up late.
+    """
+    def __init__(self,oversleep:float=0):
+        self.now = 100.0
+        self.oversleep = oversleep
+        self.sleeps = []
+
+    def monotonic(self)->float:
+        return self.now
+
+    def time(self)->float:
+        return self.now
+
+    def sleep(self,delay:float):
+        self.sleeps.append(delay)
+        self.now += delay + self.oversleep
+
+    async def async_sleep(self,delay:float):
+        self.sleep(delay)
+
 class TestSignal(unittest.TestCase):
     def test_createSignal(self):
         for a,p,ph,t,mu,sigma in zip(amps,pers,phases,trans,means,stds):
             test_signal = Signal(amp=a,per=p,phas=ph,trans=t,mean=mu,std=sigma)
             base_dict = {'_amplitude': a, '_period': p, '_phase': ph, '_translation': t}
             noise_dict = {'_mean':mu,'_deviation':sigma}
-            self.assertEqual(test_signal._baseline.__dict__,base_dict)
-            self.assertEqual(test_signal._noise.__dict__,noise_dict)
+            self.assertEqual(test_signal._baseline.get_parameters(),base_dict)
+            self.assertEqual(test_signal._noise.get_parameters(),noise_dict)
             self.assertEqual(test_signal._perturbations,None)
 
     def test_addPerturbation(self):
@@ -41,6 +72,307 @@ class TestSignal(unittest.TestCase):
         self.assertEqual(len(sample),100)
         sample.to_csv('test_spike_senal.csv',index=False)
 
+    def test_arithmetic_sample_grid(self):
+        test_signal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=1,sample_size=10**6)
+        type,sample = test_signal.create_arithmetic_sample(t0=2,t1=4)
+        self.assertEqual(type,'NORMAL')
+        self.assertEqual(list(sample.columns),['t','signal'])
+        self.assertEqual(len(sample),10**6)
+        self.assertEqual(sample['t'].iloc[0],2)
+        self.assertAlmostEqual(sample['t'].iloc[-1],4-2/10**6)
+        self.assertRaises(ValueError,test_signal.create_arithmetic_sample,1,1)
+
+    def test_calculate_array(self):
+        test_signal = Signal(amp=4,per=1.5,phas=0,trans=2,mean=0,std=1)
+        test_signal.add_perturbation(Perturbation(t0=2,support=3,strength=3))
+        t = np.linspace(0,10,1000)
+        np.random.seed(7)
+        values = test_signal.calculate_array(t)
+        np.random.seed(7)
+        noise = np.random.normal(loc=0,scale=1,size=t.shape)
+        expected = 4*np.sin(1.5*t)+2+noise+np.where((t > 2) & (t < 5),3,0)
+        self.assertTrue(np.allclose(values,expected))
+
+    def test_iter_arithmetic_sample(self):
+        test_signal = Signal(amp=2,per=3,phas=0.5,trans=1,mean=0,std=0.5,sample_size=1000)
+        np.random.seed(11)
+        type,sample = test_signal.create_arithmetic_sample(t0=1,t1=3)
+        np.random.seed(11)
+        blocks = list(test_signal.iter_arithmetic_sample(t0=1,t1=3,n=1000,chunk_size=64))
+        self.assertEqual(len(blocks),16)
+        self.assertTrue(all(len(t) <= 64 for t,values in blocks))
+        t = np.concatenate([t for t,values in blocks])
+        values = np.concatenate([values for t,values in blocks])
+        self.assertTrue(np.array_equal(t,sample['t'].to_numpy()))
+        self.assertTrue(np.array_equal(values,sample['signal'].to_numpy()))
+        self.assertRaises(ValueError,next,test_signal.iter_arithmetic_sample(1,3,n=10,chunk_size=0))
+
+    def test_seeded_signal(self):
+        def make_signal():
+            test_signal = Signal(amp=4,per=1.5,phas=0,trans=2,mean=0.15,std=0.1,seed=1234,sample_size=1000)
+            test_signal.add_perturbation(StepPerturbation(t0=2,support=3,strength=3,step=3.5,dir=1))
+            test_signal.add_perturbation(SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8))
+            return test_signal
+        state = np.random.get_state()[1].copy()
+        type,sample = make_signal().create_arithmetic_sample(t0=0,t1=10)
+        self.assertTrue(np.array_equal(np.random.get_state()[1],state))
+        blocks = make_signal().iter_arithmetic_sample(t0=0,t1=10,n=1000,chunk_size=37)
+        values = np.concatenate([values for t,values in blocks])
+        self.assertTrue(np.array_equal(values,sample['signal'].to_numpy()))
+        pointwise_signal = make_signal()
+        pointwise = [pointwise_signal.calculate(float(t)) for t in sample['t']]
+        self.assertTrue(np.allclose(pointwise,sample['signal'].to_numpy()))
+        other_type,other_sample = Signal(amp=4,per=1.5,mean=0.15,std=0.1,seed=4321,
+                                         sample_size=1000).create_arithmetic_sample(t0=0,t1=10)
+        self.assertFalse(np.array_equal(other_sample['signal'].to_numpy(),sample['signal'].to_numpy()))
+        reseeded = Signal(amp=4,per=1.5,phas=0,trans=2,mean=0.15,std=0.1,sample_size=1000)
+        reseeded.add_perturbation(StepPerturbation(t0=2,support=3,strength=3,step=3.5,dir=1,seed=5))
+        reseeded.add_perturbation(SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8,seed=6))
+        reseeded.set_seed(1234)
+        type,reseeded_sample = reseeded.create_arithmetic_sample(t0=0,t1=10)
+        self.assertTrue(np.array_equal(reseeded_sample['signal'].to_numpy(),sample['signal'].to_numpy()))
+
+    def test_from_specs(self):
+        specs = [{'amp':4,'per':1.5,'phas':0,'trans':2,'mean':0.15,'std':0.1,'sample_size':1000,'seed':7},
+                 {'amp':1,'per':2,'mean':0,'std':1,'seed':8,
+                  'perturbations':[StepPerturbation(t0=2,support=3,strength=3,step=3.5,dir=1)]},
+                 {'amp':2.5,'std':0.3}]
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            signals = Signal.from_specs(specs)
+        self.assertEqual(len(caught),0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            expected = [Signal(**{key:value for key,value in spec.items() if key != 'perturbations'}) for spec in specs]
+        expected[1].add_perturbation(StepPerturbation(t0=2,support=3,strength=3,step=3.5,dir=1))
+        t = np.linspace(0,10,500)
+        for signal,other in zip(signals,expected):
+            self.assertEqual(signal._baseline.get_parameters(),other._baseline.get_parameters())
+            self.assertEqual(signal._noise.get_parameters(),other._noise.get_parameters())
+            self.assertEqual(signal._sample_size,other._sample_size)
+        for signal,other in zip(signals[:2],expected[:2]):
+            self.assertTrue(np.array_equal(signal.calculate_array(t),other.calculate_array(t)))
+        columns = {'amp':[4,1],'per':[1.5,2],'std':[0.1,-1]}
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            table = Signal.from_specs(columns)
+        self.assertEqual(len(caught),1)
+        self.assertEqual([signal._noise._deviation for signal in table],[0.1,1])
+        self.assertEqual(Signal.from_spec({'amp':3})._baseline._amplitude,3)
+        self.assertRaises(TypeError,Signal.from_specs,[{'amp':1},{'amp':'1'}])
+        self.assertRaises(TypeError,Signal.from_specs,{'std':[1,None]})
+        self.assertRaises(TypeError,Signal.from_specs,[{'amp':1},{'amp':True}])
+        self.assertRaises(TypeError,Signal.from_specs,[{'amp':np.float64(1)}])
+        self.assertRaises(TypeError,Signal,amp=np.float64(1))
+        arrays = Signal.from_specs({'amp':np.array([1.0,2.0]),'std':np.array([1,2])})
+        self.assertEqual([type(signal._baseline._amplitude) for signal in arrays],[float,float])
+
+    def test_float32_sample(self):
+        def make_signal(dtype=None):
+            test_signal = Signal(amp=4,per=1.5,phas=0.3,trans=2,mean=0.15,std=0.1,seed=12,sample_size=1000,dtype=dtype)
+            test_signal.add_perturbation(Perturbation(t0=1,support=1,strength=2))
+            test_signal.add_perturbation(StepPerturbation(t0=2,support=3,strength=3,step=3.5,dir=1))
+            test_signal.add_perturbation(SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8))
+            return test_signal
+        type,sample = make_signal(np.float32).create_arithmetic_sample(t0=0,t1=10)
+        self.assertEqual(list(sample.dtypes),[np.float32,np.float32])
+        blocks = list(make_signal(np.float32).iter_arithmetic_sample(t0=0,t1=10,n=1000,chunk_size=37))
+        self.assertTrue(all(t.dtype == np.float32 and values.dtype == np.float32 for t,values in blocks))
+        values = np.concatenate([values for t,values in blocks])
+        self.assertTrue(np.array_equal(values,sample['signal'].to_numpy()))
+        other = make_signal().calculate_array(sample['t'].to_numpy(),dtype='float32')
+        self.assertTrue(np.array_equal(other,values))
+        type,double = make_signal().create_arithmetic_sample(t0=0,t1=10)
+        self.assertEqual(double['signal'].dtype,np.float64)
+        self.assertRaises(ValueError,Signal,amp=1,dtype=np.int64)
+        self.assertRaises(TypeError,make_signal().calculate_array,[1,2],dtype='not a dtype')
+
+    def test_threaded_sample(self):
+        def make_signal():
+            test_signal = Signal(amp=4,per=1.5,phas=0.3,trans=2,mean=0.15,std=0.1,seed=21,sample_size=5000)
+            test_signal.add_perturbation(Perturbation(t0=1,support=1,strength=2))
+            test_signal.add_perturbation(SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8))
+            test_signal._THREAD_BLOCK_SIZE = 128
+            return test_signal
+        samples = [make_signal().create_arithmetic_sample(t0=0,t1=10,labels=True,threads=threads)
+                   for threads in [1,2,4]]
+        for type,sample,labels in samples[1:]:
+            self.assertTrue(np.array_equal(sample['signal'].to_numpy(),samples[0][1]['signal'].to_numpy()))
+            self.assertTrue(np.array_equal(labels.to_dense(),samples[0][2].to_dense()))
+        type,sample,labels = make_signal().create_arithmetic_sample(t0=0,t1=10,labels=True)
+        self.assertTrue(np.array_equal(labels.to_dense(),samples[0][2].to_dense()))
+        test_signal = make_signal()
+        first = test_signal.calculate_array(sample['t'].to_numpy(),threads=3)
+        second = test_signal.calculate_array(sample['t'].to_numpy(),threads=3)
+        self.assertFalse(np.array_equal(first,second))
+        blocks = [np.concatenate([values for t,values in make_signal().iter_arithmetic_sample(0,10,5000,700,threads=threads)])
+                  for threads in [1,3]]
+        self.assertTrue(np.array_equal(blocks[0],blocks[1]))
+        self.assertRaises(ValueError,make_signal().calculate_array,[1,2],threads=0)
+        self.assertRaises(TypeError,make_signal().calculate_array,[1,2],threads=1.5)
+
+    def test_threaded_many_perturbations(self):
+        def make_signal():
+            test_signal = Signal(amp=4,per=1.5,phas=0.3,trans=2,mean=0.15,std=0.1,seed=21)
+            for t0 in np.linspace(0,10,300).tolist():
+                test_signal.add_perturbation(SpikePerturbation(t0=t0,support=0.02,strength=3,position=t0+0.01,width=0.005))
+            test_signal._THREAD_BLOCK_SIZE = 128
+            return test_signal
+        t = make_signal()._arithmetic_grid(0,10,5000)
+        supports = [per.support_slice(t) for per in make_signal()._perturbations]
+        spanning = sum(1 for block in supports if block.stop > block.start and (block.stop - 1)//128 > block.start//128)
+        test_signal = make_signal()
+        block_bit_generator = Signal._block_bit_generator
+        with mock.patch.object(Signal,'_block_bit_generator',autospec=True,side_effect=block_bit_generator) as bases, \
+             mock.patch.object(SupportIndex,'query_with_order',autospec=True,
+                               side_effect=SupportIndex.query_with_order) as queries:
+            values = test_signal.calculate_array(t,threads=2)
+        self.assertEqual(queries.call_count,1)
+        self.assertEqual(bases.call_count,spanning + 1)
+        self.assertLess(spanning,30)
+        self.assertTrue(np.array_equal(values,make_signal().calculate_array(t,threads=4)))
+        shuffled = np.random.default_rng(0).permutation(t)
+        self.assertTrue(np.array_equal(make_signal().calculate_array(shuffled,threads=1),
+                                       make_signal().calculate_array(shuffled,threads=3)))
+
+    def test_coloredNoise(self):
+        def make_signal():
+            test_signal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=1,seed=8,sample_size=5000)
+            test_signal.set_noise(AR1Noise(mean=0,std=0.3,phi=0.9))
+            test_signal.add_perturbation(SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8))
+            test_signal._THREAD_BLOCK_SIZE = 128
+            return test_signal
+        self.assertTrue(make_signal()._noise.is_seeded())
+        t = make_signal()._arithmetic_grid(0,10,5000)
+        single = make_signal().calculate_array(t)
+        blocks = np.concatenate([values for t,values in make_signal().iter_arithmetic_sample(0,10,5000,700)])
+        self.assertTrue(np.allclose(blocks,single))
+        first = make_signal().calculate_array(t,threads=1)
+        self.assertTrue(np.array_equal(first,make_signal().calculate_array(t,threads=3)))
+        self.assertRaises(TypeError,make_signal().set_noise,0.5)
+        test_signal = make_signal()
+        self.assertAlmostEqual(test_signal.stats(0,10)['noise_std'],0.3)
+        test_signal.set_noise(BrownNoise(mean=0,std=1))
+        self.assertRaises(TypeError,test_signal.stats,0,10)
+
+    def test_harmonicBaseline(self):
+        bank = HarmonicBank(amp=[1,0.5,0.25],per=[1,2,4],phas=[0,0.3,0.6],trans=2)
+        def make_signal(dtype=None):
+            test_signal = Signal(amp=5,per=1,phas=0,trans=0,mean=0,std=0.1,seed=8,dtype=dtype)
+            test_signal.set_baseline(bank)
+            return test_signal
+        t = make_signal()._arithmetic_grid(0,10,2000)
+        values,labels = make_signal().calculate_array_with_labels(t)
+        self.assertEqual(labels.shape,(2000,0))
+        self.assertTrue(np.allclose(values,make_signal().compile().calculate_array(t)))
+        self.assertLess(np.abs(values - bank.calculate_array(t)).max(),1)
+        self.assertAlmostEqual(make_signal().calculate(1.0),make_signal().compile().calculate(1.0))
+        self.assertTrue(np.allclose(make_signal('float32').compile().calculate_array(t),
+                                    make_signal('float32').calculate_array(t)))
+        self.assertEqual(make_signal().create_arithmetic_sample(0,10)[0],'NORMAL')
+        self.assertRaises(TypeError,make_signal().set_baseline,Perturbation())
+
+    def test_irregular_sample(self):
+        def make_signal():
+            test_signal = Signal(amp=4,per=1.5,phas=0.3,trans=2,mean=0.15,std=0.1,seed=8,sample_size=2000)
+            test_signal.add_perturbation(Perturbation(t0=1,support=1,strength=2))
+            test_signal.add_perturbation(SpikePerturbation(t0=6,support=3,strength=8,position=7.5,width=0.8))
+            return test_signal
+        timestamps = np.sort(np.random.default_rng(4).uniform(0,10,3000))
+        type,sample,labels = make_signal().create_irregular_sample(timestamps,labels=True)
+        self.assertEqual(type,'PERT')
+        self.assertTrue(np.array_equal(sample['t'].to_numpy(),timestamps))
+        self.assertTrue(np.array_equal(sample['signal'].to_numpy(),make_signal().calculate_array(timestamps)))
+        inside = (timestamps > 1) & (timestamps < 2)
+        self.assertTrue(np.array_equal(labels.to_dense()[:,0],inside))
+        self.assertRaises(ValueError,make_signal().create_irregular_sample,timestamps[::-1])
+        type,jittered = make_signal().create_jittered_sample(0,10,jitter=0.5,dropout=0.2,seed=1)
+        self.assertLess(len(jittered),2000)
+        self.assertTrue(np.all(np.diff(jittered['t'].to_numpy()) > 0))
+
+    def test_many_perturbations(self):
+        rng = np.random.default_rng(5)
+        perts = [Perturbation(t0=float(t0),support=float(s),strength=float(st))
+                 for t0,s,st in zip(rng.uniform(0,10,2000),rng.uniform(0,0.5,2000),rng.uniform(0,2,2000))]
+        def make_signal():
+            test_signal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=1,seed=3)
+            for pert in perts:
+                test_signal.add_perturbation(pert)
+            return test_signal
+        for t in [np.linspace(0,10,5000),rng.permutation(np.linspace(0,10,5000))]:
+            noise = make_signal()._noise.calculate_array(t)
+            expected = np.sin(t) + noise + sum(p.calculate_array(t) for p in perts)
+            self.assertTrue(np.allclose(make_signal().calculate_array(t),expected))
+        noise = make_signal()._noise.calculate(5.0)
+        expected = np.sin(5.0) + noise + sum(p.calculate(5.0) for p in perts)
+        self.assertAlmostEqual(make_signal().calculate(5.0),expected)
+
+    def test_time_sample(self):
+        test_signal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=0.1,sample_size=20)
+        start = time.monotonic()
+        type,sample = test_signal.create_time_sample(0.005)
+        self.assertGreaterEqual(time.monotonic()-start,20*0.005)
+        self.assertEqual(type,'NORMAL')
+        self.assertEqual(len(sample),20)
+        gaps = sample['t'].diff().dropna().dt.total_seconds()
+        self.assertTrue(np.allclose(gaps,0.005,atol=1e-6))
+        self.assertRaises(TypeError,test_signal.create_time_sample,'w')
+        self.assertRaises(ValueError,test_signal.create_time_sample,-1)
+        self.assertRaises(TypeError,next,test_signal.iter_time_sample(0.005,n=2.5))
+        self.assertRaises(ValueError,next,test_signal.iter_time_sample(0.005,n=0))
+
+    def test_time_sample_drift(self):
+        wait_time = 0.01
+        clock = FakeClock(oversleep=1e-3)
+        test_signal = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=0.1)
+        lateness = []
+        with mock.patch('signals.signal.time',clock):
+            ticks = test_signal.iter_time_sample(wait_time,n=40)
+            start = clock.now
+            for k,(timestamp,value) in enumerate(ticks,start=1):
+                lateness.append(clock.now - start - k*wait_time)
+                if k == 10:
+                    clock.now += 3*wait_time
+        lateness = np.array(lateness)
+        self.assertGreaterEqual(lateness.min(),0)
+        self.assertTrue(np.allclose(lateness[:10],1e-3))
+        self.assertTrue(np.allclose(lateness[13:],1e-3))
+        self.assertEqual(len(clock.sleeps),37)
+
+    def test_async_time_sample(self):
+        signals = [Signal(amp=k,per=1,phas=0,trans=0,mean=0,std=0.1) for k in range(50)]
+        async def consume(test_signal):
+            return [value async for timestamp,value in test_signal.aiter_time_sample(0.005,n=10)]
+        async def consume_all():
+            return await asyncio.gather(*[consume(test_signal) for test_signal in signals])
+        start = time.monotonic()
+        results = asyncio.run(consume_all())
+        self.assertLess(time.monotonic()-start,2)
+        self.assertEqual([len(values) for values in results],[10]*50)
+
+    def test_async_time_sample_drift(self):
+        wait_time = 0.01
+        clock = FakeClock(oversleep=1e-3)
+        lateness = []
+        with mock.patch('asyncio.get_running_loop',return_value=clock),mock.patch('asyncio.sleep',clock.async_sleep):
+            ticks = Signal(amp=1,per=1,phas=0,trans=0,mean=0,std=0.1).aiter_time_sample(wait_time,n=30)
+            start = clock.now
+            k = 0
+            while True:
+                try:
+                    ticks.__anext__().send(None)
+                except StopIteration:
+                    k += 1
+                    lateness.append(clock.now - start - k*wait_time)
+                    if k == 10:
+                        clock.now += 3*wait_time
+                except StopAsyncIteration:
+                    break
+        lateness = np.array(lateness)
+        self.assertEqual(len(lateness),30)
+        self.assertTrue(np.allclose(lateness[:10],1e-3))
+        self.assertTrue(np.allclose(lateness[13:],1e-3))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
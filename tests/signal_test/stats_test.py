@@ -0,0 +1,91 @@
+import unittest
+import warnings
+import numpy as np
+
+from signals.signal import Signal
+from signals.stats import signal_stats
+from signals.functions.function import Function
+from signals.functions.harmonic_bank import HarmonicBank
+from signals.perturbations.perturbation import Perturbation
+from signals.perturbations.spike_perturbation import SpikePerturbation
+from signals.perturbations.step_perturbation import StepPerturbation
+
+def make_signal(seed=1):
+    test_signal = Signal(amp=2,per=1.3,phas=0.4,trans=1,mean=0.5,std=0.3,seed=seed)
+    test_signal.add_perturbation(Perturbation(t0=1,support=2,strength=1.5))
+    test_signal.add_perturbation(SpikePerturbation(t0=2,support=3,strength=4,position=3,width=1))
+    test_signal.add_perturbation(StepPerturbation(t0=6,support=2,strength=2,step=7,dir=-1))
+    return test_signal
+
+class TestStats(unittest.TestCase):
+
+    def test_against_sampling(self):
+        test_signal = make_signal()
+        stats = test_signal.stats(0,10)
+        t = (np.arange(2000000) + 0.5)*5e-6
+        values = test_signal.calculate_array(t)
+        self.assertAlmostEqual(stats['mean'],values.mean(),delta=0.01)
+        self.assertAlmostEqual(stats['var'],values.var(),delta=0.02)
+        self.assertAlmostEqual(stats['std']**2,stats['var'])
+        self.assertEqual(stats['noise_std'],0.3)
+        self.assertAlmostEqual(stats['perturbed_fraction'],0.6)
+        self.assertAlmostEqual(stats['anomaly_max'],5.5)
+        self.assertAlmostEqual(stats['anomaly_mean'],(1.5*1 + 1.9*0.5 + 5.5*0.5 + 4*0.5 + 0.4*1.5 + 2*2)/6)
+
+    def test_range(self):
+        test_signal = Signal(amp=-2,per=1.3,phas=0.4,trans=1,mean=0.5,std=0.3)
+        test_signal.add_perturbation(Perturbation(t0=1,support=2,strength=1.5))
+        stats = test_signal.stats(0.5,7.5)
+        t = np.linspace(0.5,7.5,1000001)
+        expected = test_signal._baseline.calculate_array(t) + 0.5 + test_signal._perturbations[0].calculate_array(t)
+        self.assertAlmostEqual(stats['min'],expected.min(),places=4)
+        self.assertAlmostEqual(stats['max'],expected.max(),places=4)
+        flat = Signal(amp=0,per=0,phas=0,trans=3,mean=0,std=1).stats(0,1)
+        self.assertEqual((flat['mean'],flat['var'],flat['min'],flat['max']),(3,1,3,3))
+
+    def test_harmonicBank(self):
+        bank = HarmonicBank(amp=[2,-1,0.5],per=[1.3,2.6,-0.7],phas=[0.4,0,1],trans=1)
+        test_signal = make_signal()
+        test_signal.set_baseline(bank)
+        stats = test_signal.stats(0,10)
+        t = (np.arange(2000000) + 0.5)*5e-6
+        expected = test_signal._calculate_array(t,noise=False) + 0.5
+        self.assertAlmostEqual(stats['mean'],expected.mean(),places=3)
+        values = test_signal.calculate_array(t)
+        self.assertAlmostEqual(stats['var'],values.var(),delta=0.02)
+        clean = Signal(amp=0,per=0,phas=0,trans=0,mean=0,std=0.3)
+        clean.set_baseline(bank)
+        t = np.linspace(0,10,1000001)
+        clean_stats = clean.stats(0,10)
+        self.assertAlmostEqual(clean_stats['var'] - 0.09,bank.calculate_array(t).var(),places=4)
+        self.assertLessEqual(clean_stats['min'],bank.calculate_array(t).min())
+        self.assertGreaterEqual(clean_stats['max'],bank.calculate_array(t).max())
+        single = Signal(amp=0,per=0,phas=0,trans=0,mean=0.5,std=0.3)
+        single.set_baseline(HarmonicBank(amp=[-2],per=[1.3],phas=[0.4],trans=1))
+        reference = Signal(amp=-2,per=1.3,phas=0.4,trans=1,mean=0.5,std=0.3).stats(0.5,7.5)
+        for name,value in single.stats(0.5,7.5).items():
+            self.assertAlmostEqual(value,reference[name])
+
+    def test_many(self):
+        signals = [make_signal(seed) for seed in range(3)]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            signals += Signal.from_specs([{'amp':1,'per':2,'std':0.5},{'trans':-1,'per':0.5}])
+        table = signal_stats(signals,0,10)
+        for k,test_signal in enumerate(signals):
+            for name,value in test_signal.stats(0,10).items():
+                self.assertAlmostEqual(table[name][k],value)
+        self.assertEqual(signal_stats([],0,1)['mean'].size,0)
+
+    def test_errors(self):
+        test_signal = make_signal()
+        self.assertRaises(ValueError,test_signal.stats,1,1)
+        self.assertRaises(TypeError,test_signal.stats,'a',1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            test_signal.add_perturbation(Function(a=1))
+        self.assertRaises(TypeError,test_signal.stats,0,1)
+
+
+if __name__ == '__main__':
+    unittest.main()
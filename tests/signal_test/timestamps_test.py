@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+
+from signals.timestamps import jittered_timestamps,poisson_timestamps
+
+class TestTimestamps(unittest.TestCase):
+
+    def test_jittered(self):
+        t = jittered_timestamps(0,10,1000,jitter=0.8,seed=1)
+        self.assertEqual(t.size,1000)
+        self.assertTrue(np.all(np.diff(t) > 0))
+        self.assertTrue(t[0] >= 0 and t[-1] < 10)
+        self.assertLess(np.abs(t - np.arange(1000)*0.01).max(),0.004 + 1e-12)
+        self.assertTrue(np.array_equal(t,jittered_timestamps(0,10,1000,jitter=0.8,seed=1)))
+        self.assertTrue(np.array_equal(jittered_timestamps(0,10,1000,jitter=0),np.arange(1000)*0.01))
+        dropped = jittered_timestamps(0,10,10000,jitter=0.5,dropout=0.3,seed=2)
+        self.assertAlmostEqual(dropped.size/10000,0.7,delta=0.03)
+        self.assertTrue(np.all(np.diff(dropped) > 0))
+        self.assertRaises(ValueError,jittered_timestamps,0,10,100,jitter=1)
+        self.assertRaises(ValueError,jittered_timestamps,0,10,100,dropout=-0.1)
+        self.assertRaises(ValueError,jittered_timestamps,10,0,100)
+        self.assertRaises(TypeError,jittered_timestamps,0,10,100.0)
+
+    def test_poisson(self):
+        t = poisson_timestamps(0,100,50,seed=3)
+        self.assertAlmostEqual(t.size/5000,1,delta=0.1)
+        self.assertTrue(np.all(np.diff(t) >= 0))
+        self.assertTrue(t[0] >= 0 and t[-1] < 100)
+        self.assertTrue(np.array_equal(t,poisson_timestamps(0,100,50,seed=3)))
+        self.assertRaises(ValueError,poisson_timestamps,0,100,0)
+        self.assertRaises(TypeError,poisson_timestamps,0,100,'a')
+
+
+if __name__ == '__main__':
+    unittest.main()